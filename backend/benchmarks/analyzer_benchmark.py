@@ -0,0 +1,60 @@
+"""
+Сравнение задержки анализа одного резюме: новый Analyzer на каждый файл
+(как было раньше) против одного долгоживущего Analyzer.
+
+Запуск из каталога backend:
+    PYTHONPATH=src:benchmarks python benchmarks/analyzer_benchmark.py --resumes 50
+"""
+import argparse
+import statistics
+import time
+
+from corpus import PROFESSION, make_corpus
+from project.resource.analyze import Analyzer, competency_parser_cache
+
+
+def analyze_resume(analyzer: Analyzer, text: str) -> None:
+    analyzer.extract_contact_info(text)
+    analyzer.analyze(text, PROFESSION, profession_id=1)
+
+
+def run_fresh(texts: list[str]) -> list[float]:
+    timings = []
+    for text in texts:
+        started = time.perf_counter()
+        competency_parser_cache.clear()
+        analyze_resume(Analyzer(), text)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def run_shared(texts: list[str]) -> list[float]:
+    analyzer = Analyzer()
+    timings = []
+    for text in texts:
+        started = time.perf_counter()
+        analyze_resume(analyzer, text)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def report(name: str, timings: list[float]) -> None:
+    print(
+        f"{name:<8} mean={statistics.mean(timings) * 1000:8.2f} ms  "
+        f"median={statistics.median(timings) * 1000:8.2f} ms  "
+        f"max={max(timings) * 1000:8.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=50)
+    args = parser.parse_args()
+
+    texts = make_corpus(args.resumes)
+    report("fresh", run_fresh(texts))
+    report("shared", run_shared(texts))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Задержка проверки авторизации get_current_user без кэша пользователей и с кэшем на локальном Postgres.
+Каждый запрос - отдельный вызов зависимости с тем же токеном, как у клиента, который работает с API
+после входа. Тестовый пользователь создаётся перед замером и удаляется после него.
+
+Запуск из каталога backend (нужны переменные из .env и применённые миграции):
+    PYTHONPATH=src python benchmarks/auth_benchmark.py --requests 2000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from jose import jwt
+
+from project.core.config import settings
+from project.api.depends import database, user_repo, get_current_user
+from project.resource.auth import principal_cache
+from project.schemas.user import UserCreateUpdateSchema
+
+
+def make_token(email: str) -> str:
+    expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    return jwt.encode(
+        claims={"sub": email, "exp": expire},
+        key=settings.SECRET_AUTH_KEY.get_secret_value(),
+        algorithm=settings.AUTH_ALGORITHM,
+    )
+
+
+async def measure(name: str, token: str, requests: int, concurrency: int) -> None:
+    principal_cache.clear()
+    latencies = []
+
+    async def worker(count: int) -> None:
+        for _ in range(count):
+            started = time.perf_counter()
+            # Сессия запроса, как её создаёт зависимость get_session: соединение берётся только при промахе кэша
+            async with database.session() as session:
+                await get_current_user(token=token, session=session)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker(requests // concurrency) for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"{name:<10} {len(latencies) / elapsed:9.0f} req/s  "
+        f"median={statistics.median(latencies) * 1000:.3f} ms  p99={p99 * 1000:.3f} ms  "
+        f"cache={principal_cache.stats()}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    email = f"benchmark-{uuid.uuid4().hex[:12]}@example.com"
+    async with database.session() as session:
+        user = await user_repo.create_user(
+            session=session,
+            user=UserCreateUpdateSchema(email=email, password="benchmark"),
+        )
+
+    token = make_token(email)
+    maxsize, ttl = principal_cache.maxsize, principal_cache.ttl
+    try:
+        principal_cache.maxsize = 0
+        await measure("no cache", token, args.requests, args.concurrency)
+        principal_cache.maxsize, principal_cache.ttl = maxsize or 1024, ttl or 60
+        await measure("cache", token, args.requests, args.concurrency)
+    finally:
+        principal_cache.maxsize, principal_cache.ttl = maxsize, ttl
+        async with database.session() as session:
+            await user_repo.delete_user(session=session, user_id=user.id)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
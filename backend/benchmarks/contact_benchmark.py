@@ -0,0 +1,58 @@
+"""
+Сравнение извлечения контактов по всему тексту (header_window = 0)
+и с просмотром заголовка резюме и ранней остановкой на длинных многостраничных резюме.
+Результаты обоих режимов сверяются. Часть резюме содержит контакты в конце текста,
+чтобы проверить переход от заголовка к остальному тексту.
+
+Запуск из каталога backend:
+    PYTHONPATH=src:benchmarks python benchmarks/contact_benchmark.py --resumes 50 --paragraphs 200
+"""
+import argparse
+import time
+
+from corpus import make_resume
+from project.resource.analyze import Analyzer
+
+
+def make_long_resumes(count: int, paragraphs: int) -> list[str]:
+    texts = []
+    for seed in range(count):
+        text = make_resume(seed, paragraphs)
+        if seed % 5 == 0:
+            # Контакты в конце резюме
+            header, body = text.split("Опыт работы\n", 1)
+            text = "Опыт работы\n" + body + "\n\n" + header
+        texts.append(text)
+    return texts
+
+
+def measure(name: str, analyzer: Analyzer, texts: list[str]) -> list[dict]:
+    documents = [analyzer.tokenize(text) for text in texts]
+    started = time.perf_counter()
+    results = [analyzer.extract_contact_info(text, document=document) for text, document in zip(texts, documents)]
+    elapsed = time.perf_counter() - started
+    print(f"{name:<8} {elapsed * 1000:9.1f} ms  {elapsed / len(texts) * 1000:7.2f} ms/resume")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=50)
+    parser.add_argument("--paragraphs", type=int, default=200)
+    args = parser.parse_args()
+
+    analyzer = Analyzer()
+    texts = make_long_resumes(args.resumes, args.paragraphs)
+    print(f"average length: {sum(map(len, texts)) // len(texts)} chars")
+
+    header_window = analyzer.header_window
+    analyzer.header_window = 0
+    expected = measure("full", analyzer, texts)
+
+    analyzer.header_window = header_window
+    actual = measure("header", analyzer, texts)
+    assert actual == expected
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Синтетические резюме и профессии для бенчмарков."""
+import random
+
+FIRST_NAMES = ["Иван", "Анна", "Сергей", "Мария", "Дмитрий", "Ольга", "Алексей", "Елена"]
+LAST_NAMES = ["Петров", "Смирнова", "Кузнецов", "Попова", "Соколов", "Лебедева", "Новиков", "Морозова"]
+CITIES = ["Москва", "Казань", "Новосибирск", "Екатеринбург", "Омск", "Тюмень"]
+
+SKILL_SENTENCES = [
+    "Разрабатывал сервисы на Python и FastAPI, оптимизация запросов SQL.",
+    "Базовый опыт с PyTorch, изучал основы компьютерного зрения.",
+    "Руководил проектом внедрения MLOps, настройка CI/CD для моделей.",
+    "Участвовал в разработке модели скоринга, A/B тестирование гипотез.",
+    "Создавал дашборды в Tableau, подготовка данных для ML-моделей.",
+    "Продвинутый уровень Docker и Kubernetes, архитектура data pipeline.",
+    "Знаком с методами оптимизации и математической статистикой.",
+    "Коммерческий опыт работы с PostgreSQL и Redis, проектирование схем данных.",
+]
+
+PROFESSION = {
+    "competencies": [
+        {"name": "Языки программирования и библиотеки (Python, C++)", "level": 2},
+        {"name": "Методы оптимизации", "level": 2},
+        {"name": "Базы данных SQL", "level": 2},
+        {"name": "MLOps и CI/CD", "level": 3},
+        {"name": "Визуализация данных (Tableau)", "level": 1},
+        {"name": "Docker Kubernetes", "level": 2},
+    ]
+}
+
+
+def make_resume(seed: int, paragraphs: int = 6) -> str:
+    rnd = random.Random(seed)
+    header = (
+        f"{rnd.choice(FIRST_NAMES)} {rnd.choice(LAST_NAMES)}\n"
+        f"Дата рождения: {rnd.randint(1, 28):02d}.{rnd.randint(1, 12):02d}.{rnd.randint(1975, 2002)}\n"
+        f"Город: {rnd.choice(CITIES)}\n"
+        f"Телефон: +7 9{rnd.randint(10, 99)} {rnd.randint(100, 999)}-{rnd.randint(10, 99)}-{rnd.randint(10, 99)}\n"
+        f"Email: user{seed}@example.com\n\n"
+        "Опыт работы\n"
+    )
+    body = "\n".join(
+        " ".join(rnd.choice(SKILL_SENTENCES) for _ in range(4))
+        for _ in range(paragraphs)
+    )
+    return header + body
+
+
+def make_corpus(size: int, paragraphs: int = 6) -> list[str]:
+    return [make_resume(seed, paragraphs) for seed in range(size)]
+
+
+def _pdf_string(line: str) -> bytes:
+    encoded = line.encode("cp1251", errors="replace")
+    return b"(" + encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _pdf_font() -> bytes:
+    # Невстроенный Type1-шрифт с явными ширинами (у стандартного Helvetica ширины кириллицы нулевые),
+    # кириллица через Differences с именами uniXXXX по cp1251
+    differences = []
+    for code in range(128, 256):
+        try:
+            char = bytes([code]).decode("cp1251")
+        except UnicodeDecodeError:
+            continue
+        differences.append(f"{code} /uni{ord(char):04X}")
+    return (
+        "<< /Type /Font /Subtype /Type1 /BaseFont /CorpusSans "
+        f"/Encoding << /Type /Encoding /BaseEncoding /WinAnsiEncoding /Differences [{' '.join(differences)}] >> "
+        "/FontDescriptor << /Type /FontDescriptor /FontName /CorpusSans /Flags 32 /FontBBox [0 -200 1000 800] "
+        "/ItalicAngle 0 /Ascent 800 /Descent -200 /CapHeight 700 /StemV 80 >> "
+        f"/FirstChar 32 /LastChar 255 /Widths [{' '.join(['500'] * 224)}] >>"
+    ).encode("ascii")
+
+
+def make_pdf(text: str, lines_per_page: int = 50, line_width: int = 90) -> bytes:
+    """Многостраничный PDF из текста резюме: строки переносятся по line_width символов."""
+    lines = []
+    for paragraph in text.splitlines():
+        words = paragraph.split(" ")
+        line = ""
+        for word in words:
+            if line and len(line) + len(word) + 1 > line_width:
+                lines.append(line)
+                line = word
+            else:
+                line = f"{line} {word}" if line else word
+        lines.append(line)
+    pages = [lines[start:start + lines_per_page] for start in range(0, len(lines), lines_per_page)] or [[]]
+
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, _pdf_font()]
+    page_refs = []
+    for page_lines in pages:
+        content = b"BT /F1 10 Tf 14 TL 50 800 Td " + b" ".join(
+            _pdf_string(line) + b" Tj T*" for line in page_lines
+        ) + b" ET"
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (len(objects))
+        )
+        page_refs.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [" + b" ".join(page_refs) + b"] /Count %d >>" % len(pages)
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return bytes(output)
@@ -0,0 +1,52 @@
+"""
+Сравнение обработки резюме с токенизацией текста в каждом извлекателе
+(name/date/city-парсеры и сканер компетенций) и с одним Document на резюме.
+Результаты обоих способов сверяются.
+
+Запуск из каталога backend:
+    PYTHONPATH=src:benchmarks python benchmarks/document_benchmark.py --resumes 200
+"""
+import argparse
+import time
+
+from corpus import PROFESSION, make_corpus
+from project.resource.analyze import Analyzer
+
+
+def process_separately(analyzer: Analyzer, text: str) -> tuple[dict, dict]:
+    contact_info = analyzer.extract_contact_info(text)
+    competencies = analyzer.scan(text, PROFESSION)
+    return contact_info, competencies
+
+
+def process_document(analyzer: Analyzer, text: str) -> tuple[dict, dict]:
+    document = analyzer.tokenize(text)
+    contact_info = analyzer.extract_contact_info(text, document=document)
+    competencies = analyzer.scan(text, PROFESSION, document=document)
+    return contact_info, competencies
+
+
+def measure(name: str, process, analyzer: Analyzer, texts: list[str]) -> list[tuple[dict, dict]]:
+    started = time.perf_counter()
+    results = [process(analyzer, text) for text in texts]
+    elapsed = time.perf_counter() - started
+    print(f"{name:<10} {elapsed * 1000:9.1f} ms  {elapsed / len(texts) * 1000:6.2f} ms/resume")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=200)
+    args = parser.parse_args()
+
+    analyzer = Analyzer()
+    texts = make_corpus(args.resumes)
+    process_document(analyzer, texts[0])
+
+    expected = measure("separate", process_separately, analyzer, texts)
+    actual = measure("document", process_document, analyzer, texts)
+    assert actual == expected
+
+
+if __name__ == "__main__":
+    main()
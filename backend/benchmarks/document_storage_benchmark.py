@@ -0,0 +1,58 @@
+"""
+Повторный поиск компетенций по сохранённому документу: по сжатому тексту
+(распаковка, токенизация, pymorphy) и по сохранённому потоку токенов (TokenStream).
+Печатает объём текста, сжатого текста и потока токенов. Результаты обоих способов сверяются
+для каждой профессии, в том числе не той, под которую резюме загружалось.
+
+Запуск из каталога backend:
+    PYTHONPATH=src:benchmarks python benchmarks/document_storage_benchmark.py --resumes 200
+"""
+import argparse
+import time
+
+from corpus import make_corpus
+from scanner_benchmark import PROFESSIONS
+from project.resource.analyze import Analyzer, TokenStream, compress_text, decompress_text
+
+
+def scan_text(analyzer: Analyzer, compressed_text: bytes, tokens: bytes, profession: dict) -> dict:
+    return analyzer.scan(decompress_text(compressed_text), profession)
+
+
+def scan_tokens(analyzer: Analyzer, compressed_text: bytes, tokens: bytes, profession: dict) -> dict:
+    return analyzer.scan_stream(TokenStream.loads(tokens), profession)
+
+
+def measure(name: str, scan, analyzer: Analyzer, stored: list[tuple[bytes, bytes]], profession: dict) -> list[dict]:
+    started = time.perf_counter()
+    results = [scan(analyzer, compressed_text, tokens, profession) for compressed_text, tokens in stored]
+    elapsed = time.perf_counter() - started
+    print(f"{name:<8} {elapsed * 1000:9.1f} ms  {elapsed / len(stored) * 1000:6.2f} ms/resume")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=200)
+    args = parser.parse_args()
+
+    analyzer = Analyzer()
+    texts = make_corpus(args.resumes)
+    stored = [(compress_text(text), TokenStream.from_tokens(analyzer.tokenize(text).competency_tokens).dumps()) for text in texts]
+
+    text_size = sum(len(text.encode("utf-8")) for text in texts)
+    print(f"text {text_size // 1024} KiB, "
+          f"compressed text {sum(len(text) for text, _ in stored) // 1024} KiB, "
+          f"tokens {sum(len(tokens) for _, tokens in stored) // 1024} KiB")
+
+    for profession in PROFESSIONS:
+        # Прогрев: таблица сканера и кэш pymorphy
+        scan_text(analyzer, *stored[0], profession)
+
+        expected = measure("text", scan_text, analyzer, stored, profession)
+        actual = measure("tokens", scan_tokens, analyzer, stored, profession)
+        assert actual == expected
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Выгрузка всех резюме одним списком (get_all_resumes и JSON-массив) и потоком NDJSON
+(stream_all_resumes через серверный курсор) на локальном Postgres: время и пик памяти Python.
+Резюме вставляются в транзакции, которая откатывается в конце.
+
+Запуск из каталога backend (нужны переменные из .env и применённые миграции):
+    PYTHONPATH=src:benchmarks python benchmarks/list_streaming_benchmark.py --resumes 20000
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from resume_insert_benchmark import make_resumes
+from project.infrastructure.postgres.database import database
+from project.infrastructure.postgres.repository.resume_repo import ResumeRepository
+
+resume_repo = ResumeRepository()
+
+
+async def dump_list(session: AsyncSession) -> int:
+    resumes = await resume_repo.get_all_resumes(session=session)
+    # Так сериализует ответ JSONResponse
+    body = json.dumps([resume.model_dump(mode="json") for resume in resumes], ensure_ascii=False).encode()
+    return len(body)
+
+
+async def dump_stream(session: AsyncSession) -> int:
+    size = 0
+    async for batch in resume_repo.stream_all_resumes(session=session):
+        size += len("".join(resume.model_dump_json() + "\n" for resume in batch).encode())
+    return size
+
+
+async def measure(session: AsyncSession, name: str, dump_fn) -> None:
+    # Объекты предыдущего замера не должны оставаться в identity map сессии
+    session.expunge_all()
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = await dump_fn(session)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:<8} {elapsed * 1000:9.1f} ms  peak={peak / 2 ** 20:7.1f} MiB  body={size / 2 ** 20:.1f} MiB")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=20000)
+    args = parser.parse_args()
+
+    async with database.session() as session:
+        await resume_repo.create_resumes(session=session, resumes=make_resumes(args.resumes))
+        await session.flush()
+        try:
+            await measure(session, "list", dump_list)
+            await measure(session, "stream", dump_stream)
+        finally:
+            await session.rollback()
+    await database.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
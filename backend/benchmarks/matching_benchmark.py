@@ -0,0 +1,122 @@
+"""
+Сравнение построчной оценки резюме (цикл по словарям компетенций)
+с векторизованным MatchingEngine. Результаты обоих способов сверяются.
+
+Запуск из каталога backend:
+    PYTHONPATH=src:benchmarks python benchmarks/matching_benchmark.py --resumes 5000
+"""
+import argparse
+import gc
+import random
+import time
+
+from corpus import PROFESSION
+from project.resource.matching import MatchingEngine, match_percentage
+from project.schemas.profession import ProfessionSchema
+from project.schemas.resume import ResumeSchema, ResumeMatchResult, CompetencyMismatch
+
+EXTRA_COMPETENCIES = [f"Компетенция {index}" for index in range(40)]
+
+
+def make_resumes(count: int) -> list[ResumeSchema]:
+    rnd = random.Random(0)
+    names = [comp["name"] for comp in PROFESSION["competencies"]] + EXTRA_COMPETENCIES
+
+    return [
+        ResumeSchema(
+            id=index,
+            first_name="Иван",
+            last_name=f"Петров{index}",
+            phone=f"+7999{index:07d}",
+            competencies={"competencies": [
+                {"name": name, "level": rnd.randint(1, 3)}
+                for name in rnd.sample(names, rnd.randint(0, 20))
+            ]},
+        )
+        for index in range(count)
+    ]
+
+
+def match_with_loop(profession: ProfessionSchema, resumes: list[ResumeSchema]) -> list[ResumeMatchResult]:
+    results = []
+    required_competencies = profession.competencies.get("competencies", [])
+
+    for resume in resumes:
+        resume_comp_dict = {comp["name"]: comp["level"] for comp in resume.competencies.get("competencies", [])}
+        total_possible = 0
+        total_matched = 0
+        mismatches = []
+
+        for req_comp in required_competencies:
+            required_level = req_comp["level"]
+            actual_level = resume_comp_dict.get(req_comp["name"], 0)
+            total_possible += required_level
+            total_matched += min(actual_level, required_level)
+            if req_comp["name"] not in resume_comp_dict or actual_level < required_level:
+                mismatches.append(CompetencyMismatch(
+                    name=req_comp["name"],
+                    required_level=required_level,
+                    actual_level=actual_level
+                ))
+
+        results.append(ResumeMatchResult(
+            resume_id=resume.id,
+            first_name=resume.first_name,
+            last_name=resume.last_name,
+            match_percentage=match_percentage(total_matched, total_possible),
+            mismatched_competencies=mismatches
+        ))
+
+    return results
+
+
+def score_with_loop(profession: ProfessionSchema, resumes: list[ResumeSchema]) -> list[tuple[int, int]]:
+    required_competencies = profession.competencies.get("competencies", [])
+    scores = []
+
+    for resume in resumes:
+        resume_comp_dict = {comp["name"]: comp["level"] for comp in resume.competencies.get("competencies", [])}
+        total_matched = sum(
+            min(resume_comp_dict.get(req_comp["name"], 0), req_comp["level"])
+            for req_comp in required_competencies
+        )
+        scores.append((total_matched, sum(req_comp["level"] for req_comp in required_competencies)))
+
+    return scores
+
+
+def measure(name: str, fn) -> object:
+    # Сборщик мусора отключается, чтобы уже созданные модели не влияли на следующий замер
+    gc.collect()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        result = fn()
+    finally:
+        gc.enable()
+    print(f"{name:<14} {(time.perf_counter() - started) * 1000:9.1f} ms")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=5000)
+    args = parser.parse_args()
+
+    profession = ProfessionSchema(id=1, name="Data Scientist", competencies=PROFESSION)
+    resumes = make_resumes(args.resumes)
+
+    # Полный ответ API: время в основном уходит на создание pydantic-моделей
+    expected = measure("loop results", lambda: match_with_loop(profession, resumes))
+    actual = measure("numpy results", lambda: MatchingEngine(resumes, [profession]).match_results(0))
+    assert actual == expected
+
+    # Только подсчёт баллов
+    expected_scores = measure("loop scores", lambda: score_with_loop(profession, resumes))
+    engine = measure("numpy encode", lambda: MatchingEngine(resumes, [profession]))
+    total_matched, total_possible = measure("numpy scores", lambda: engine.score(0))
+    assert [(matched, total_possible) for matched in total_matched.tolist()] == expected_scores
+
+
+if __name__ == "__main__":
+    main()
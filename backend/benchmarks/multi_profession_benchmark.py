@@ -0,0 +1,75 @@
+"""
+Анализ одних и тех же DOCX-файлов для нескольких профессий: отдельным проходом на каждую профессию
+(извлечение текста, токенизация и контакты повторяются) и одним проходом с общей токенизацией.
+Задачи выполняются в текущем процессе, без пула. Результаты обоих способов сверяются.
+
+Запуск из каталога backend:
+    PYTHONPATH=src:benchmarks python benchmarks/multi_profession_benchmark.py --resumes 50
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from docx import Document
+
+from corpus import make_corpus
+from scanner_benchmark import PROFESSIONS
+from project.resource.engine import _process_file_job
+
+PROFESSION_LIST = PROFESSIONS + [
+    {"competencies": competencies}
+    for competencies in (PROFESSIONS[0]["competencies"][:3], PROFESSIONS[1]["competencies"][2:])
+]
+
+
+def write_docx(directory: Path, texts: list[str]) -> list[Path]:
+    paths = []
+    for index, text in enumerate(texts):
+        document = Document()
+        for line in text.splitlines():
+            document.add_paragraph(line)
+        path = directory / f"{index:05d}.docx"
+        document.save(path)
+        paths.append(path)
+    return paths
+
+
+def process_separately(paths: list[Path], professions: list[tuple[dict, None]]) -> list[list[dict]]:
+    return [
+        [_process_file_job(path.name, str(path), [profession])[3][0] for profession in professions]
+        for path in paths
+    ]
+
+
+def process_together(paths: list[Path], professions: list[tuple[dict, None]]) -> list[list[dict]]:
+    return [_process_file_job(path.name, str(path), professions)[3] for path in paths]
+
+
+def measure(name: str, process, paths: list[Path], professions: list[tuple[dict, None]]) -> list[list[dict]]:
+    started = time.perf_counter()
+    results = process(paths, professions)
+    elapsed = time.perf_counter() - started
+    print(f"{name:<10} {elapsed * 1000:9.1f} ms  {elapsed / len(paths) * 1000:6.2f} ms/file")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=50)
+    args = parser.parse_args()
+
+    professions = [(profession, None) for profession in PROFESSION_LIST]
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_docx(Path(directory), make_corpus(args.resumes))
+        # Прогрев: словари pymorphy и сканеры профессий
+        process_together(paths[:1], professions)
+
+        print(f"{len(professions)} professions")
+        expected = measure("separate", process_separately, paths, professions)
+        actual = measure("together", process_together, paths, professions)
+        assert actual == expected
+
+
+if __name__ == "__main__":
+    main()
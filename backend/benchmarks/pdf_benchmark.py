@@ -0,0 +1,96 @@
+"""
+Извлечение текста из синтетических многостраничных PDF разными вариантами из PDF_BACKENDS
+и постраничное извлечение в пуле процессов AnalysisEngine.
+
+Для каждого варианта печатается скорость в страницах в секунду; найденные контакты и компетенции
+сверяются с результатами полного анализа разметки (layout). Затем длинные PDF обрабатываются
+AnalysisEngine.process_file по одному: целиком в одном процессе (PDF_PAGES_PER_TASK = 0)
+и частями по PDF_PAGES_PER_TASK страниц, результаты сверяются.
+
+Запуск из каталога backend:
+    PYTHONPATH=src:benchmarks python benchmarks/pdf_benchmark.py --files 20 --paragraphs 100
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from corpus import PROFESSION, make_pdf, make_resume
+from project.core.config import settings
+from project.resource.analyze import Analyzer
+from project.resource.engine import AnalysisEngine
+from project.resource.pdf import PDF_BACKENDS
+
+
+def write_pdfs(directory: Path, count: int, paragraphs: int) -> list[Path]:
+    paths = []
+    for seed in range(count):
+        path = directory / f"{seed:05d}.pdf"
+        path.write_bytes(make_pdf(make_resume(seed, paragraphs)))
+        paths.append(path)
+    return paths
+
+
+def analyze(analyzer: Analyzer, text: str) -> tuple[dict, dict]:
+    document = analyzer.tokenize(text)
+    return analyzer.extract_contact_info(text, document=document), analyzer.scan(text, PROFESSION, document=document)
+
+
+def measure_backends(paths: list[Path], pages: int) -> None:
+    analyzer = Analyzer()
+    expected = None
+
+    for name, backend in PDF_BACKENDS.items():
+        analyzer.pdf_backend = backend
+        started = time.perf_counter()
+        texts = [analyzer.extract_pdf_text(str(path)) for path in paths]
+        elapsed = time.perf_counter() - started
+
+        results = [analyze(analyzer, text) for text in texts]
+        if expected is None:
+            expected = results
+        mismatches = sum(1 for a, b in zip(expected, results) if a != b)
+        print(f"{name:<8} {elapsed * 1000:9.1f} ms  {pages / elapsed:8.1f} pages/s  mismatches: {mismatches}")
+
+
+async def measure_engine(paths: list[Path], pages: int) -> None:
+    engine = AnalysisEngine(max_workers=settings.ANALYSIS_WORKERS)
+    engine.start()
+    professions = [(PROFESSION, None)]
+    pages_per_task = settings.PDF_PAGES_PER_TASK
+    try:
+        # Прогрев процессов
+        await engine.process_file(paths[0].name, str(paths[0]), professions)
+
+        results = {}
+        for name, task_pages in (("whole", 0), ("pages", pages_per_task)):
+            settings.PDF_PAGES_PER_TASK = task_pages
+            started = time.perf_counter()
+            results[name] = [await engine.process_file(path.name, str(path), professions) for path in paths]
+            elapsed = time.perf_counter() - started
+            print(f"{name:<8} {elapsed * 1000:9.1f} ms  {pages / elapsed:8.1f} pages/s")
+        assert results["whole"] == results["pages"]
+    finally:
+        settings.PDF_PAGES_PER_TASK = pages_per_task
+        engine.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--paragraphs", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_pdfs(Path(directory), args.files, args.paragraphs)
+        pages = sum(Analyzer().count_pdf_pages(path.name, str(path)) for path in paths)
+        print(f"{len(paths)} files, {pages} pages")
+
+        measure_backends(paths, pages)
+        print(f"engine: {settings.PDF_BACKEND}, {settings.PDF_PAGES_PER_TASK} pages per task")
+        asyncio.run(measure_engine(paths, pages))
+
+
+if __name__ == "__main__":
+    main()
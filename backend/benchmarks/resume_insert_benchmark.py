@@ -0,0 +1,81 @@
+"""
+Сравнение построчной вставки резюме (INSERT ... RETURNING на каждый файл)
+с пакетной вставкой ResumeRepository.create_resumes на локальном Postgres.
+Все вставки выполняются в транзакции, которая откатывается в конце.
+
+Запуск из каталога backend (нужны переменные из .env и применённые миграции):
+    PYTHONPATH=src python benchmarks/resume_insert_benchmark.py --resumes 1000
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from project.core.config import settings
+from project.infrastructure.postgres.models import Resume
+from project.infrastructure.postgres.repository.resume_repo import ResumeRepository
+from project.schemas.resume import ResumeCreateUpdateSchema
+
+
+def make_resumes(count: int) -> list[ResumeCreateUpdateSchema]:
+    return [
+        ResumeCreateUpdateSchema(
+            first_name="Иван",
+            last_name=f"Петров{index}",
+            city="Москва",
+            phone=f"+7999{index:07d}",
+            email=f"user{index}@example.com",
+            competencies={"competencies": [{"name": "Python", "level": index % 3 + 1}]},
+        )
+        for index in range(count)
+    ]
+
+
+async def insert_one_by_one(session: AsyncSession, resumes: list[ResumeCreateUpdateSchema]) -> None:
+    for resume in resumes:
+        await session.scalar(insert(Resume).values(resume.model_dump()).returning(Resume))
+
+
+async def insert_bulk(session: AsyncSession, resumes: list[ResumeCreateUpdateSchema]) -> None:
+    await ResumeRepository().create_resumes(session=session, resumes=resumes)
+
+
+async def measure(engine, name: str, insert_fn, resumes: list[ResumeCreateUpdateSchema]) -> None:
+    round_trips = 0
+
+    def count_round_trip(*args) -> None:
+        nonlocal round_trips
+        round_trips += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_round_trip)
+    try:
+        async with AsyncSession(engine) as session:
+            started = time.perf_counter()
+            await insert_fn(session, resumes)
+            await session.flush()
+            elapsed = time.perf_counter() - started
+            await session.rollback()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count_round_trip)
+
+    print(f"{name:<12} {elapsed * 1000:9.1f} ms  round-trips={round_trips}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=1000)
+    args = parser.parse_args()
+
+    engine = create_async_engine(settings.postgres_url)
+    resumes = make_resumes(args.resumes)
+    try:
+        await measure(engine, "one-by-one", insert_one_by_one, resumes)
+        await measure(engine, "bulk", insert_bulk, resumes)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+"""
+Сравнение поиска компетенций грамматикой yargy (Analyzer.analyze)
+и CompetencyScanner (Analyzer.scan). Результаты сверяются на каждом резюме.
+
+Кроме синтетических резюме корпус содержит случайные последовательности из ключевых слов
+и терминов уровней, чтобы проверить выбор пересекающихся совпадений.
+
+Запуск из каталога backend:
+    PYTHONPATH=src:benchmarks python benchmarks/scanner_benchmark.py --resumes 50
+"""
+import argparse
+import random
+import time
+
+from corpus import PROFESSION, make_corpus
+from project.resource.analyze import Analyzer
+
+PROFESSIONS = [
+    PROFESSION,
+    {
+        "competencies": [
+            {"name": "Оптимизация", "level": 3},
+            {"name": "Архитектура решений", "level": 2},
+            {"name": "SQL Python", "level": 2},
+            {"name": "Опыт работы с данными", "level": 1},
+            {"name": "Junior Middle Senior", "level": 2},
+            {"name": "Внедрение (MLOps, CI/CD)", "level": 3},
+        ]
+    },
+]
+
+
+def make_word_soup(analyzer: Analyzer, count: int) -> list[str]:
+    rnd = random.Random(0)
+    words = [
+        word
+        for profession in PROFESSIONS
+        for comp in profession["competencies"]
+        for word in comp["name"].split()
+    ]
+    for level in analyzer.LEVEL_TERMS:
+        words += analyzer.LEVEL_TERMS[level]
+        words += [word for phrase in analyzer.LEVEL_PHRASES[level] for word in phrase.split()]
+    words += ["и", "с", "в", "\n", ",", "проект", "команда"]
+
+    return [" ".join(rnd.choice(words) for _ in range(200)) for _ in range(count)]
+
+
+def measure(name: str, analyze, texts: list[str], profession: dict) -> list[dict]:
+    started = time.perf_counter()
+    results = [analyze(text, profession, profession_id=None) for text in texts]
+    elapsed = time.perf_counter() - started
+    print(f"{name:<8} {elapsed * 1000:9.1f} ms  {len(texts) / elapsed:8.1f} resumes/s")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=50)
+    args = parser.parse_args()
+
+    analyzer = Analyzer()
+    texts = make_corpus(args.resumes) + make_word_soup(analyzer, args.resumes)
+
+    for profession in PROFESSIONS:
+        # Прогрев: сборка грамматики, таблицы сканера и кэша pymorphy
+        analyzer.analyze(texts[0], profession)
+        analyzer.scan(texts[0], profession)
+
+        expected = measure("yargy", analyzer.analyze, texts, profession)
+        actual = measure("scanner", analyzer.scan, texts, profession)
+        mismatches = sum(1 for a, b in zip(expected, actual) if a != b)
+        print(f"mismatches: {mismatches} of {len(texts)}")
+
+
+if __name__ == "__main__":
+    main()
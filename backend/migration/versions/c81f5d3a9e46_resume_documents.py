@@ -0,0 +1,68 @@
+"""'resume_documents'
+
+Revision ID: c81f5d3a9e46
+Revises: a4d8e2f61c37
+Create Date: 2026-10-18 17:21:48.905316
+
+"""
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+
+from project.core.config import settings
+
+# revision identifiers, used by Alembic.
+revision = 'c81f5d3a9e46'
+down_revision = 'a4d8e2f61c37'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+resume_files = sa.table(
+    'resume_files',
+    sa.column('file_hash', sa.String),
+    sa.column('text', sa.Text),
+    sa.column('compressed_text', sa.LargeBinary),
+    schema='schema_competency',
+)
+
+
+def _convert(source, target, convert):
+    # Текст переносится порциями по первичному ключу, чтобы не читать всю таблицу в память
+    connection = op.get_bind()
+    last_hash = ''
+    while True:
+        rows = connection.execute(
+            sa.select(resume_files.c.file_hash, resume_files.c[source])
+            .where(resume_files.c.file_hash > last_hash)
+            .order_by(resume_files.c.file_hash)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        connection.execute(
+            resume_files.update()
+            .where(resume_files.c.file_hash == sa.bindparam('_file_hash'))
+            .values({target: sa.bindparam('_value')}),
+            [{'_file_hash': file_hash, '_value': convert(value)} for file_hash, value in rows],
+        )
+        last_hash = rows[-1].file_hash
+
+
+def upgrade():
+    op.add_column('resume_files', sa.Column('compressed_text', sa.LargeBinary(), nullable=True), schema='schema_competency')
+    op.add_column('resume_files', sa.Column('tokens', sa.LargeBinary(), nullable=True), schema='schema_competency')
+    # Поток токенов для уже сохранённых файлов не строится, поиск по ним идёт по тексту
+    _convert('text', 'compressed_text', lambda value: zlib.compress(value.encode('utf-8')))
+    op.alter_column('resume_files', 'compressed_text', nullable=False, schema='schema_competency')
+    op.drop_column('resume_files', 'text', schema='schema_competency')
+
+
+def downgrade():
+    op.add_column('resume_files', sa.Column('text', sa.Text(), nullable=True), schema='schema_competency')
+    _convert('compressed_text', 'text', lambda value: zlib.decompress(value).decode('utf-8'))
+    op.alter_column('resume_files', 'text', nullable=False, schema='schema_competency')
+    op.drop_column('resume_files', 'tokens', schema='schema_competency')
+    op.drop_column('resume_files', 'compressed_text', schema='schema_competency')
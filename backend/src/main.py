@@ -1,5 +1,8 @@
 import asyncio
 import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 import uvicorn
 
 from fastapi import FastAPI
@@ -13,10 +16,30 @@ from project.api.healthcheck import healthcheck_router
 from project.api.user_routes import user_router
 from project.api.profession_routes import profession_router
 from project.api.resume_routes import resume_router
+from project.api.job_routes import job_router
+from project.resource.engine import analysis_engine
+from project.resource.jobs import analysis_job_queue
+from project.resource.auth import password_hasher
+from project.infrastructure.postgres.database import database
 
 logger = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    database.connect()
+    analysis_engine.start()
+    password_hasher.start()
+    await analysis_job_queue.start()
+    try:
+        yield
+    finally:
+        await analysis_job_queue.shutdown()
+        analysis_engine.shutdown()
+        password_hasher.shutdown()
+        await database.dispose()
+
+
 def create_app() -> FastAPI:
     app_options = {}
     if settings.ENV.lower() == "prod":
@@ -27,7 +50,7 @@ def create_app() -> FastAPI:
     if settings.LOG_LEVEL in ["DEBUG", "INFO"]:
         app_options["debug"] = True
 
-    app = FastAPI(root_path=settings.ROOT_PATH, **app_options)
+    app = FastAPI(root_path=settings.ROOT_PATH, lifespan=lifespan, **app_options)
     app.add_middleware(
         CORSMiddleware,  # type: ignore
         allow_origins=["*"],
@@ -42,6 +65,7 @@ def create_app() -> FastAPI:
     app.include_router(user_router, tags=["User"])
     app.include_router(profession_router, tags=["Profession"])
     app.include_router(resume_router, tags=["Resume"])
+    app.include_router(job_router, tags=["Analysis job"])
 
     return app
 
@@ -6,11 +6,11 @@ from fastapi import APIRouter, HTTPException, status, Depends
 from jose import jwt
 
 from project.core.config import settings
-from project.core.exceptions import UserNotFound, UserAlreadyExists
-from project.schemas.auth import Token
-from project.api.depends import database, user_repo
-from project.resource.auth import verify_password, get_password_hash
-from project.schemas.user import UserCreateUpdateSchema
+from project.core.exceptions import UserNotFound, UserAlreadyExists, PasswordHashQueueFull
+from project.schemas.auth import Token, PasswordHasherStatsSchema
+from project.api.depends import database, user_repo, get_current_user, check_for_admin_access, overloaded_exception
+from project.resource.auth import password_hasher
+from project.schemas.user import UserSchema, UserCreateUpdateSchema
 from project.schemas.userregister import UserRegisterCreateUpdateSchema
 
 auth_router = APIRouter()
@@ -24,7 +24,7 @@ async def login_for_access_token(
         async with database.session() as session:
             user = await user_repo.get_user_by_email(session=session, email=form_data.username)
 
-        if not verify_password(plain_password=form_data.password, hashed_password=user.password):
+        if not await password_hasher.verify(plain_password=form_data.password, hashed_password=user.password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Неверный пароль",
@@ -36,6 +36,8 @@ async def login_for_access_token(
             detail=e.message,
             headers={"WWW-Authenticate": "Bearer"},
         )
+    except PasswordHashQueueFull as error:
+        raise overloaded_exception(detail=error.message)
 
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     token_data = {"sub": user.email}
@@ -59,11 +61,26 @@ async def login_for_access_token(
 @auth_router.post("/register", status_code=status.HTTP_201_CREATED)
 async def register_user(user_dto: UserRegisterCreateUpdateSchema) -> None:
     try:
+        # Хеш считается до открытия сессии, чтобы соединение из пула не простаивало на время bcrypt
+        user = UserCreateUpdateSchema(email=user_dto.email,
+                                      password=await password_hasher.hash(password=user_dto.password))
         async with database.session() as session:
-            user = UserCreateUpdateSchema(email=user_dto.email,
-                                          password=get_password_hash(password=user_dto.password))
             new_user = await user_repo.create_user(session=session, user=user)
     except UserAlreadyExists as error:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
+    except PasswordHashQueueFull as error:
+        raise overloaded_exception(detail=error.message)
 
-    return new_user
\ No newline at end of file
+    return new_user
+
+
+@auth_router.get(
+    "/password_hasher/stats",
+    response_model=PasswordHasherStatsSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def get_password_hasher_stats(
+        current_user: UserSchema = Depends(get_current_user),
+) -> PasswordHasherStatsSchema:
+    check_for_admin_access(user=current_user)
+    return PasswordHasherStatsSchema(**password_hasher.stats())
@@ -1,32 +1,49 @@
-from project.infrastructure.postgres.database import PostgresDatabase
+from project.infrastructure.postgres.database import database
 
-from typing import Annotated
+from typing import Annotated, AsyncIterator
 
 from jose import jwt, JWTError
 from fastapi import Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from project.schemas.auth import TokenData
 from project.schemas.user import UserSchema
 from project.core.config import settings
-from project.core.exceptions import CredentialsException
-from project.resource.auth import oauth2_scheme
+from project.core.exceptions import CredentialsException, UserNotFound
+from project.resource.auth import oauth2_scheme, principal_cache
 
 from project.infrastructure.postgres.repository.user_repo import UserRepository
 from project.infrastructure.postgres.repository.profession_repo import ProfessionRepository
 from project.infrastructure.postgres.repository.resume_repo import ResumeRepository
+from project.infrastructure.postgres.repository.job_repo import AnalysisJobRepository
+from project.infrastructure.postgres.repository.score_repo import ScoreRepository
+from project.infrastructure.postgres.repository.competency_repo import CompetencyRepository
 
 
-database = PostgresDatabase()
-
 user_repo = UserRepository()
 profession_repo = ProfessionRepository()
 resume_repo = ResumeRepository()
+job_repo = AnalysisJobRepository()
+score_repo = ScoreRepository()
+competency_repo = CompetencyRepository()
 
 AUTH_EXCEPTION_MESSAGE = "Невозможно проверить данные для авторизации"
+OVERLOAD_RETRY_AFTER_SECONDS = 1
+
+
+async def get_session() -> AsyncIterator[AsyncSession]:
+    """
+    Сессия на время запроса. FastAPI кэширует зависимость в пределах запроса, поэтому
+    get_current_user и обработчик маршрута работают в одной сессии. Соединение берётся из пула
+    при первом обращении к базе, транзакция фиксируется один раз после выполнения обработчика.
+    """
+    async with database.session() as session:
+        yield session
 
 
 async def get_current_user(
         token: Annotated[str, Depends(oauth2_scheme)],
+        session: Annotated[AsyncSession, Depends(get_session)],
 ):
     try:
         payload = jwt.decode(
@@ -41,21 +58,45 @@ async def get_current_user(
     except JWTError:
         raise CredentialsException(detail=AUTH_EXCEPTION_MESSAGE)
 
-    async with database.session() as session:
+    # Токен уже проверен по подписи и сроку, поэтому пользователя можно взять из кэша без запроса в базу
+    expires = payload.get("exp", 0)
+    user = principal_cache.get(subject=token_data.username, expires=expires)
+    if user is not None:
+        return user
+
+    try:
         user = await user_repo.get_user_by_email(
             session=session,
             email=token_data.username,
         )
-
-    if user is None:
+    except UserNotFound:
         raise CredentialsException(detail=AUTH_EXCEPTION_MESSAGE)
 
+    principal_cache.put(subject=token_data.username, expires=expires, user=user)
     return user
 
 
+async def get_current_user_short_session(token: Annotated[str, Depends(oauth2_scheme)]) -> UserSchema:
+    """
+    get_current_user в собственной короткой сессии - для маршрутов, которые хешируют пароль до работы с базой:
+    сессия запроса держала бы соединение из пула всё время работы bcrypt.
+    """
+    async with database.session() as session:
+        return await get_current_user(token=token, session=session)
+
+
 def check_for_admin_access(user: UserSchema) -> None:
     if not user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Только админ имеет права добавлять/изменять/удалять данные."
         )
+
+
+def overloaded_exception(detail: str) -> HTTPException:
+    """503 для запроса, отклонённого из-за перегрузки, с Retry-After - через сколько секунд повторить попытку."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=detail,
+        headers={"Retry-After": str(OVERLOAD_RETRY_AFTER_SECONDS)},
+    )
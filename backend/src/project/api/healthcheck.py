@@ -1,7 +1,8 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, status
 
-from project.api.depends import database, user_repo
-from project.schemas.healthcheck import HealthCheckSchema
+from project.api.depends import database, user_repo, get_current_user, check_for_admin_access
+from project.schemas.healthcheck import HealthCheckSchema, PoolStatsSchema
+from project.schemas.user import UserSchema
 from project.core.exceptions import DatabaseError
 
 healthcheck_router = APIRouter()
@@ -18,3 +19,11 @@ async def check_health() -> HealthCheckSchema:
     return HealthCheckSchema(
         db_is_ok=db_is_ok,
     )
+
+
+@healthcheck_router.get("/database/pool", response_model=PoolStatsSchema, status_code=status.HTTP_200_OK)
+async def get_pool_stats(
+        current_user: UserSchema = Depends(get_current_user),
+) -> PoolStatsSchema:
+    check_for_admin_access(user=current_user)
+    return PoolStatsSchema(**database.pool_stats())
@@ -0,0 +1,102 @@
+from typing import List
+
+from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from project.schemas.job import AnalysisJobSchema, AnalysisJobStatus, MorphCacheStatsSchema
+from project.schemas.user import UserSchema
+from project.schemas.resume import ProcessedResumeResponse
+from project.core.exceptions import AnalysisJobNotFound, AnalysisQueueFull, ProfessionNotFound
+from project.api.depends import (
+    get_session,
+    profession_repo,
+    job_repo,
+    get_current_user,
+    check_for_admin_access,
+    overloaded_exception,
+)
+from project.resource.engine import analysis_engine
+from project.resource.jobs import analysis_job_queue
+
+job_router = APIRouter()
+
+
+@job_router.post(
+    "/analyze_jobs/{profession_id}",
+    response_model=AnalysisJobSchema,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(get_current_user)],
+)
+async def submit_analysis_job(
+        profession_id: int,
+        files: List[UploadFile] = File(...),
+        session: AsyncSession = Depends(get_session),
+) -> AnalysisJobSchema:
+    try:
+        await profession_repo.get_profession_by_id(session=session, profession_id=profession_id)
+
+        job = await analysis_job_queue.submit(profession_id=profession_id, files=files)
+    except ProfessionNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    except AnalysisQueueFull as error:
+        raise overloaded_exception(detail=error.message)
+
+    return job
+
+
+@job_router.get(
+    "/analyze_jobs/{job_id}",
+    response_model=AnalysisJobSchema,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(get_current_user)],
+)
+async def get_analysis_job(
+        job_id: int,
+        session: AsyncSession = Depends(get_session),
+) -> AnalysisJobSchema:
+    try:
+        job = await job_repo.get_job_by_id(session=session, job_id=job_id)
+    except AnalysisJobNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+
+    return job
+
+
+@job_router.get(
+    "/analyze_jobs/{job_id}/result",
+    response_model=ProcessedResumeResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(get_current_user)],
+)
+async def get_analysis_job_result(
+        job_id: int,
+        session: AsyncSession = Depends(get_session),
+) -> ProcessedResumeResponse:
+    try:
+        job = await job_repo.get_job_by_id(session=session, job_id=job_id)
+    except AnalysisJobNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+
+    if job.status in (AnalysisJobStatus.PENDING, AnalysisJobStatus.RUNNING):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Задача {job_id} ещё выполняется: обработано {job.processed_files + job.failed_files} из {job.total_files}"
+        )
+
+    return ProcessedResumeResponse(
+        resume_ids=job.resume_ids,
+        status=f"Processed {job.processed_files} files, failed {job.failed_files} files"
+    )
+
+
+@job_router.get(
+    "/analysis_engine/morph_cache",
+    response_model=List[MorphCacheStatsSchema],
+    status_code=status.HTTP_200_OK,
+)
+async def get_morph_cache_stats(
+        current_user: UserSchema = Depends(get_current_user),
+) -> List[MorphCacheStatsSchema]:
+    check_for_admin_access(user=current_user)
+    stats = await analysis_engine.morph_cache_stats()
+    return [MorphCacheStatsSchema(**entry) for entry in stats]
@@ -1,9 +1,14 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from project.schemas.profession import ProfessionSchema, ProfessionCreateUpdateSchema
+from project.schemas.resume import TopCandidatesResponse, TopCandidatesCursor
 from project.core.exceptions import ProfessionNotFound, ProfessionAlreadyExists
-from project.api.depends import database, profession_repo, get_current_user, check_for_admin_access
+from project.api.streaming import ndjson_response
+from project.api.depends import get_session, profession_repo, score_repo, get_current_user, check_for_admin_access
 from project.schemas.user import UserSchema
+from project.resource.jobs import analysis_job_queue
 
 profession_router = APIRouter()
 
@@ -14,9 +19,17 @@ profession_router = APIRouter()
     status_code=status.HTTP_200_OK,
     dependencies=[Depends(get_current_user)],
 )
-async def get_all_professions() -> list[ProfessionSchema]:
-    async with database.session() as session:
-        all_professions = await profession_repo.get_all_professions(session=session)
+async def get_all_professions(
+        limit: int | None = Query(default=None, ge=1, le=1000),
+        after_id: int | None = None,
+        stream: bool = False,
+        session: AsyncSession = Depends(get_session),
+) -> list[ProfessionSchema] | StreamingResponse:
+    # stream=true - записи после after_id в формате NDJSON без загрузки таблицы в память
+    if stream:
+        return ndjson_response(profession_repo.stream_all_professions, limit=limit, after_id=after_id)
+
+    all_professions = await profession_repo.get_all_professions(session=session, limit=limit, after_id=after_id)
 
     return all_professions
 
@@ -29,16 +42,60 @@ async def get_all_professions() -> list[ProfessionSchema]:
 )
 async def get_profession_by_id(
         profession_id: int,
+        session: AsyncSession = Depends(get_session),
 ) -> ProfessionSchema:
     try:
-        async with database.session() as session:
-            profession = await profession_repo.get_profession_by_id(session=session, profession_id=profession_id)
+        profession = await profession_repo.get_profession_by_id(session=session, profession_id=profession_id)
     except ProfessionNotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
     return profession
 
 
+@profession_router.get(
+    "/professions/{profession_id}/top_candidates",
+    response_model=TopCandidatesResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(get_current_user)],
+)
+async def get_top_candidates(
+        profession_id: int,
+        k: int = Query(default=50, ge=1, le=1000),
+        min_match: float = Query(default=0, ge=0, le=100),
+        after_match: float | None = None,
+        after_id: int | None = None,
+        session: AsyncSession = Depends(get_session),
+) -> TopCandidatesResponse:
+    # Курсор задаётся парой (after_match, after_id) из next_cursor, по одной части позицию не восстановить
+    if (after_match is None) != (after_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="after_match и after_id должны передаваться вместе",
+        )
+
+    try:
+        await profession_repo.get_profession_by_id(session=session, profession_id=profession_id)
+        results = await score_repo.get_top_candidates(
+            session=session,
+            profession_id=profession_id,
+            limit=k,
+            min_match=min_match,
+            after_match=after_match,
+            after_id=after_id,
+        )
+    except ProfessionNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+
+    next_cursor = None
+    if len(results) == k:
+        next_cursor = TopCandidatesCursor(
+            match_percentage=results[-1].match_percentage,
+            resume_id=results[-1].resume_id,
+        )
+
+    return TopCandidatesResponse(results=results, next_cursor=next_cursor)
+
+
 @profession_router.post(
     "/add_profession",
     response_model=ProfessionSchema,
@@ -47,11 +104,11 @@ async def get_profession_by_id(
 async def add_profession(
         profession_dto: ProfessionCreateUpdateSchema,
         current_user: UserSchema = Depends(get_current_user),
+        session: AsyncSession = Depends(get_session),
 ) -> ProfessionSchema:
     check_for_admin_access(user=current_user)
     try:
-        async with database.session() as session:
-            new_profession = await profession_repo.create_profession(session=session, profession=profession_dto)
+        new_profession = await profession_repo.create_profession(session=session, profession=profession_dto)
     except ProfessionAlreadyExists as error:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
 
@@ -67,18 +124,31 @@ async def update_profession(
         profession_id: int,
         profession_dto: ProfessionCreateUpdateSchema,
         current_user: UserSchema = Depends(get_current_user),
+        session: AsyncSession = Depends(get_session),
 ) -> ProfessionSchema:
     check_for_admin_access(user=current_user)
     try:
-        async with database.session() as session:
-            updated_profession = await profession_repo.update_profession(
-                session=session,
-                profession_id=profession_id,
-                profession=profession_dto,
-            )
+        previous_profession = await profession_repo.get_profession_by_id(
+            session=session,
+            profession_id=profession_id,
+        )
+        updated_profession = await profession_repo.update_profession(
+            session=session,
+            profession_id=profession_id,
+            profession=profession_dto,
+        )
     except ProfessionNotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
+    # Сохранённые резюме профессии пересчитываются в фоне по уже извлечённому тексту.
+    # Задача читает профессию в своей сессии, поэтому изменения фиксируются до её постановки в очередь
+    if previous_profession.competencies != updated_profession.competencies:
+        await session.commit()
+        await analysis_job_queue.submit_reanalysis(
+            profession_id=profession_id,
+            previous_competencies=previous_profession.competencies,
+        )
+
     return updated_profession
 
 
@@ -89,10 +159,10 @@ async def update_profession(
 async def delete_profession(
         profession_id: int,
         current_user: UserSchema = Depends(get_current_user),
+        session: AsyncSession = Depends(get_session),
 ) -> None:
     check_for_admin_access(user=current_user)
     try:
-        async with database.session() as session:
-            await profession_repo.delete_profession(session=session, profession_id=profession_id)
+        await profession_repo.delete_profession(session=session, profession_id=profession_id)
     except ProfessionNotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
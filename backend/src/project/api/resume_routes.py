@@ -1,15 +1,30 @@
-from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File, Form, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import ValidationError
 from typing import List
 
 from project.schemas.resume import *
 from project.schemas.profession import *
-from project.core.exceptions import ResumeNotFound, ProfessionNotFound
-from project.api.depends import database, resume_repo, profession_repo, get_current_user, check_for_admin_access
+from project.schemas.competency import CompetencySearchSchema
+from project.core.exceptions import ResumeNotFound, ProfessionNotFound, FileParsingError
+from project.api.streaming import ndjson_response
+from project.api.depends import (
+    database,
+    get_session,
+    resume_repo,
+    profession_repo,
+    competency_repo,
+    get_current_user,
+    get_current_user_short_session,
+    check_for_admin_access,
+)
 from project.schemas.user import UserSchema
-from project.resource.analyze import Analyzer
+from project.resource.uploads import spool_upload
+from project.resource.matching import match_resumes
 
-import json
+import tempfile
+from pathlib import Path
 
 resume_router = APIRouter()
 
@@ -20,9 +35,17 @@ resume_router = APIRouter()
     status_code=status.HTTP_200_OK,
     dependencies=[Depends(get_current_user)],
 )
-async def get_all_resumes() -> list[ResumeSchema]:
-    async with database.session() as session:
-        all_resumes = await resume_repo.get_all_resumes(session=session)
+async def get_all_resumes(
+        limit: int | None = Query(default=None, ge=1, le=1000),
+        after_id: int | None = None,
+        stream: bool = False,
+        session: AsyncSession = Depends(get_session),
+) -> list[ResumeSchema] | StreamingResponse:
+    # stream=true - записи после after_id в формате NDJSON без загрузки таблицы в память
+    if stream:
+        return ndjson_response(resume_repo.stream_all_resumes, limit=limit, after_id=after_id)
+
+    all_resumes = await resume_repo.get_all_resumes(session=session, limit=limit, after_id=after_id)
 
     return all_resumes
 
@@ -35,10 +58,10 @@ async def get_all_resumes() -> list[ResumeSchema]:
 )
 async def get_resume_by_id(
         resume_id: int,
+        session: AsyncSession = Depends(get_session),
 ) -> ResumeSchema:
     try:
-        async with database.session() as session:
-            resume = await resume_repo.get_resume_by_id(session=session, resume_id=resume_id)
+        resume = await resume_repo.get_resume_by_id(session=session, resume_id=resume_id)
     except ResumeNotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
@@ -53,11 +76,11 @@ async def get_resume_by_id(
 async def add_resume(
         resume_dto: ResumeCreateUpdateSchema,
         current_user: UserSchema = Depends(get_current_user),
+        session: AsyncSession = Depends(get_session),
 ) -> ResumeSchema:
     check_for_admin_access(user=current_user)
     try:
-        async with database.session() as session:
-            new_resume = await resume_repo.create_resume(session=session, resume=resume_dto)
+        new_resume = await resume_repo.create_resume(session=session, resume=resume_dto)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -73,15 +96,15 @@ async def update_resume(
         resume_id: int,
         resume_dto: ResumeCreateUpdateSchema,
         current_user: UserSchema = Depends(get_current_user),
+        session: AsyncSession = Depends(get_session),
 ) -> ResumeSchema:
     check_for_admin_access(user=current_user)
     try:
-        async with database.session() as session:
-            updated_resume = await resume_repo.update_resume(
-                session=session,
-                resume_id=resume_id,
-                resume=resume_dto,
-            )
+        updated_resume = await resume_repo.update_resume(
+            session=session,
+            resume_id=resume_id,
+            resume=resume_dto,
+        )
     except ResumeNotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
@@ -95,11 +118,11 @@ async def update_resume(
 async def delete_resume(
         resume_id: int,
         current_user: UserSchema = Depends(get_current_user),
+        session: AsyncSession = Depends(get_session),
 ) -> None:
     check_for_admin_access(user=current_user)
     try:
-        async with database.session() as session:
-            await resume_repo.delete_resume(session=session, resume_id=resume_id)
+        await resume_repo.delete_resume(session=session, resume_id=resume_id)
     except ResumeNotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
@@ -108,44 +131,108 @@ async def delete_resume(
     "/analyze_files/{profession_id}",
     response_model=ProcessedResumeResponse,
     status_code=status.HTTP_200_OK,
-    dependencies=[Depends(get_current_user)],
+    dependencies=[Depends(get_current_user_short_session)],
 )
 async def analyze_files(
         profession_id: int,
         files: List[UploadFile] = File(...),
 ) -> ProcessedResumeResponse:
+    # Сессии короткие: соединение из пула не должно простаивать, пока файлы анализируются
     try:
-        analyzer = Analyzer()
-
         async with database.session() as session:
             profession = await profession_repo.get_profession_by_id(session=session, profession_id=profession_id)
 
-        files_content = []
-        for file in files:
-            content = await analyzer.parse_file(file)
-            files_content.append(
+        with tempfile.TemporaryDirectory() as spool_dir:
+            files_content = [
                 FileUploadSchema(
                     filename=file.filename,
-                    content=content
+                    path=str(await spool_upload(file, Path(spool_dir) / f"{index:05d}_{Path(file.filename).name}"))
                 )
+                for index, file in enumerate(files)
+            ]
+
+            files_data = MultiFileUploadSchema(
+                files=files_content,
+                profession=profession
             )
 
-        files_data = MultiFileUploadSchema(
-            files=files_content,
-            profession=profession
+            result = await resume_repo.process_multiple_files(files_data=files_data)
+
+        return result
+
+    except ProfessionNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+
+    except FileParsingError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
 
+
+@resume_router.post(
+    "/analyze_files_for_professions",
+    response_model=MultiProfessionAnalysisResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(get_current_user_short_session)],
+)
+async def analyze_files_for_professions(
+        profession_ids: List[int] = Query(...),
+        files: List[UploadFile] = File(...),
+) -> MultiProfessionAnalysisResponse:
+    # Текст каждого файла извлекается и разбивается на токены один раз для всех профессий
+    profession_ids = list(dict.fromkeys(profession_ids))
+    try:
         async with database.session() as session:
-            result = await resume_repo.process_multiple_files(
-                session=session,
-                files_data=files_data
+            professions = [
+                await profession_repo.get_profession_by_id(session=session, profession_id=profession_id)
+                for profession_id in profession_ids
+            ]
+
+        with tempfile.TemporaryDirectory() as spool_dir:
+            files_content = [
+                FileUploadSchema(
+                    filename=file.filename,
+                    path=str(await spool_upload(file, Path(spool_dir) / f"{index:05d}_{Path(file.filename).name}"))
+                )
+                for index, file in enumerate(files)
+            ]
+
+            files_data = MultiProfessionUploadSchema(
+                files=files_content,
+                professions=professions
             )
 
-        return result
+            resume_ids = await resume_repo.process_files_for_professions(files_data=files_data)
+
+        async with database.session() as session:
+            results = [
+                ProfessionAnalysisResult(
+                    profession_id=profession.id,
+                    resume_ids=profession_resume_ids,
+                    results=await resume_repo.get_profession_matches(
+                        session=session,
+                        profession_id=profession.id,
+                        resume_ids=list(dict.fromkeys(profession_resume_ids))
+                    )
+                )
+                for profession, profession_resume_ids in zip(professions, resume_ids)
+            ]
+
+        return MultiProfessionAnalysisResponse(
+            professions=results,
+            status=f"Processed {len(files)} files for {len(professions)} professions"
+        )
 
     except ProfessionNotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
+    except FileParsingError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
+
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -162,76 +249,44 @@ async def analyze_files(
 async def get_analyze_resumes_for_profession(
         profession_id: int,
         resume_ids: List[int],
+        mode: ScoringMode = ScoringMode.SQL,
+        session: AsyncSession = Depends(get_session),
 ) -> ProfessionResumeMatchResponse:
     try:
-        async with database.session() as session:
-            # Получаем профессию
-            profession = await profession_repo.get_profession_by_id(
+        # Получаем профессию
+        profession = await profession_repo.get_profession_by_id(
+            session=session,
+            profession_id=profession_id
+        )
+
+        if mode == ScoringMode.SQL:
+            # Оценка считается в Postgres, в приложение приходят только баллы и несоответствия
+            results = await resume_repo.get_profession_matches(
                 session=session,
-                profession_id=profession_id
+                profession_id=profession.id,
+                resume_ids=resume_ids
             )
-
-            # Получаем резюме
+            found_ids = {result.resume_id for result in results}
+        else:
             resumes = await resume_repo.get_resumes_by_ids(
                 session=session,
                 resume_ids=resume_ids
             )
-
-            # Проверяем, что все резюме найдены
             found_ids = {resume.id for resume in resumes}
-            not_found = [id_ for id_ in resume_ids if id_ not in found_ids]
-            if not_found:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Resumes with IDs {not_found} not found"
-                )
 
+        # Проверяем, что все резюме найдены
+        not_found = [id_ for id_ in resume_ids if id_ not in found_ids]
+        if not_found:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Resumes with IDs {not_found} not found"
+            )
+
+        if mode == ScoringMode.PYTHON:
             # Анализируем соответствие
-            results = []
-            required_competencies = profession.competencies.get("competencies", [])
-
-            for resume in resumes:
-                resume_competencies = resume.competencies.get("competencies", [])
-                resume_comp_dict = {comp["name"]: comp["level"] for comp in resume_competencies}
-
-                total_possible = 0
-                total_matched = 0
-                mismatches = []
-
-                for req_comp in required_competencies:
-                    comp_name = req_comp["name"]
-                    required_level = req_comp["level"]
-                    total_possible += required_level
-
-                    if comp_name in resume_comp_dict:
-                        actual_level = resume_comp_dict[comp_name]
-                        if actual_level >= required_level:
-                            total_matched += required_level
-                        else:
-                            total_matched += actual_level
-                            mismatches.append(CompetencyMismatch(
-                                name=comp_name,
-                                required_level=required_level,
-                                actual_level=actual_level
-                            ))
-                    else:
-                        mismatches.append(CompetencyMismatch(
-                            name=comp_name,
-                            required_level=required_level,
-                            actual_level=0
-                        ))
-
-                match_percentage = (total_matched / total_possible * 100) if total_possible > 0 else 0
-
-                results.append(ResumeMatchResult(
-                    resume_id=resume.id,
-                    first_name=resume.first_name,
-                    last_name=resume.last_name,
-                    match_percentage=round(match_percentage, 2),
-                    mismatched_competencies=mismatches
-                ))
-
-            return ProfessionResumeMatchResponse(results=results)
+            results = match_resumes(profession=profession, resumes=resumes)
+
+        return ProfessionResumeMatchResponse(results=results)
 
     except ProfessionNotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
@@ -250,23 +305,23 @@ async def get_analyze_resumes_for_profession(
 )
 async def get_resumes_by_ids(
         resume_ids: List[int],
+        session: AsyncSession = Depends(get_session),
 ) -> ResumeListResponse:
     try:
-        async with database.session() as session:
-            resumes = await resume_repo.get_resumes_by_ids(
-                session=session,
-                resume_ids=resume_ids
-            )
+        resumes = await resume_repo.get_resumes_by_ids(
+            session=session,
+            resume_ids=resume_ids
+        )
 
-            # Проверяем, все ли ID были найдены
-            found_ids = {resume.id for resume in resumes}
-            not_found = [id_ for id_ in resume_ids if id_ not in found_ids]
+        # Проверяем, все ли ID были найдены
+        found_ids = {resume.id for resume in resumes}
+        not_found = [id_ for id_ in resume_ids if id_ not in found_ids]
 
-            if not_found:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Resumes with IDs {not_found} not found"
-                )
+        if not_found:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Resumes with IDs {not_found} not found"
+            )
 
     except Exception as e:
         raise HTTPException(
@@ -275,3 +330,25 @@ async def get_resumes_by_ids(
         )
 
     return ResumeListResponse(resumes=resumes)
+
+
+@resume_router.post(
+    "/search_resumes",
+    response_model=ResumeListResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(get_current_user)],
+)
+async def search_resumes(
+        search_dto: CompetencySearchSchema,
+        limit: int = Query(default=100, ge=1, le=1000),
+        session: AsyncSession = Depends(get_session),
+) -> ResumeListResponse:
+    resume_ids = await competency_repo.search_resume_ids(
+        session=session,
+        filters=search_dto.competencies,
+        limit=limit,
+    )
+    resumes = await resume_repo.get_resumes_by_ids(session=session, resume_ids=resume_ids)
+
+    resumes.sort(key=lambda resume: resume.id)
+    return ResumeListResponse(resumes=resumes)
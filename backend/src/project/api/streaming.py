@@ -0,0 +1,25 @@
+from typing import AsyncIterator, Callable
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from project.infrastructure.postgres.database import database
+
+
+async def _ndjson_lines(
+        stream: Callable[..., AsyncIterator[list[BaseModel]]],
+        **kwargs,
+) -> AsyncIterator[str]:
+    # Сессия зависимости get_session закрывается до отправки тела ответа, поэтому у потока своя сессия
+    async with database.session() as session:
+        async for batch in stream(session=session, **kwargs):
+            yield "".join(item.model_dump_json() + "\n" for item in batch)
+
+
+def ndjson_response(
+        stream: Callable[..., AsyncIterator[list[BaseModel]]],
+        **kwargs,
+) -> StreamingResponse:
+    """Ответ в формате NDJSON (по объекту JSON на строку) из пачек, которые отдаёт stream(session, **kwargs)."""
+    return StreamingResponse(_ndjson_lines(stream, **kwargs), media_type="application/x-ndjson")
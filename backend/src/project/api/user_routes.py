@@ -1,10 +1,21 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from project.schemas.user import UserSchema, UserCreateUpdateSchema
 
-from project.core.exceptions import UserNotFound, UserAlreadyExists
-from project.api.depends import database, user_repo, get_current_user, check_for_admin_access
-from project.resource.auth import get_password_hash
+from project.core.exceptions import UserNotFound, UserAlreadyExists, PasswordHashQueueFull
+from project.api.streaming import ndjson_response
+from project.api.depends import (
+    database,
+    get_session,
+    user_repo,
+    get_current_user,
+    get_current_user_short_session,
+    check_for_admin_access,
+    overloaded_exception,
+)
+from project.resource.auth import password_hasher, principal_cache
 
 user_router = APIRouter()
 
@@ -15,9 +26,17 @@ user_router = APIRouter()
     status_code=status.HTTP_200_OK,
     dependencies=[Depends(get_current_user)],
 )
-async def get_all_users() -> list[UserSchema]:
-    async with database.session() as session:
-        all_users = await user_repo.get_all_users(session=session)
+async def get_all_users(
+        limit: int | None = Query(default=None, ge=1, le=1000),
+        after_id: int | None = None,
+        stream: bool = False,
+        session: AsyncSession = Depends(get_session),
+) -> list[UserSchema] | StreamingResponse:
+    # stream=true - записи после after_id в формате NDJSON без загрузки таблицы в память
+    if stream:
+        return ndjson_response(user_repo.stream_all_users, limit=limit, after_id=after_id)
+
+    all_users = await user_repo.get_all_users(session=session, limit=limit, after_id=after_id)
 
     return all_users
 
@@ -30,10 +49,10 @@ async def get_all_users() -> list[UserSchema]:
 )
 async def get_user_by_id(
         user_id: int,
+        session: AsyncSession = Depends(get_session),
 ) -> UserSchema:
     try:
-        async with database.session() as session:
-            user = await user_repo.get_user_by_id(session=session, user_id=user_id)
+        user = await user_repo.get_user_by_id(session=session, user_id=user_id)
     except UserNotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
@@ -47,15 +66,18 @@ async def get_user_by_id(
 )
 async def add_user(
         user_dto: UserCreateUpdateSchema,
-        current_user: UserSchema = Depends(get_current_user),
+        current_user: UserSchema = Depends(get_current_user_short_session),
 ) -> UserSchema:
     check_for_admin_access(user=current_user)
     try:
+        # Хеш считается до открытия сессии, чтобы соединение из пула не простаивало на время bcrypt
+        user_dto.password = await password_hasher.hash(password=user_dto.password)
         async with database.session() as session:
-            user_dto.password = get_password_hash(password=user_dto.password)
             new_user = await user_repo.create_user(session=session, user=user_dto)
     except UserAlreadyExists as error:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
+    except PasswordHashQueueFull as error:
+        raise overloaded_exception(detail=error.message)
 
     return new_user
 
@@ -68,12 +90,12 @@ async def add_user(
 async def update_user(
         user_id: int,
         user_dto: UserCreateUpdateSchema,
-        current_user: UserSchema = Depends(get_current_user),
+        current_user: UserSchema = Depends(get_current_user_short_session),
 ) -> UserSchema:
     check_for_admin_access(user=current_user)
     try:
+        user_dto.password = await password_hasher.hash(password=user_dto.password)
         async with database.session() as session:
-            user_dto.password = get_password_hash(password=user_dto.password)
             updated_user = await user_repo.update_user(
                 session=session,
                 user_id=user_id,
@@ -81,6 +103,11 @@ async def update_user(
             )
     except UserNotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    except PasswordHashQueueFull as error:
+        raise overloaded_exception(detail=error.message)
+
+    # Сброс после выхода из сессии (фиксации), иначе параллельный запрос может снова закэшировать прежние данные
+    principal_cache.invalidate(user_id=user_id)
 
     return updated_user
 
@@ -92,12 +119,15 @@ async def update_user(
 async def delete_user(
         user_id: int,
         current_user: UserSchema = Depends(get_current_user),
+        session: AsyncSession = Depends(get_session),
 ) -> None:
     check_for_admin_access(user=current_user)
     try:
-        async with database.session() as session:
-            user = await user_repo.delete_user(session=session, user_id=user_id)
+        user = await user_repo.delete_user(session=session, user_id=user_id)
     except UserNotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
+    await session.commit()
+    principal_cache.invalidate(user_id=user_id)
+
     return user
@@ -1,3 +1,7 @@
+import tempfile
+from pathlib import Path
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 from pydantic import SecretStr
 
@@ -15,10 +19,42 @@ class Settings(BaseSettings):
     POSTGRES_USER: SecretStr
     POSTGRES_PASSWORD: SecretStr
     POSTGRES_RECONNECT_INTERVAL_SEC: int
+    POSTGRES_POOL_SIZE: int = 10
+    POSTGRES_MAX_OVERFLOW: int = 10
+    POSTGRES_POOL_TIMEOUT_SEC: float = 30
+    POSTGRES_POOL_RECYCLE_SEC: int = 1800
+    POSTGRES_POOL_PRE_PING: bool = True
+    POSTGRES_STATEMENT_CACHE_SIZE: int = 100
 
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     SECRET_AUTH_KEY: SecretStr
     AUTH_ALGORITHM: str
+    # Кэш пользователей по токену в get_current_user, 0 в любом из параметров отключает кэш
+    PRINCIPAL_CACHE_SIZE: int = 1024
+    PRINCIPAL_CACHE_TTL_SEC: int = 60
+    # Потоки для bcrypt и число запросов, ожидающих свободный поток, сверх которого вход отклоняется с 503
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+
+    COMPETENCY_PARSER_CACHE_SIZE: int = 128
+    MORPH_CACHE_SIZE: int = 50000
+    CONTACT_HEADER_WINDOW: int = 1000
+    ANALYSIS_WORKERS: int = 0
+
+    ANALYSIS_JOB_WORKERS: int = 2
+    ANALYSIS_JOB_QUEUE_SIZE: int = 100
+    ANALYSIS_SPOOL_DIR: Path = Path(tempfile.gettempdir()) / "resume_uploads"
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    RESUME_INSERT_CHUNK_SIZE: int = 500
+    LIST_STREAM_BATCH_SIZE: int = 500
+    STORE_RESUME_TOKENS: bool = True
+
+    # layout - полный анализ разметки pdfminer, fast - без упорядочивания блоков, stream - без анализа разметки
+    # (быстрее всего, но порядок текста в многоколоночных документах может отличаться от layout)
+    PDF_BACKEND: Literal["layout", "fast", "stream"] = "layout"
+    # Сколько первых страниц PDF извлекать, 0 - все; об отброшенных страницах пишется предупреждение в лог
+    PDF_MAX_PAGES: int = 0
+    PDF_PAGES_PER_TASK: int = 8
 
     @property
     def postgres_url(self) -> str:
@@ -61,4 +61,45 @@ class ResumeNotFound(BaseException):
 
     def __init__(self, _id: int | str) -> None:
         self.message = self._ERROR_MESSAGE_TEMPLATE.format(id=_id)
-        super().__init__(self.message)
\ No newline at end of file
+        super().__init__(self.message)
+
+class FileParsingError(BaseException):
+    _ERROR_MESSAGE_TEMPLATE: Final[str] = "Не удалось обработать файл '{filename}': {reason}"
+    message: str
+
+    def __init__(self, filename: str, reason: str) -> None:
+        self.filename = filename
+        self.reason = reason
+        self.message = self._ERROR_MESSAGE_TEMPLATE.format(filename=filename, reason=reason)
+        super().__init__(self.message)
+
+    def __reduce__(self):
+        # Исключение передаётся из процессов-обработчиков, поэтому восстанавливаем его по исходным аргументам
+        return self.__class__, (self.filename, self.reason)
+
+
+class AnalysisJobNotFound(BaseException):
+    _ERROR_MESSAGE_TEMPLATE: Final[str] = "Задача анализа с id {id} не найдена"
+    message: str
+
+    def __init__(self, _id: int | str) -> None:
+        self.message = self._ERROR_MESSAGE_TEMPLATE.format(id=_id)
+        super().__init__(self.message)
+
+
+class AnalysisQueueFull(BaseException):
+    _ERROR_MESSAGE_TEMPLATE: Final[str] = "Очередь анализа переполнена, повторите попытку позже"
+    message: str
+
+    def __init__(self) -> None:
+        self.message = self._ERROR_MESSAGE_TEMPLATE
+        super().__init__(self.message)
+
+
+class PasswordHashQueueFull(BaseException):
+    _ERROR_MESSAGE_TEMPLATE: Final[str] = "Сервер перегружен проверкой паролей, повторите попытку позже"
+    message: str
+
+    def __init__(self) -> None:
+        self.message = self._ERROR_MESSAGE_TEMPLATE
+        super().__init__(self.message)
@@ -1,16 +1,75 @@
+import time
 from contextlib import asynccontextmanager
 from typing import Any, AsyncIterator, Dict
 
 from sqlalchemy import JSON, MetaData, String
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from project.core.config import settings
 
 
+class MonitoredQueuePool(AsyncAdaptedQueuePool):
+    """
+    Пул соединений, который считает время получения соединения и отказы по таймауту.
+    Время включает ожидание свободного соединения и установку нового, если пул ещё не заполнен.
+    """
+
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_time: float = 0.0
+    max_wait_time: float = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.checkouts += 1
+            self.wait_time += waited
+            self.max_wait_time = max(self.max_wait_time, waited)
+
+
 class PostgresDatabase:
+    """
+    Общий на приложение движок SQLAlchemy с одним пулом соединений.
+    Движок создаётся в lifespan приложения через connect и закрывается через dispose.
+    Скрипты, которые не запускают приложение, получают движок при первом открытии сессии.
+    """
+
     def __init__(self) -> None:
-        self._engine = create_async_engine(settings.postgres_url)
+        self._engine: AsyncEngine | None = None
+        self._session_factory: async_sessionmaker[AsyncSession] | None = None
+
+    @property
+    def engine(self) -> AsyncEngine:
+        if self._engine is None:
+            self.connect()
+        return self._engine
+
+    def connect(self) -> None:
+        if self._engine is not None:
+            return
+        self._engine = create_async_engine(
+            settings.postgres_url,
+            poolclass=MonitoredQueuePool,
+            pool_size=settings.POSTGRES_POOL_SIZE,
+            max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+            pool_timeout=settings.POSTGRES_POOL_TIMEOUT_SEC,
+            pool_recycle=settings.POSTGRES_POOL_RECYCLE_SEC,
+            pool_pre_ping=settings.POSTGRES_POOL_PRE_PING,
+            connect_args={
+                # Кэш подготовленных выражений asyncpg и адаптера SQLAlchemy, 0 нужен за pgbouncer в режиме transaction
+                "statement_cache_size": settings.POSTGRES_STATEMENT_CACHE_SIZE,
+                "prepared_statement_cache_size": settings.POSTGRES_STATEMENT_CACHE_SIZE,
+            },
+        )
         self._session_factory = async_sessionmaker(
             bind=self._engine,
             autocommit=False,
@@ -19,8 +78,15 @@ class PostgresDatabase:
             class_=AsyncSession,
         )
 
+    async def dispose(self) -> None:
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
+            self._session_factory = None
+
     @asynccontextmanager
     async def session(self) -> AsyncIterator[AsyncSession]:
+        self.connect()
         async with self._session_factory() as session:
             try:
                 yield session
@@ -29,6 +95,21 @@ class PostgresDatabase:
                 await session.rollback()
                 raise
 
+    def pool_stats(self) -> dict:
+        """Состояние пула соединений, время ожидания соединения в миллисекундах."""
+        pool = self.engine.pool
+        return {
+            'size': pool.size(),
+            'checked_out': pool.checkedout(),
+            'checked_in': pool.checkedin(),
+            'overflow': max(pool.overflow(), 0),
+            'max_overflow': settings.POSTGRES_MAX_OVERFLOW,
+            'checkouts': pool.checkouts,
+            'timeouts': pool.timeouts,
+            'avg_wait_ms': round(pool.wait_time / pool.checkouts * 1000, 3) if pool.checkouts else 0.0,
+            'max_wait_ms': round(pool.max_wait_time * 1000, 3),
+        }
+
 
 database = PostgresDatabase()
 metadata = MetaData(schema=settings.POSTGRES_SCHEMA)
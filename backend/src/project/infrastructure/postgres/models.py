@@ -1,8 +1,8 @@
-from datetime import date
+from datetime import date, datetime
 from typing import Any
 
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import ForeignKey, false
+from sqlalchemy import ForeignKey, Index, LargeBinary, SmallInteger, String, Text, false, func, text
 from project.infrastructure.postgres.database import Base
 from sqlalchemy.dialects.postgresql import JSONB
 
@@ -37,3 +37,86 @@ class Resume(Base):
     email: Mapped[str | None] = mapped_column(nullable=True)
 
     competencies: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+
+
+class AnalysisJob(Base):
+    __tablename__ = "analysis_jobs"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    profession_id: Mapped[int] = mapped_column(ForeignKey(Profession.id, ondelete="CASCADE"), nullable=False)
+    status: Mapped[str] = mapped_column(nullable=False, index=True)
+
+    total_files: Mapped[int] = mapped_column(nullable=False)
+    processed_files: Mapped[int] = mapped_column(default=0, server_default=text("0"))
+    failed_files: Mapped[int] = mapped_column(default=0, server_default=text("0"))
+
+    resume_ids: Mapped[list[int]] = mapped_column(JSONB, nullable=False, server_default=text("'[]'::jsonb"))
+    errors: Mapped[list[dict[str, Any]]] = mapped_column(JSONB, nullable=False, server_default=text("'[]'::jsonb"))
+    # Резюме без сохранённого документа, которые задача повторного анализа не может пересчитать
+    skipped_resume_ids: Mapped[list[int]] = mapped_column(JSONB, nullable=False, server_default=text("'[]'::jsonb"))
+    # Компетенции профессии до изменения, заполняются только у задач повторного анализа
+    previous_competencies: Mapped[dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now())
+
+
+class ResumeProfessionScore(Base):
+    __tablename__ = "resume_profession_scores"
+    __table_args__ = (
+        Index(
+            "ix_resume_profession_scores_ranking",
+            "profession_id",
+            text("match_percentage DESC"),
+            "resume_id",
+        ),
+    )
+
+    resume_id: Mapped[int] = mapped_column(ForeignKey(Resume.id, ondelete="CASCADE"), primary_key=True)
+    profession_id: Mapped[int] = mapped_column(ForeignKey(Profession.id, ondelete="CASCADE"), primary_key=True)
+
+    match_percentage: Mapped[float] = mapped_column(nullable=False)
+    matched: Mapped[int] = mapped_column(nullable=False)
+    possible: Mapped[int] = mapped_column(nullable=False)
+    mismatches: Mapped[list[dict[str, Any]]] = mapped_column(JSONB, nullable=False)
+
+
+class Competency(Base):
+    __tablename__ = "competencies"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(Text, nullable=False, unique=True)
+
+
+class ResumeCompetency(Base):
+    __tablename__ = "resume_competencies"
+    __table_args__ = (
+        Index("ix_resume_competencies_competency_level", "competency_id", "level", "resume_id"),
+    )
+
+    resume_id: Mapped[int] = mapped_column(ForeignKey(Resume.id, ondelete="CASCADE"), primary_key=True)
+    competency_id: Mapped[int] = mapped_column(ForeignKey(Competency.id, ondelete="CASCADE"), primary_key=True)
+    level: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+
+
+class ResumeFile(Base):
+    __tablename__ = "resume_files"
+
+    file_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    # Текст и поток токенов для поиска компетенций хранятся сжатыми zlib
+    compressed_text: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    tokens: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    contact_info: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+
+
+class ResumeAnalysis(Base):
+    __tablename__ = "resume_analyses"
+
+    file_hash: Mapped[str] = mapped_column(
+        ForeignKey(ResumeFile.file_hash, ondelete="CASCADE"),
+        primary_key=True,
+    )
+    competencies_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    resume_id: Mapped[int] = mapped_column(ForeignKey(Resume.id, ondelete="CASCADE"), nullable=False, index=True)
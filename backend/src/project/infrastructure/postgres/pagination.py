@@ -0,0 +1,54 @@
+from typing import AsyncIterator, Type, TypeVar
+
+from pydantic import BaseModel
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from project.core.config import settings
+from project.infrastructure.postgres.database import Base
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+
+def build_keyset_query(model: Type[Base], limit: int | None, after_id: int | None) -> Select:
+    """
+    Записи model по возрастанию id после after_id, не больше limit (если он задан).
+    Keyset-пагинация: следующая страница запрашивается с after_id последней записи предыдущей.
+    """
+    query = select(model).order_by(model.id)
+    if after_id is not None:
+        query = query.where(model.id > after_id)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+async def fetch_page(
+        session: AsyncSession,
+        model: Type[Base],
+        schema: Type[SchemaT],
+        limit: int | None = None,
+        after_id: int | None = None,
+) -> list[SchemaT]:
+    rows = await session.scalars(build_keyset_query(model, limit, after_id))
+
+    return [schema.model_validate(obj=row) for row in rows.all()]
+
+
+async def stream_pages(
+        session: AsyncSession,
+        model: Type[Base],
+        schema: Type[SchemaT],
+        limit: int | None = None,
+        after_id: int | None = None,
+) -> AsyncIterator[list[SchemaT]]:
+    """
+    Те же записи, что у fetch_page, пачками по LIST_STREAM_BATCH_SIZE.
+    Строки читаются через серверный курсор, поэтому память не зависит от размера таблицы.
+    """
+    query = build_keyset_query(model, limit, after_id).execution_options(yield_per=settings.LIST_STREAM_BATCH_SIZE)
+
+    rows = await session.stream_scalars(query)
+
+    async for partition in rows.partitions():
+        yield [schema.model_validate(obj=row) for row in partition]
@@ -0,0 +1,85 @@
+from typing import Type
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Integer, column, select, delete, func, and_, or_
+from sqlalchemy.dialects.postgresql import JSONB, insert
+
+from project.schemas.competency import CompetencyFilterSchema
+from project.infrastructure.postgres.models import Competency, Resume, ResumeCompetency
+
+
+class CompetencyRepository:
+    _collection: Type[ResumeCompetency] = ResumeCompetency
+
+    async def sync_resumes(
+            self,
+            session: AsyncSession,
+            resume_ids: list[int],
+    ) -> None:
+        """Перестраивает строки resume_competencies для резюме по их JSONB-полю competencies."""
+        if not resume_ids:
+            return
+
+        element = (
+            func.jsonb_array_elements(Resume.competencies["competencies"])
+            .table_valued(column("value", JSONB))
+            .render_derived("element")
+        )
+        element_name = element.c.value["name"].astext
+        element_level = element.c.value["level"].astext.cast(Integer)
+
+        add_names_query = insert(Competency).from_select(
+            ["name"],
+            select(element_name)
+            .select_from(Resume)
+            .join(element, element_name.isnot(None))
+            .where(Resume.id.in_(resume_ids))
+            .distinct(),
+        ).on_conflict_do_nothing(index_elements=[Competency.name])
+        await session.execute(add_names_query)
+
+        await session.execute(
+            delete(self._collection).where(self._collection.resume_id.in_(resume_ids))
+        )
+
+        add_levels_query = insert(self._collection).from_select(
+            ["resume_id", "competency_id", "level"],
+            select(Resume.id, Competency.id, func.max(element_level))
+            .select_from(Resume)
+            .join(element, element_name.isnot(None))
+            .join(Competency, Competency.name == element_name)
+            .where(Resume.id.in_(resume_ids))
+            .group_by(Resume.id, Competency.id),
+        )
+        await session.execute(add_levels_query)
+
+    async def search_resume_ids(
+            self,
+            session: AsyncSession,
+            filters: list[CompetencyFilterSchema],
+            limit: int,
+    ) -> list[int]:
+        """Возвращает id резюме, у которых есть все компетенции из filters не ниже указанного уровня."""
+        min_levels = {}
+        for competency_filter in filters:
+            min_levels[competency_filter.name] = max(
+                competency_filter.min_level,
+                min_levels.get(competency_filter.name, 0),
+            )
+
+        query = (
+            select(self._collection.resume_id)
+            .join(Competency, Competency.id == self._collection.competency_id)
+            .where(or_(*[
+                and_(Competency.name == name, self._collection.level >= min_level)
+                for name, min_level in min_levels.items()
+            ]))
+            .group_by(self._collection.resume_id)
+            .having(func.count() == len(min_levels))
+            .order_by(self._collection.resume_id)
+            .limit(limit)
+        )
+
+        resume_ids = await session.scalars(query)
+
+        return list(resume_ids.all())
@@ -0,0 +1,197 @@
+from typing import Type
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import column, select, delete, exists, func, literal
+from sqlalchemy.orm import aliased
+from sqlalchemy.dialects.postgresql import JSONB, insert
+
+from project.schemas.resume import CachedFileSchema, AnalyzedFileSchema
+from project.infrastructure.postgres.models import Resume, ResumeFile, ResumeAnalysis
+
+
+class FileCacheRepository:
+    """
+    Кэш обработки загруженных файлов по SHA-256 их содержимого:
+    resume_files - сжатые извлечённый текст и поток токенов, контакты; resume_analyses - резюме,
+    созданное из файла для данного набора компетенций профессии.
+    """
+
+    _collection: Type[ResumeFile] = ResumeFile
+    _analyses: Type[ResumeAnalysis] = ResumeAnalysis
+
+    async def get_files(
+            self,
+            session: AsyncSession,
+            file_hashes: list[str],
+    ) -> dict[str, CachedFileSchema]:
+        if not file_hashes:
+            return {}
+
+        query = select(self._collection).where(self._collection.file_hash.in_(file_hashes))
+
+        files = await session.scalars(query)
+
+        return {file.file_hash: CachedFileSchema.model_validate(obj=file) for file in files.all()}
+
+    async def save_files(
+            self,
+            session: AsyncSession,
+            files: list[CachedFileSchema],
+    ) -> None:
+        if not files:
+            return
+
+        query = insert(self._collection).on_conflict_do_nothing(index_elements=[self._collection.file_hash])
+
+        await session.execute(query, [file.model_dump() for file in files])
+
+    async def get_resume_ids(
+            self,
+            session: AsyncSession,
+            file_hashes: list[str],
+            competencies_hash: str,
+    ) -> dict[str, int]:
+        if not file_hashes:
+            return {}
+
+        query = (
+            select(self._analyses.file_hash, self._analyses.resume_id)
+            .where(
+                self._analyses.file_hash.in_(file_hashes),
+                self._analyses.competencies_hash == competencies_hash,
+            )
+        )
+
+        rows = await session.execute(query)
+
+        return {file_hash: resume_id for file_hash, resume_id in rows}
+
+    async def save_resume_ids(
+            self,
+            session: AsyncSession,
+            resume_ids: dict[str, int],
+            competencies_hash: str,
+    ) -> None:
+        if not resume_ids:
+            return
+
+        query = insert(self._analyses)
+        query = query.on_conflict_do_update(
+            index_elements=[self._analyses.file_hash, self._analyses.competencies_hash],
+            set_={"resume_id": query.excluded.resume_id},
+        )
+
+        await session.execute(query, [
+            {"file_hash": file_hash, "competencies_hash": competencies_hash, "resume_id": resume_id}
+            for file_hash, resume_id in resume_ids.items()
+        ])
+
+    def _analyzed_criteria(self, competencies_hash: str, exclude_competencies_hash: str | None) -> list:
+        criteria = [self._analyses.competencies_hash == competencies_hash]
+        if exclude_competencies_hash is not None:
+            # Файлы, которые уже разобраны под exclude_competencies_hash, пропускаются
+            analyzed = aliased(self._analyses)
+            criteria.append(~exists().where(
+                analyzed.file_hash == self._analyses.file_hash,
+                analyzed.competencies_hash == exclude_competencies_hash,
+            ))
+        return criteria
+
+    async def count_analyzed_files(
+            self,
+            session: AsyncSession,
+            competencies_hash: str,
+            exclude_competencies_hash: str | None = None,
+    ) -> int:
+        query = (
+            select(func.count())
+            .select_from(self._analyses)
+            .where(*self._analyzed_criteria(competencies_hash, exclude_competencies_hash))
+        )
+
+        return await session.scalar(query)
+
+    async def get_analyzed_files(
+            self,
+            session: AsyncSession,
+            competencies_hash: str,
+            limit: int,
+            exclude_competencies_hash: str | None = None,
+    ) -> list[AnalyzedFileSchema]:
+        """Файлы, разобранные под данный набор компетенций, с документом и id резюме, по возрастанию id."""
+        query = (
+            select(
+                self._analyses.resume_id,
+                self._collection.file_hash,
+                self._collection.compressed_text,
+                self._collection.tokens,
+                self._collection.contact_info,
+            )
+            .join(self._collection, self._collection.file_hash == self._analyses.file_hash)
+            .where(*self._analyzed_criteria(competencies_hash, exclude_competencies_hash))
+            .order_by(self._analyses.resume_id)
+            .limit(limit)
+        )
+
+        rows = await session.execute(query)
+
+        return [AnalyzedFileSchema.model_validate(obj=row) for row in rows]
+
+    async def move_analyses(
+            self,
+            session: AsyncSession,
+            old_competencies_hash: str,
+            new_competencies_hash: str,
+            file_hashes: list[str] | None = None,
+            keep_old: bool = False,
+    ) -> None:
+        """
+        Переносит записи на новый набор компетенций. file_hashes=None - все записи старого набора.
+        keep_old=True копирует записи: старый набор остаётся у других профессий с теми же компетенциями.
+        """
+        criteria = [self._analyses.competencies_hash == old_competencies_hash]
+        if file_hashes is not None:
+            criteria.append(self._analyses.file_hash.in_(file_hashes))
+
+        # Если файл уже разбирался под новый набор, остаётся прежняя запись нового набора
+        copy_query = insert(self._analyses).from_select(
+            ["file_hash", "competencies_hash", "resume_id"],
+            select(
+                self._analyses.file_hash,
+                literal(new_competencies_hash),
+                self._analyses.resume_id,
+            ).where(*criteria),
+        ).on_conflict_do_nothing(index_elements=[self._analyses.file_hash, self._analyses.competencies_hash])
+        await session.execute(copy_query)
+
+        if not keep_old:
+            await session.execute(delete(self._analyses).where(*criteria))
+
+    async def get_uncached_resume_ids(
+            self,
+            session: AsyncSession,
+            competency_names: list[str],
+    ) -> list[int]:
+        """
+        Резюме без сохранённого документа (загруженные до появления кэша или созданные вручную),
+        которые могли быть получены анализом по competency_names: найдена хотя бы одна компетенция
+        и все найденные входят в competency_names. Резюме без компетенций ни к какому набору
+        не привязать, они не возвращаются. По возрастанию id.
+        """
+        competency = func.jsonb_array_elements(Resume.competencies["competencies"]).table_valued(column("value", JSONB))
+        query = (
+            select(Resume.id)
+            .where(
+                ~exists().where(self._analyses.resume_id == Resume.id),
+                exists(select(competency.c.value)),
+                ~exists(
+                    select(competency.c.value)
+                    .where(competency.c.value["name"].astext.not_in(competency_names))
+                ),
+            )
+            .order_by(Resume.id)
+        )
+
+        resume_ids = await session.scalars(query)
+
+        return list(resume_ids.all())
@@ -0,0 +1,168 @@
+from typing import Type
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, update, func, cast
+from sqlalchemy.dialects.postgresql import JSONB
+
+from project.schemas.job import AnalysisJobSchema, AnalysisJobStatus
+from project.infrastructure.postgres.models import AnalysisJob
+
+from project.core.exceptions import AnalysisJobNotFound
+
+
+class AnalysisJobRepository:
+    _collection: Type[AnalysisJob] = AnalysisJob
+
+    async def create_job(
+            self,
+            session: AsyncSession,
+            profession_id: int,
+            total_files: int,
+            previous_competencies: dict | None = None,
+    ) -> AnalysisJobSchema:
+        query = (
+            insert(self._collection)
+            .values(
+                profession_id=profession_id,
+                status=AnalysisJobStatus.PENDING.value,
+                total_files=total_files,
+                previous_competencies=previous_competencies,
+            )
+            .returning(self._collection)
+        )
+
+        created_job = await session.scalar(query)
+        await session.flush()
+
+        return AnalysisJobSchema.model_validate(obj=created_job)
+
+    async def get_job_by_id(
+            self,
+            session: AsyncSession,
+            job_id: int,
+    ) -> AnalysisJobSchema:
+        query = (
+            select(self._collection)
+            .where(self._collection.id == job_id)
+        )
+
+        job = await session.scalar(query)
+
+        if not job:
+            raise AnalysisJobNotFound(_id=job_id)
+
+        return AnalysisJobSchema.model_validate(obj=job)
+
+    async def get_unfinished_jobs(
+            self,
+            session: AsyncSession,
+    ) -> list[AnalysisJobSchema]:
+        query = (
+            select(self._collection)
+            .where(self._collection.status.in_([AnalysisJobStatus.PENDING.value, AnalysisJobStatus.RUNNING.value]))
+            .order_by(self._collection.id)
+        )
+
+        jobs = await session.scalars(query)
+
+        return [AnalysisJobSchema.model_validate(obj=job) for job in jobs.all()]
+
+    async def set_status(
+            self,
+            session: AsyncSession,
+            job_id: int,
+            status: AnalysisJobStatus,
+    ) -> None:
+        query = (
+            update(self._collection)
+            .where(self._collection.id == job_id)
+            .values(status=status.value)
+        )
+
+        result = await session.execute(query)
+
+        if not result.rowcount:
+            raise AnalysisJobNotFound(_id=job_id)
+
+    async def add_processed_file(
+            self,
+            session: AsyncSession,
+            job_id: int,
+            resume_id: int,
+    ) -> None:
+        query = (
+            update(self._collection)
+            .where(self._collection.id == job_id)
+            .values(
+                processed_files=self._collection.processed_files + 1,
+                resume_ids=self._collection.resume_ids.op("||")(func.jsonb_build_array(resume_id)),
+            )
+        )
+
+        await session.execute(query)
+
+    async def set_total_files(
+            self,
+            session: AsyncSession,
+            job_id: int,
+            total_files: int,
+    ) -> None:
+        query = (
+            update(self._collection)
+            .where(self._collection.id == job_id)
+            .values(total_files=total_files)
+        )
+
+        await session.execute(query)
+
+    async def add_processed_resumes(
+            self,
+            session: AsyncSession,
+            job_id: int,
+            resume_ids: list[int],
+    ) -> None:
+        query = (
+            update(self._collection)
+            .where(self._collection.id == job_id)
+            .values(
+                processed_files=self._collection.processed_files + len(resume_ids),
+                resume_ids=self._collection.resume_ids.op("||")(cast(resume_ids, JSONB)),
+            )
+        )
+
+        await session.execute(query)
+
+    async def add_failed_file(
+            self,
+            session: AsyncSession,
+            job_id: int,
+            filename: str,
+            error: str,
+    ) -> None:
+        query = (
+            update(self._collection)
+            .where(self._collection.id == job_id)
+            .values(
+                failed_files=self._collection.failed_files + 1,
+                errors=self._collection.errors.op("||")(
+                    func.jsonb_build_array(func.jsonb_build_object("filename", filename, "error", error))
+                ),
+            )
+        )
+
+        await session.execute(query)
+
+    async def set_skipped_resumes(
+            self,
+            session: AsyncSession,
+            job_id: int,
+            resume_ids: list[int],
+    ) -> None:
+        """Резюме, которые задача повторного анализа пропустила: перезаписывается при перезапуске задачи."""
+        query = (
+            update(self._collection)
+            .where(self._collection.id == job_id)
+            .values(skipped_resume_ids=cast(resume_ids, JSONB))
+        )
+
+        await session.execute(query)
@@ -1,4 +1,4 @@
-from typing import Type
+from typing import AsyncIterator, Type
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, insert, update, delete
@@ -6,12 +6,15 @@ from sqlalchemy.exc import IntegrityError
 
 from project.schemas.profession import ProfessionSchema, ProfessionCreateUpdateSchema
 from project.infrastructure.postgres.models import Profession
+from project.infrastructure.postgres.pagination import fetch_page, stream_pages
 
 from project.core.exceptions import ProfessionNotFound, ProfessionAlreadyExists
+from project.infrastructure.postgres.repository.score_repo import ScoreRepository
 
 
 class ProfessionRepository:
     _collection: Type[Profession] = Profession
+    _score_repo: ScoreRepository = ScoreRepository()
 
     async def get_profession_by_id(
             self,
@@ -33,12 +36,18 @@ class ProfessionRepository:
     async def get_all_professions(
             self,
             session: AsyncSession,
+            limit: int | None = None,
+            after_id: int | None = None,
     ) -> list[ProfessionSchema]:
-        query = select(self._collection)
+        return await fetch_page(session, self._collection, ProfessionSchema, limit=limit, after_id=after_id)
 
-        professions = await session.scalars(query)
-
-        return [ProfessionSchema.model_validate(obj=profession) for profession in professions.all()]
+    def stream_all_professions(
+            self,
+            session: AsyncSession,
+            limit: int | None = None,
+            after_id: int | None = None,
+    ) -> AsyncIterator[list[ProfessionSchema]]:
+        return stream_pages(session, self._collection, ProfessionSchema, limit=limit, after_id=after_id)
 
     async def create_profession(
             self,
@@ -57,6 +66,8 @@ class ProfessionRepository:
         except IntegrityError:
             raise ProfessionAlreadyExists(name=profession.name)
 
+        await self._score_repo.refresh_for_profession(session=session, profession_id=created_profession.id)
+
         return ProfessionSchema.model_validate(obj=created_profession)
 
     async def update_profession(
@@ -77,6 +88,8 @@ class ProfessionRepository:
         if not updated_profession:
             raise ProfessionNotFound(_id=profession_id)
 
+        await self._score_repo.refresh_for_profession(session=session, profession_id=profession_id)
+
         return ProfessionSchema.model_validate(obj=updated_profession)
 
     async def delete_profession(
@@ -89,4 +102,4 @@ class ProfessionRepository:
         result = await session.execute(query)
 
         if not result.rowcount:
-            raise ProfessionNotFound(_id=profession_id)
\ No newline at end of file
+            raise ProfessionNotFound(_id=profession_id)
@@ -1,18 +1,42 @@
-from typing import Type
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator, Type
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, insert, update, delete
 from sqlalchemy.exc import IntegrityError
 
 from project.schemas.resume import *
-from project.infrastructure.postgres.models import Resume
+from project.infrastructure.postgres.database import database
+from project.infrastructure.postgres.models import Resume, Profession
+from project.infrastructure.postgres.pagination import fetch_page, stream_pages
+from project.infrastructure.postgres.scoring import build_match_query
+from project.infrastructure.postgres.repository.score_repo import ScoreRepository
+from project.infrastructure.postgres.repository.competency_repo import CompetencyRepository
+from project.infrastructure.postgres.repository.file_cache_repo import FileCacheRepository
 
+from project.core.config import settings
 from project.core.exceptions import ResumeNotFound
-from project.resource.analyze import Analyzer
+from project.resource.analyze import competencies_hash
+from project.resource.engine import analysis_engine
+from project.resource.uploads import file_sha256
+from project.resource.matching import match_percentage
 
 
 class ResumeRepository:
     _collection: Type[Resume] = Resume
+    _score_repo: ScoreRepository = ScoreRepository()
+    _competency_repo: CompetencyRepository = CompetencyRepository()
+    _file_cache_repo: FileCacheRepository = FileCacheRepository()
+
+    async def _sync_derived(
+            self,
+            session: AsyncSession,
+            resume_ids: List[int],
+    ) -> None:
+        # Таблицы оценок и индекса компетенций строятся из Resume.competencies и обновляются вместе с ним
+        await self._competency_repo.sync_resumes(session=session, resume_ids=resume_ids)
+        await self._score_repo.refresh_for_resumes(session=session, resume_ids=resume_ids)
 
     async def get_resume_by_id(
             self,
@@ -34,12 +58,18 @@ class ResumeRepository:
     async def get_all_resumes(
             self,
             session: AsyncSession,
+            limit: int | None = None,
+            after_id: int | None = None,
     ) -> list[ResumeSchema]:
-        query = select(self._collection)
-
-        resumes = await session.scalars(query)
+        return await fetch_page(session, self._collection, ResumeSchema, limit=limit, after_id=after_id)
 
-        return [ResumeSchema.model_validate(obj=resume) for resume in resumes.all()]
+    def stream_all_resumes(
+            self,
+            session: AsyncSession,
+            limit: int | None = None,
+            after_id: int | None = None,
+    ) -> AsyncIterator[list[ResumeSchema]]:
+        return stream_pages(session, self._collection, ResumeSchema, limit=limit, after_id=after_id)
 
     async def create_resume(
             self,
@@ -55,8 +85,32 @@ class ResumeRepository:
         created_resume = await session.scalar(query)
         await session.flush()
 
+        await self._sync_derived(session=session, resume_ids=[created_resume.id])
+
         return ResumeSchema.model_validate(obj=created_resume)
 
+    async def create_resumes(
+            self,
+            session: AsyncSession,
+            resumes: List[ResumeCreateUpdateSchema],
+    ) -> List[int]:
+        resume_ids = []
+
+        # Вставка многострочными INSERT ... VALUES порциями, id возвращаются в порядке переданных резюме
+        for start in range(0, len(resumes), settings.RESUME_INSERT_CHUNK_SIZE):
+            chunk = resumes[start:start + settings.RESUME_INSERT_CHUNK_SIZE]
+            query = (
+                insert(self._collection)
+                .returning(self._collection.id, sort_by_parameter_order=True)
+            )
+
+            created_ids = await session.scalars(query, [resume.model_dump() for resume in chunk])
+            resume_ids.extend(created_ids.all())
+
+        await self._sync_derived(session=session, resume_ids=resume_ids)
+
+        return resume_ids
+
     async def update_resume(
             self,
             session: AsyncSession,
@@ -75,8 +129,98 @@ class ResumeRepository:
         if not updated_resume:
             raise ResumeNotFound(_id=resume_id)
 
+        await self._sync_derived(session=session, resume_ids=[resume_id])
+
         return ResumeSchema.model_validate(obj=updated_resume)
 
+    async def update_competencies(
+            self,
+            session: AsyncSession,
+            competencies: dict[int, dict],
+    ) -> None:
+        """Заменяет найденные компетенции у нескольких резюме одним executemany."""
+        if not competencies:
+            return
+
+        await session.execute(
+            update(self._collection),
+            [{"id": resume_id, "competencies": value} for resume_id, value in competencies.items()],
+        )
+
+        await self._sync_derived(session=session, resume_ids=list(competencies))
+
+    async def scan_stored_files(
+            self,
+            files: list[AnalyzedFileSchema],
+            profession: ProfessionSchema,
+    ) -> list[dict]:
+        """
+        Повторяет поиск компетенций профессии по сохранённым документам файлов, результаты в порядке files.
+        Выполняется без сессии, чтобы соединение из пула не простаивало на время анализа.
+        """
+        competencies = await asyncio.gather(*[
+            analysis_engine.scan_stored(
+                compressed_text=file.compressed_text,
+                tokens=file.tokens,
+                professions=[(profession.competencies, profession.id)],
+            )
+            for file in files
+        ])
+
+        return [value for (value,) in competencies]
+
+    async def save_reanalyzed_files(
+            self,
+            session: AsyncSession,
+            profession: ProfessionSchema,
+            previous_comp_hash: str,
+            files: list[AnalyzedFileSchema],
+            competencies: list[dict],
+    ) -> list[int]:
+        """
+        Сохраняет результаты scan_stored_files в резюме, разобранных под прежний набор компетенций профессии,
+        и переносит их в кэше на текущий набор. Возвращает id обновлённых резюме.
+        """
+        comp_hash = competencies_hash(profession.competencies.get("competencies", []))
+
+        await self.update_competencies(
+            session=session,
+            competencies={file.resume_id: value for file, value in zip(files, competencies)},
+        )
+        await self._file_cache_repo.move_analyses(
+            session=session,
+            old_competencies_hash=previous_comp_hash,
+            new_competencies_hash=comp_hash,
+            file_hashes=[file.file_hash for file in files],
+        )
+
+        return [file.resume_id for file in files]
+
+    async def save_rescanned_files(
+            self,
+            session: AsyncSession,
+            profession: ProfessionSchema,
+            files: list[AnalyzedFileSchema],
+            competencies: list[dict],
+    ) -> list[int]:
+        """
+        Как save_reanalyzed_files, но для набора компетенций, общего с другими профессиями: их резюме не меняются,
+        по сохранённому документу создаются новые резюме под текущий набор профессии.
+        Возвращает id созданных резюме.
+        """
+        comp_hash = competencies_hash(profession.competencies.get("competencies", []))
+
+        resume_ids = await self._create_analyzed_resumes(
+            session,
+            [
+                (file.file_hash, ResumeCreateUpdateSchema(**file.contact_info, competencies=value))
+                for file, value in zip(files, competencies)
+            ],
+            comp_hash,
+        )
+
+        return list(resume_ids.values())
+
     async def delete_resume(
             self,
             session: AsyncSession,
@@ -91,42 +235,206 @@ class ResumeRepository:
 
     async def process_multiple_files(
             self,
-            session: AsyncSession,
             files_data: MultiFileUploadSchema,
     ) -> ProcessedResumeResponse:
-        analyzer = Analyzer()
+        resume_ids = await self._process_files(
+            files=files_data.files,
+            professions=[files_data.profession],
+        )
 
-        resume_ids = []
-        need_comp = files_data.profession.competencies
-
-        for file_data in files_data.files:
-            contact_info = analyzer.extract_contact_info(file_data.content)
-
-            resume_data = ResumeCreateUpdateSchema(
-                first_name=contact_info['first_name'],
-                last_name=contact_info['last_name'],
-                birth_date=contact_info['birth_date'],
-                city=contact_info['city'],
-                phone=contact_info['phone'],
-                email=contact_info['email'],
-                competencies=analyzer.analyze(file_data.content, need_comp)
+        return ProcessedResumeResponse(
+            resume_ids=resume_ids[0],
+            status=f"Processed {len(files_data.files)} files"
+        )
+
+    async def process_files_for_professions(
+            self,
+            files_data: MultiProfessionUploadSchema,
+    ) -> list[list[int]]:
+        """Обрабатывает файлы для нескольких профессий за один проход, возвращает id резюме по профессиям."""
+        return await self._process_files(
+            files=files_data.files,
+            professions=files_data.professions,
+        )
+
+    async def _process_files(
+            self,
+            files: list[FileUploadSchema],
+            professions: list[ProfessionSchema],
+    ) -> list[list[int]]:
+        """
+        Сессии открываются отдельно для каждой записи в базу, чтобы соединение из пула не простаивало,
+        пока пул процессов анализирует файлы. Резюме сохраняются порциями по мере обработки файлов.
+        """
+        # Профессии с одинаковым набором компетенций разделяют резюме, анализ выполняется один раз
+        analyzed_professions = {}
+        for profession in professions:
+            comp_hash = competencies_hash(profession.competencies.get("competencies", []))
+            analyzed_professions.setdefault(comp_hash, profession)
+        comp_hashes = list(analyzed_professions)
+
+        resume_ids_by_hash = {comp_hash: {} for comp_hash in comp_hashes}
+        pending_resumes = {comp_hash: [] for comp_hash in comp_hashes}
+        file_positions = {}
+        batch_size = analysis_engine.max_workers
+
+        # Файлы обрабатываются порциями по числу процессов, текст каждого файла освобождается сразу после анализа
+        for start in range(0, len(files), batch_size):
+            batch = files[start:start + batch_size]
+            file_hashes = await asyncio.gather(*[
+                asyncio.to_thread(file_sha256, file_data.path) for file_data in batch
+            ])
+
+            # Повторы одного файла в загрузке обрабатываются один раз
+            new_files = {}
+            for position, (file_data, file_hash) in enumerate(zip(batch, file_hashes), start):
+                if file_hash not in file_positions:
+                    file_positions[file_hash] = []
+                    new_files[file_hash] = file_data
+                file_positions[file_hash].append(position)
+
+            analyzed_files = await self._analyze_files(files=new_files, professions=analyzed_professions)
+            for file_data in batch:
+                Path(file_data.path).unlink(missing_ok=True)
+
+            for comp_hash, analyzed in analyzed_files.items():
+                for file_hash, resume in analyzed.items():
+                    if isinstance(resume, int):
+                        resume_ids_by_hash[comp_hash][file_hash] = resume
+                    else:
+                        pending_resumes[comp_hash].append((file_hash, resume))
+
+                if len(pending_resumes[comp_hash]) >= settings.RESUME_INSERT_CHUNK_SIZE:
+                    async with database.session() as session:
+                        resume_ids_by_hash[comp_hash].update(
+                            await self._create_analyzed_resumes(session, pending_resumes[comp_hash], comp_hash)
+                        )
+                    pending_resumes[comp_hash] = []
+
+        async with database.session() as session:
+            for comp_hash in comp_hashes:
+                resume_ids_by_hash[comp_hash].update(
+                    await self._create_analyzed_resumes(session, pending_resumes[comp_hash], comp_hash)
+                )
+
+        resume_ids = {}
+        for comp_hash in comp_hashes:
+            resume_ids[comp_hash] = [None] * len(files)
+            for file_hash, positions in file_positions.items():
+                for position in positions:
+                    resume_ids[comp_hash][position] = resume_ids_by_hash[comp_hash][file_hash]
+
+        return [
+            resume_ids[competencies_hash(profession.competencies.get("competencies", []))]
+            for profession in professions
+        ]
+
+    async def process_file(
+            self,
+            file_data: FileUploadSchema,
+            profession: ProfessionSchema,
+    ) -> int:
+        """Обрабатывает один файл с учётом кэша, возвращает id нового или ранее созданного резюме."""
+        comp_hash = competencies_hash(profession.competencies.get("competencies", []))
+        file_hash = await asyncio.to_thread(file_sha256, file_data.path)
+
+        analyzed_files = await self._analyze_files(
+            files={file_hash: file_data},
+            professions={comp_hash: profession},
+        )
+        resume = analyzed_files[comp_hash][file_hash]
+        if isinstance(resume, int):
+            return resume
+
+        async with database.session() as session:
+            resume_ids = await self._create_analyzed_resumes(session, [(file_hash, resume)], comp_hash)
+        return resume_ids[file_hash]
+
+    async def _analyze_files(
+            self,
+            files: dict[str, FileUploadSchema],
+            professions: dict[str, ProfessionSchema],
+    ) -> dict[str, dict[str, int | ResumeCreateUpdateSchema]]:
+        """
+        Анализирует файлы по хэшу содержимого для профессий, заданных по хэшу их компетенций.
+        Для файла, уже разобранного под те же компетенции, возвращается id существующего резюме;
+        для известного файла повторяется только поиск компетенций по сохранённому документу;
+        остальные файлы обрабатываются полностью, один раз для всех профессий.
+        Кэш читается и пополняется в коротких сессиях, анализ выполняется вне сессии.
+        """
+        async with database.session() as session:
+            known_resume_ids = {
+                comp_hash: await self._file_cache_repo.get_resume_ids(
+                    session=session,
+                    file_hashes=list(files),
+                    competencies_hash=comp_hash,
+                )
+                for comp_hash in professions
+            }
+            new_hashes = [
+                file_hash for file_hash in files
+                if any(file_hash not in known for known in known_resume_ids.values())
+            ]
+            cached_files = await self._file_cache_repo.get_files(session=session, file_hashes=new_hashes)
+
+        async def analyze(file_hash: str) -> tuple[CachedFileSchema, dict[str, dict]]:
+            # Поиск компетенций только для профессий, по которым резюме из этого файла ещё нет
+            comp_hashes = [comp_hash for comp_hash, known in known_resume_ids.items() if file_hash not in known]
+            targets = [(professions[comp_hash].competencies, professions[comp_hash].id) for comp_hash in comp_hashes]
+
+            cached_file = cached_files.get(file_hash)
+            if cached_file is not None:
+                competencies = await analysis_engine.scan_stored(
+                    compressed_text=cached_file.compressed_text,
+                    tokens=cached_file.tokens,
+                    professions=targets,
+                )
+                return cached_file, dict(zip(comp_hashes, competencies))
+
+            compressed_text, tokens, contact_info, competencies = await analysis_engine.process_file(
+                filename=files[file_hash].filename,
+                path=files[file_hash].path,
+                professions=targets,
+            )
+            cached_file = CachedFileSchema(
+                file_hash=file_hash,
+                compressed_text=compressed_text,
+                tokens=tokens,
+                contact_info=contact_info,
             )
+            return cached_file, dict(zip(comp_hashes, competencies))
 
-            query = (
-                insert(self._collection)
-                .values(resume_data.model_dump())
-                .returning(self._collection)
+        analyzed_files = await asyncio.gather(*[analyze(file_hash) for file_hash in new_hashes])
+
+        async with database.session() as session:
+            await self._file_cache_repo.save_files(
+                session=session,
+                files=[file for file, _ in analyzed_files if file.file_hash not in cached_files],
             )
 
-            created_resume = await session.scalar(query)
-            resume_ids.append(created_resume.id)
+        results = {comp_hash: dict(known) for comp_hash, known in known_resume_ids.items()}
+        for file, competencies in analyzed_files:
+            for comp_hash, value in competencies.items():
+                results[comp_hash][file.file_hash] = ResumeCreateUpdateSchema(**file.contact_info, competencies=value)
+        return results
 
-        await session.flush()
-        return ProcessedResumeResponse(
+    async def _create_analyzed_resumes(
+            self,
+            session: AsyncSession,
+            resumes: list[tuple[str, ResumeCreateUpdateSchema]],
+            comp_hash: str,
+    ) -> dict[str, int]:
+        created_ids = await self.create_resumes(session=session, resumes=[resume for _, resume in resumes])
+        resume_ids = {file_hash: resume_id for (file_hash, _), resume_id in zip(resumes, created_ids)}
+
+        await self._file_cache_repo.save_resume_ids(
+            session=session,
             resume_ids=resume_ids,
-            status=f"Processed {len(files_data.files)} files"
+            competencies_hash=comp_hash,
         )
 
+        return resume_ids
+
     async def get_resumes_by_ids(
             self,
             session: AsyncSession,
@@ -138,3 +446,27 @@ class ResumeRepository:
         )
         resumes = await session.scalars(query)
         return [ResumeSchema.model_validate(obj=resume) for resume in resumes.all()]
+
+    async def get_profession_matches(
+            self,
+            session: AsyncSession,
+            profession_id: int,
+            resume_ids: List[int],
+    ) -> List[ResumeMatchResult]:
+        query = build_match_query(
+            Profession.id == profession_id,
+            self._collection.id.in_(resume_ids),
+        )
+
+        rows = await session.execute(query)
+
+        return [
+            ResumeMatchResult(
+                resume_id=row.resume_id,
+                first_name=row.first_name,
+                last_name=row.last_name,
+                match_percentage=match_percentage(row.matched, row.possible),
+                mismatched_competencies=[CompetencyMismatch(**mismatch) for mismatch in row.mismatches],
+            )
+            for row in rows
+        ]
@@ -0,0 +1,101 @@
+from typing import Type
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Float, Numeric, select, func, and_, or_
+from sqlalchemy.dialects.postgresql import insert
+
+from project.schemas.resume import ResumeMatchResult, CompetencyMismatch
+from project.infrastructure.postgres.models import Resume, Profession, ResumeProfessionScore
+from project.infrastructure.postgres.scoring import build_match_query
+
+
+class ScoreRepository:
+    _collection: Type[ResumeProfessionScore] = ResumeProfessionScore
+
+    async def refresh_for_resumes(
+            self,
+            session: AsyncSession,
+            resume_ids: list[int],
+    ) -> None:
+        if resume_ids:
+            await self._refresh(session, Resume.id.in_(resume_ids))
+
+    async def refresh_for_profession(
+            self,
+            session: AsyncSession,
+            profession_id: int,
+    ) -> None:
+        await self._refresh(session, Profession.id == profession_id)
+
+    async def _refresh(self, session: AsyncSession, *criteria) -> None:
+        scores = build_match_query(*criteria).subquery("scores")
+        match_percentage = func.coalesce(
+            func.round(scores.c.matched.cast(Numeric) * 100 / func.nullif(scores.c.possible, 0), 2),
+            0,
+        ).cast(Float)
+
+        query = insert(self._collection).from_select(
+            ["resume_id", "profession_id", "match_percentage", "matched", "possible", "mismatches"],
+            select(
+                scores.c.resume_id,
+                scores.c.profession_id,
+                match_percentage,
+                scores.c.matched,
+                scores.c.possible,
+                scores.c.mismatches,
+            ),
+        )
+        query = query.on_conflict_do_update(
+            index_elements=[self._collection.resume_id, self._collection.profession_id],
+            set_={
+                "match_percentage": query.excluded.match_percentage,
+                "matched": query.excluded.matched,
+                "possible": query.excluded.possible,
+                "mismatches": query.excluded.mismatches,
+            },
+        )
+
+        await session.execute(query)
+
+    async def get_top_candidates(
+            self,
+            session: AsyncSession,
+            profession_id: int,
+            limit: int,
+            min_match: float = 0,
+            after_match: float | None = None,
+            after_id: int | None = None,
+    ) -> list[ResumeMatchResult]:
+        query = (
+            select(self._collection, Resume.first_name, Resume.last_name)
+            .join(Resume, Resume.id == self._collection.resume_id)
+            .where(
+                self._collection.profession_id == profession_id,
+                self._collection.match_percentage >= min_match,
+            )
+            .order_by(self._collection.match_percentage.desc(), self._collection.resume_id)
+            .limit(limit)
+        )
+
+        if after_match is not None and after_id is not None:
+            # Keyset-пагинация по (match_percentage DESC, resume_id ASC)
+            query = query.where(or_(
+                self._collection.match_percentage < after_match,
+                and_(
+                    self._collection.match_percentage == after_match,
+                    self._collection.resume_id > after_id,
+                ),
+            ))
+
+        rows = await session.execute(query)
+
+        return [
+            ResumeMatchResult(
+                resume_id=score.resume_id,
+                first_name=first_name,
+                last_name=last_name,
+                match_percentage=score.match_percentage,
+                mismatched_competencies=[CompetencyMismatch(**mismatch) for mismatch in score.mismatches],
+            )
+            for score, first_name, last_name in rows
+        ]
@@ -1,4 +1,4 @@
-from typing import Type
+from typing import AsyncIterator, Type
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text, select, insert, update, delete, true
@@ -6,6 +6,7 @@ from sqlalchemy.exc import IntegrityError, PendingRollbackError, InterfaceError
 
 from project.schemas.user import UserSchema, UserCreateUpdateSchema
 from project.infrastructure.postgres.models import User
+from project.infrastructure.postgres.pagination import fetch_page, stream_pages
 
 from project.core.exceptions import UserNotFound, UserAlreadyExists
 
@@ -44,12 +45,18 @@ class UserRepository:
     async def get_all_users(
             self,
             session: AsyncSession,
+            limit: int | None = None,
+            after_id: int | None = None,
     ) -> list[UserSchema]:
-        query = select(self._collection)
+        return await fetch_page(session, self._collection, UserSchema, limit=limit, after_id=after_id)
 
-        users = await session.scalars(query)
-
-        return [UserSchema.model_validate(obj=user) for user in users.all()]
+    def stream_all_users(
+            self,
+            session: AsyncSession,
+            limit: int | None = None,
+            after_id: int | None = None,
+    ) -> AsyncIterator[list[UserSchema]]:
+        return stream_pages(session, self._collection, UserSchema, limit=limit, after_id=after_id)
 
     async def get_user_by_id(
             self,
@@ -0,0 +1,80 @@
+from sqlalchemy import Integer, Select, and_, column, func, literal, or_, select, true
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by
+
+from project.infrastructure.postgres.models import Profession, Resume
+
+
+def build_match_query(*criteria) -> Select:
+    """
+    Запрос оценки соответствия резюме профессиям целиком на стороне Postgres.
+    Требуемые компетенции профессии разворачиваются через jsonb_array_elements, для каждой
+    берётся уровень из резюме (0, если компетенции нет) и суммируется LEAST(actual, required).
+    Возвращает по строке на пару (резюме, профессия): matched, possible и список несоответствий
+    в порядке компетенций профессии. Отсутствующая компетенция - несоответствие при любом требуемом
+    уровне, включая 0. criteria - условия на Resume и Profession.
+    """
+    required = (
+        func.jsonb_array_elements(Profession.competencies["competencies"])
+        .table_valued(column("value", JSONB), with_ordinality="position")
+        .render_derived("required")
+    )
+    required_name = required.c.value["name"].astext
+    required_level = required.c.value["level"].astext.cast(Integer)
+
+    actual = (
+        func.jsonb_array_elements(Resume.competencies["competencies"])
+        .table_valued(column("value", JSONB))
+        .render_derived("actual")
+    )
+    actual_level = (
+        select(func.max(actual.c.value["level"].astext.cast(Integer)))
+        .select_from(actual)
+        .where(actual.c.value["name"].astext == required_name)
+        .scalar_subquery()
+    )
+
+    pairs = (
+        select(
+            Resume.id.label("resume_id"),
+            Profession.id.label("profession_id"),
+            Resume.first_name,
+            Resume.last_name,
+            required.c.position,
+            required_name.label("name"),
+            required_level.label("required_level"),
+            actual_level.label("actual_level"),
+        )
+        .select_from(Resume)
+        .join(Profession, true())
+        .outerjoin(required, true())
+        .where(*criteria)
+        .subquery("pairs")
+    )
+
+    pair_actual_level = func.coalesce(pairs.c.actual_level, 0)
+    mismatch = func.jsonb_build_object(
+        literal("name"), pairs.c.name,
+        literal("required_level"), pairs.c.required_level,
+        literal("actual_level"), pair_actual_level,
+    )
+    is_mismatch = and_(
+        pairs.c.position.is_not(None),
+        or_(pairs.c.actual_level.is_(None), pairs.c.actual_level < pairs.c.required_level),
+    )
+
+    return (
+        select(
+            pairs.c.resume_id,
+            pairs.c.profession_id,
+            pairs.c.first_name,
+            pairs.c.last_name,
+            func.coalesce(func.sum(func.least(pair_actual_level, pairs.c.required_level)), 0).label("matched"),
+            func.coalesce(func.sum(pairs.c.required_level), 0).label("possible"),
+            func.coalesce(
+                func.jsonb_agg(aggregate_order_by(mismatch, pairs.c.position))
+                .filter(is_mismatch),
+                func.jsonb_build_array(),
+            ).label("mismatches"),
+        )
+        .group_by(pairs.c.resume_id, pairs.c.profession_id, pairs.c.first_name, pairs.c.last_name)
+    )
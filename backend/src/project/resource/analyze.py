@@ -1,23 +1,389 @@
+from bisect import bisect_left
+from collections import OrderedDict
 from datetime import datetime
+from threading import Lock
 
-import io
+import hashlib
+import json
+import logging
+import zlib
 
-from pdfminer.high_level import extract_text as pdf_extract_text
 from docx import Document
 
 from yargy import Parser, rule, or_
 from yargy.predicates import dictionary, gram, eq, custom, type as yargy_type
 from yargy.interpretation import fact
-from yargy.tokenizer import MorphTokenizer
+from yargy.morph import MorphAnalyzer
+from yargy.tokenizer import MorphTokenizer, RUSSIAN, EOL
 from yargy.tokenizer import Token
 import re
 
-from fastapi import HTTPException, status, UploadFile
+from project.core.config import settings
+from project.core.exceptions import FileParsingError
+from project.resource.formats import FileFormat, detect_format, read_text_file, extract_doc_text, extract_rtf_text
+from project.resource.pdf import PDF_BACKENDS, count_pdf_pages
+
+logger = logging.getLogger(__name__)
+
+
+def competencies_hash(competencies) -> str:
+    """SHA-256 списка компетенций профессии, не зависящий от порядка ключей."""
+    payload = json.dumps(competencies, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def compress_text(text: str) -> bytes:
+    return zlib.compress(text.encode('utf-8'))
+
+
+def decompress_text(data: bytes) -> str:
+    return zlib.decompress(data).decode('utf-8')
+
+
+class CompetencyParserCache:
+    """
+    LRU-кэш скомпилированных парсеров компетенций.
+    Ключ - id профессии и хэш её списка компетенций, значение - парсер и словарь ключевых слов.
+    Изменение или удаление профессии записи не удаляет: кэш живёт в процессах анализа, куда эти события
+    не доходят, и сбрасывать его не нужно - после изменения компетенций меняется хэш в ключе, поэтому
+    устаревшая запись больше не выбирается и со временем вытесняется по LRU, как и записи удалённых профессий.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    @staticmethod
+    def make_key(profession_id, competencies) -> tuple:
+        return profession_id, competencies_hash(competencies)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+competency_parser_cache = CompetencyParserCache(maxsize=settings.COMPETENCY_PARSER_CACHE_SIZE)
+
+
+class MorphCache(MorphAnalyzer):
+    """
+    Морфологический анализатор pymorphy с ограниченным LRU-кэшем разборов слов.
+    Ключ - слово в нижнем регистре: разбор pymorphy от регистра не зависит, поэтому
+    исходный текст для контактов и приведённый к нижнему регистру текст для компетенций
+    используют одни и те же записи.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        super().__init__()
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, word):
+        key = word.lower()
+        with self._lock:
+            forms = self._entries.get(key)
+            if forms is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return forms
+
+        forms = MorphAnalyzer.__call__(self, word)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = forms
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+        return forms
+
+    def stats(self) -> dict:
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self._maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / requests, 4) if requests else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_morph_cache = None
+
+
+def get_morph_cache() -> MorphCache:
+    """Общий на процесс кэш разборов. Словари pymorphy загружаются при первом обращении."""
+    global _morph_cache
+    if _morph_cache is None:
+        _morph_cache = MorphCache(maxsize=settings.MORPH_CACHE_SIZE)
+    return _morph_cache
+
+
+PUNCTUATION_REGEX = re.compile(r'[\/()\-—.,;:«»]')
+PHONE_REGEX = re.compile(r'(\+7|8)[\s\-]?\(?\d{3}\)?[\s\-]?\d{3}[\s\-]?\d{2}[\s\-]?\d{2}')
+EMAIL_REGEX = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+NON_DIGIT_REGEX = re.compile(r'[^\d]')
+SURNAME_REGEX = re.compile(
+    r'^[А-ЯЁ][а-яё]*(?:-[А-ЯЁ][а-яё]*)?(?:ов|ев|ин|ын|ский|ской|цкий|цкой|ая|ий|ой|ый|ич|ица|ук|юк|ак|як|ец|ик|ка|ко|ла|ло|ра|ро|та|то|ха|хо|ча|чо|ша|шо)$',
+    re.IGNORECASE,
+)
+
+
+def is_surname(token):
+    if not isinstance(token, Token):
+        value = token
+    else:
+        value = token.value
+
+    return bool(SURNAME_REGEX.fullmatch(value))
+
+
+class DocumentTokenizer(MorphTokenizer):
+    """MorphTokenizer, который принимает и готовый список токенов, чтобы текст не разбивался повторно."""
+
+    def __call__(self, text):
+        if isinstance(text, list):
+            return iter(text)
+        return super().__call__(text)
+
+
+class ResumeDocument:
+    """
+    Текст резюме, разобранный на токены один раз для всех извлекателей.
+    tokens - токены исходного текста с позициями и морфологическими разборами (для контактов),
+    competency_tokens - те же токены в нижнем регистре без знаков из PUNCTUATION_REGEX,
+    то есть ровно то, что даёт токенизация текста после Analyzer._preprocess_text.
+    """
+
+    def __init__(self, text, tokens):
+        self.text = text
+        self.tokens = tokens
+        self._competency_tokens = None
+
+    @property
+    def competency_tokens(self):
+        if self._competency_tokens is None:
+            self._competency_tokens = [
+                self._lowercase(token)
+                for token in self.tokens
+                if not PUNCTUATION_REGEX.fullmatch(token.value)
+            ]
+        return self._competency_tokens
+
+    def chunks(self, size):
+        """
+        Токены кусками не короче size символов, каждый кусок заканчивается переводом строки.
+        Правила контактов не захватывают перевод строки, поэтому совпадения в кусках и их порядок
+        те же, что и во всём тексте. При size <= 0 возвращается весь текст одним куском.
+        """
+        start = 0
+        chunk_offset = 0
+        for index, token in enumerate(self.tokens):
+            if size > 0 and token.type == EOL and token.span.stop - chunk_offset >= size:
+                yield self.tokens[start:index + 1]
+                start = index + 1
+                chunk_offset = token.span.stop
+        if start < len(self.tokens):
+            yield self.tokens[start:]
+
+    @staticmethod
+    def _lowercase(token):
+        lowercase = Token(token.value.lower(), token.span, token.type)
+        if token.type == RUSSIAN:
+            return lowercase.morphed(token.forms)
+        return lowercase
+
+
+class TokenStream:
+    """
+    Компактная запись competency_tokens документа для хранения: словарь различных токенов
+    (значение, тип, нормальные формы), номера токенов текста в этом словаре и смещения начала
+    каждого токена от предыдущего. Поиск компетенций по ней не требует токенизации и pymorphy.
+    """
+
+    def __init__(self, vocabulary, indices, offsets):
+        self.vocabulary = vocabulary
+        self.indices = indices
+        self.offsets = offsets
+
+    @classmethod
+    def from_tokens(cls, tokens):
+        positions = {}
+        vocabulary = []
+        indices = []
+        offsets = []
+        previous_start = 0
+        for token in tokens:
+            key = (token.value, token.type)
+            index = positions.get(key)
+            if index is None:
+                index = positions[key] = len(vocabulary)
+                normalized_forms = []
+                if token.type == RUSSIAN:
+                    normalized_forms = list(dict.fromkeys(form.normalized for form in token.forms))
+                vocabulary.append((token.value, token.type, normalized_forms))
+            indices.append(index)
+            offsets.append(token.span.start - previous_start)
+            previous_start = token.span.start
+        return cls(vocabulary, indices, offsets)
+
+    def dumps(self):
+        payload = [self.vocabulary, self.indices, self.offsets]
+        return zlib.compress(json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+    @classmethod
+    def loads(cls, data):
+        vocabulary, indices, offsets = json.loads(zlib.decompress(data))
+        return cls([tuple(entry) for entry in vocabulary], indices, offsets)
+
+    def spans(self):
+        """Позиции токенов в тексте, из которого построен поток."""
+        start = 0
+        for index, offset in zip(self.indices, self.offsets):
+            start += offset
+            yield start, start + len(self.vocabulary[index][0])
+
+
+def resolve_spans(spans):
+    """
+    Выбор непересекающихся отрезков с максимальным покрытием, как yargy.span.resolve_spans.
+    spans отсортированы по началу, при равном начале - от длинных к коротким.
+    Возвращает индексы выбранных отрезков по порядку.
+    """
+    size = len(spans)
+    starts = [start for start, _ in spans]
+    nexts = [bisect_left(starts, stop) for _, stop in spans]
+    covers = [0] * (size + 1)
+    taken = [False] * size
+
+    for index in reversed(range(size)):
+        start, stop = spans[index]
+        cover = stop - start
+        if nexts[index] < size:
+            cover += covers[nexts[index]]
+        # При равном покрытии, как и в yargy, отрезок берётся
+        if cover >= covers[index + 1]:
+            covers[index] = cover
+            taken[index] = True
+        else:
+            covers[index] = covers[index + 1]
+
+    index = 0
+    while index < size:
+        if taken[index]:
+            yield index
+            index = nexts[index]
+        else:
+            index += 1
+
+
+class CompetencyScanner:
+    """
+    Поиск компетенций без Earley-парсера yargy с теми же результатами, что Analyzer.analyze.
+    Каждое правило грамматики сопоставляет ровно один токен: dictionary проверяет нормальную форму
+    одного слова, в том числе для каждого слова из LEVEL_PHRASES. Поэтому ключевые слова и уровни
+    компилируются в одну таблицу "нормальная форма -> метки", а сочетания уровня и компетенции
+    ищутся среди соседних токенов в порядке альтернатив грамматики.
+    """
+
+    COMPETENCY = 1
+    LEVELS = {1: 2, 2: 4, 3: 8}
+
+    def __init__(self, keyword_lemmas, level_lemmas, comp_dict):
+        self.comp_dict = comp_dict
+        self.labels = {}
+        for lemma in keyword_lemmas:
+            self.labels[lemma] = self.labels.get(lemma, 0) | self.COMPETENCY
+        for level, lemmas in level_lemmas.items():
+            for lemma in lemmas:
+                self.labels[lemma] = self.labels.get(lemma, 0) | self.LEVELS[level]
+
+    def _token_labels(self, token):
+        if token.type != RUSSIAN:
+            return self.labels.get(token.value.lower(), 0)
+
+        labels = 0
+        for form in token.forms:
+            labels |= self.labels.get(form.normalized, 0)
+        return labels
+
+    def _entry_labels(self, value, token_type, normalized_forms):
+        # То же, что _token_labels, для записи словаря TokenStream
+        if token_type != RUSSIAN:
+            return self.labels.get(value.lower(), 0)
+
+        labels = 0
+        for normalized in normalized_forms:
+            labels |= self.labels.get(normalized, 0)
+        return labels
+
+    def _match_pair(self, left, right, left_value, right_value):
+        # Порядок проверок повторяет порядок альтернатив main_rule в Analyzer._initialize_parser
+        if right & self.COMPETENCY:
+            for level, label in self.LEVELS.items():
+                if left & label:
+                    return right_value, level
+        if left & self.COMPETENCY:
+            for level, label in self.LEVELS.items():
+                if right & label:
+                    return left_value, level
+        return None
+
+    def findall(self, tokens):
+        """Возвращает пары (ключевое слово, уровень или None) для выбранных совпадений по порядку текста."""
+        values = [token.value for token in tokens]
+        labels = [self._token_labels(token) for token in tokens]
+        return self._find(values, labels)
+
+    def findall_stream(self, stream):
+        """findall по TokenStream: метки вычисляются один раз для каждого различного токена."""
+        entry_labels = [self._entry_labels(*entry) for entry in stream.vocabulary]
+        values = [stream.vocabulary[index][0] for index in stream.indices]
+        labels = [entry_labels[index] for index in stream.indices]
+        return self._find(values, labels)
+
+    def _find(self, values, labels):
+        spans = []
+        facts = []
+        for index, label in enumerate(labels):
+            if index + 1 < len(labels):
+                pair = self._match_pair(label, labels[index + 1], values[index], values[index + 1])
+                if pair:
+                    spans.append((index, index + 2))
+                    facts.append(pair)
+            if label & self.COMPETENCY:
+                spans.append((index, index + 1))
+                facts.append((values[index], None))
+
+        return [facts[index] for index in resolve_spans(spans)]
 
 
 class Analyzer:
     def __init__(self):
-        self.tokenizer = MorphTokenizer()
+        self.tokenizer = DocumentTokenizer(morph=get_morph_cache())
         self.LEVEL_TERMS = {
             1: [
                 "базовый", "начальный", "изучал", "знаком", "основы",
@@ -98,19 +464,19 @@ class Analyzer:
 
         self.CompetencyMatch = fact("CompetencyMatch", ["name", "level"])
         self.parser = None
+        self.level_lemmas = self._normalize_level_terms()
+        self.header_window = settings.CONTACT_HEADER_WINDOW
+        self.pdf_backend = PDF_BACKENDS[settings.PDF_BACKEND]
+
+        self._initialize_contact_parsers()
 
     def _preprocess_text(self, text):
         text = text.lower()
-        text = re.sub(r'[\/()\-—.,;:«»]', ' ', text)
+        text = PUNCTUATION_REGEX.sub(' ', text)
         return text
 
     def _initialize_parser(self, competencies):
-        # Создаем словарь для поиска компетенций по ключевым словам
-        comp_dict = {}
-        for comp in competencies:
-            keywords = re.findall(r"[^\s]{2,}", comp["name"].lower())
-            for kw in keywords:
-                comp_dict.setdefault(kw, []).append((comp["name"], comp["level"]))
+        comp_dict = self._build_comp_dict(competencies)
 
         # Правило для поиска компетенций
         competency_rule = rule(
@@ -143,20 +509,93 @@ class Analyzer:
         self.parser = Parser(main_rule, tokenizer=self.tokenizer)
         return comp_dict
 
-    def analyze(self, text, competencies_data):
+    def _normalize(self, words):
+        # Та же нормализация, что у yargy.predicates.dictionary
+        normalized = set()
+        for word in words:
+            normalized.update(self.tokenizer.morph.normalized(word))
+        return normalized
+
+    def _normalize_level_terms(self):
+        return {
+            level: self._normalize(
+                self.LEVEL_TERMS[level]
+                + [word for phrase in self.LEVEL_PHRASES[level] for word in phrase.split()]
+            )
+            for level in self.LEVEL_TERMS
+        }
+
+    def _build_comp_dict(self, competencies):
+        # Создаем словарь для поиска компетенций по ключевым словам
+        comp_dict = {}
+        for comp in competencies:
+            keywords = re.findall(r"[^\s]{2,}", comp["name"].lower())
+            for kw in keywords:
+                comp_dict.setdefault(kw, []).append((comp["name"], comp["level"]))
+        return comp_dict
+
+    def _get_scanner(self, competencies, profession_id=None):
+        key = competency_parser_cache.make_key(profession_id, competencies) + ("scanner",)
+        scanner = competency_parser_cache.get(key)
+        if scanner is None:
+            comp_dict = self._build_comp_dict(competencies)
+            scanner = CompetencyScanner(self._normalize(comp_dict.keys()), self.level_lemmas, comp_dict)
+            competency_parser_cache.put(key, scanner)
+        return scanner
+
+    def _get_parser(self, competencies, profession_id=None):
+        # Грамматика зависит только от списка компетенций, поэтому собираем её один раз на профессию
+        key = competency_parser_cache.make_key(profession_id, competencies)
+        entry = competency_parser_cache.get(key)
+        if entry is None:
+            comp_dict = self._initialize_parser(competencies)
+            entry = (self.parser, comp_dict)
+            competency_parser_cache.put(key, entry)
+        return entry
+
+    def tokenize(self, text):
+        """Разбивает текст на токены один раз для extract_contact_info, analyze и scan."""
+        return ResumeDocument(text, list(self.tokenizer(text)))
+
+    def analyze(self, text, competencies_data, profession_id=None, document=None):
+        competencies = competencies_data.get("competencies", [])
+        parser, comp_dict = self._get_parser(competencies, profession_id)
+
+        if document is not None:
+            matches = parser.findall(document.competency_tokens)
+        else:
+            matches = parser.findall(self._preprocess_text(text))
+
+        return self._format_results(
+            ((match.fact.name, match.fact.level) for match in matches),
+            comp_dict,
+        )
+
+    def scan(self, text, competencies_data, profession_id=None, document=None):
+        """Быстрый аналог analyze на CompetencyScanner, результаты совпадают."""
         competencies = competencies_data.get("competencies", [])
-        comp_dict = self._initialize_parser(competencies)
+        scanner = self._get_scanner(competencies, profession_id)
 
-        processed_text = self._preprocess_text(text)
-        matches = self.parser.findall(processed_text)
+        if document is not None:
+            tokens = document.competency_tokens
+        else:
+            tokens = list(self.tokenizer(self._preprocess_text(text)))
 
+        return self._format_results(scanner.findall(tokens), scanner.comp_dict)
+
+    def scan_stream(self, stream, competencies_data, profession_id=None):
+        """scan по сохранённому TokenStream документа, результаты те же, что у scan по его тексту."""
+        scanner = self._get_scanner(competencies_data.get("competencies", []), profession_id)
+        return self._format_results(scanner.findall_stream(stream), scanner.comp_dict)
+
+    def _format_results(self, matches, comp_dict):
         # Собираем результаты
         results = {}
-        for match in matches:
-            if match.fact.name:
+        for name, level in matches:
+            if name:
                 # Находим все полные названия компетенций, содержащие найденное ключевое слово
-                for comp_name, comp_level in comp_dict.get(match.fact.name, []):
-                    final_level = match.fact.level if match.fact.level else 1
+                for comp_name, comp_level in comp_dict.get(name, []):
+                    final_level = level if level else 1
                     if comp_name not in results or final_level > results[comp_name]:
                         results[comp_name] = final_level
 
@@ -170,26 +609,10 @@ class Analyzer:
 
         return formatted_results
 
-    def extract_contact_info(self, text):
-        """
-        Извлекает контактную информацию из текста резюме.
-        Возвращает словарь с ключами: first_name, last_name, birth_date, city, phone, email.
-        Если какой-то параметр не найден, сохраняет None.
-        """
-        # Инициализация правил для извлечения информации
-
+    def _initialize_contact_parsers(self):
         # Имя и фамилия
         Name = fact('Name', ['first_name', 'last_name'])
 
-        def is_surname(token):
-            if not isinstance(token, Token):
-                value = token
-            else:
-                value = token.value
-
-            pattern = r'^[А-ЯЁ][а-яё]*(?:-[А-ЯЁ][а-яё]*)?(?:ов|ев|ин|ын|ский|ской|цкий|цкой|ая|ий|ой|ый|ич|ица|ук|юк|ак|як|ец|ик|ка|ко|ла|ло|ра|ро|та|то|ха|хо|ча|чо|ша|шо)$'
-            return bool(re.fullmatch(pattern, value, re.IGNORECASE))
-
         first_name_rule = gram('Name').interpretation(Name.first_name)
 
         last_name_rule = or_(
@@ -207,7 +630,7 @@ class Analyzer:
                 first_name_rule
             )
         ).interpretation(Name)
-        name_parser = Parser(name_rule, tokenizer=self.tokenizer)
+        self.name_parser = Parser(name_rule, tokenizer=self.tokenizer)
 
         # Дата рождения
         Date = fact('Date', ['birth_date'])
@@ -219,16 +642,24 @@ class Analyzer:
                 rule(INT, eq('/'), INT, eq('/'), INT)  # DD/MM/YYYY
             ).interpretation(Date.birth_date)
         ).interpretation(Date)
-        date_parser = Parser(date_rule)
+        self.date_parser = Parser(date_rule, tokenizer=self.tokenizer)
 
         # Город
         City = fact('City', ['city'])
         city_rule = rule(
             gram('Geox').interpretation(City.city)
         ).interpretation(City)
-        city_parser = Parser(city_rule, tokenizer=self.tokenizer)
+        self.city_parser = Parser(city_rule, tokenizer=self.tokenizer)
+
+    def extract_contact_info(self, text, document=None):
+        """
+        Извлекает контактную информацию из текста резюме.
+        Возвращает словарь с ключами: first_name, last_name, birth_date, city, phone, email.
+        Если какой-то параметр не найден, сохраняет None.
+        """
+        if document is None:
+            document = self.tokenize(text)
 
-        # Извлечение информации
         contact_info = {
             'first_name': None,
             'last_name': None,
@@ -238,93 +669,138 @@ class Analyzer:
             'email': None
         }
 
+        # Сначала просматривается заголовок резюме, остальной текст - только если поле не найдено
+        chunks = list(document.chunks(self.header_window))
+
         # Имя и фамилия
-        for match in name_parser.findall(text):
-            if match.fact.first_name and match.fact.last_name:
-                contact_info['first_name'] = match.fact.first_name.capitalize()
-                contact_info['last_name'] = match.fact.last_name.capitalize()
-                break
+        name = self._find_first(self.name_parser, chunks, self._match_name)
+        if name:
+            contact_info['first_name'], contact_info['last_name'] = name
 
         # Дата рождения
-        for match in date_parser.findall(text):
-            if match.fact.birth_date:
-                try:
-                    date_str = ''.join([t.value for t in match.tokens])
-                    for fmt in ('%d.%m.%Y', '%d-%m-%Y', '%d/%m/%Y', '%d.%m.%y', '%d-%m-%y', '%d/%m/%y'):
-                        try:
-                            dt = datetime.strptime(date_str, fmt)
-                            contact_info['birth_date'] = dt.strftime('%d.%m.%Y')
-                            break
-                        except ValueError:
-                            continue
-                except:
-                    continue
+        contact_info['birth_date'] = self._find_first(self.date_parser, chunks, self._match_date)
 
         # Город
-        for match in city_parser.findall(text):
-            if match.fact.city:
-                contact_info['city'] = match.fact.city.capitalize()
-                break
+        contact_info['city'] = self._find_first(self.city_parser, chunks, self._match_city)
 
         # Телефон
-        phone_regex = re.compile(r'(\+7|8)[\s\-]?\(?\d{3}\)?[\s\-]?\d{3}[\s\-]?\d{2}[\s\-]?\d{2}')
-        phone_match = phone_regex.search(text)
+        phone_match = PHONE_REGEX.search(text)
         if phone_match:
             phone = phone_match.group(0)
-            phone = re.sub(r'[^\d]', '', phone)
+            phone = NON_DIGIT_REGEX.sub('', phone)
             if phone.startswith('8'):
                 phone = '+7' + phone[1:]
             contact_info['phone'] = phone
 
         # Email
-        email_regex = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
-        email_match = email_regex.search(text)
+        email_match = EMAIL_REGEX.search(text)
         if email_match:
             contact_info['email'] = email_match.group(0).lower()
 
         return contact_info
 
-    async def parse_pdf(self, file: UploadFile) -> str:
-        """Парсер PDF файлов с использованием pdfminer"""
+    @staticmethod
+    def _find_first(parser, chunks, extract):
+        # Поиск останавливается на первом подходящем совпадении, следующие куски не разбираются
+        for chunk in chunks:
+            for match in parser.findall(chunk):
+                value = extract(match)
+                if value is not None:
+                    return value
+        return None
+
+    @staticmethod
+    def _match_name(match):
+        if match.fact.first_name and match.fact.last_name:
+            return match.fact.first_name.capitalize(), match.fact.last_name.capitalize()
+        return None
+
+    @staticmethod
+    def _match_date(match):
+        if not match.fact.birth_date:
+            return None
+
+        date_str = ''.join([t.value for t in match.tokens])
+        for fmt in ('%d.%m.%Y', '%d-%m-%Y', '%d/%m/%Y', '%d.%m.%y', '%d-%m-%y', '%d/%m/%y'):
+            try:
+                return datetime.strptime(date_str, fmt).strftime('%d.%m.%Y')
+            except ValueError:
+                continue
+        return None
+
+    @staticmethod
+    def _match_city(match):
+        if match.fact.city:
+            return match.fact.city.capitalize()
+        return None
+
+    def extract_pdf_text(self, path: str, page_numbers: list[int] | None = None) -> str:
+        """Парсер PDF файлов с использованием pdfminer, способ извлечения задаётся PDF_BACKEND"""
+        return self.pdf_backend.extract_text(path, page_numbers=page_numbers, maxpages=settings.PDF_MAX_PAGES)
+
+    def extract_pdf_pages(self, filename: str, path: str, page_numbers: list[int]) -> str:
+        """Текст части страниц PDF для постраничного извлечения в нескольких процессах."""
         try:
-            # Читаем содержимое файла в bytes
-            contents = await file.read()
-            # Используем io.BytesIO для работы с pdfminer
-            with io.BytesIO(contents) as pdf_file:
-                text = pdf_extract_text(pdf_file)
-            return text
+            return self.extract_pdf_text(path, page_numbers=page_numbers)
         except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Failed to parse PDF file: {str(e)}"
-            )
+            raise FileParsingError(filename=filename, reason=str(e))
 
-    async def parse_docx(self, file: UploadFile) -> str:
-        """Парсер DOCX файлов с использованием python-docx"""
+    def count_pdf_pages(self, filename: str, path: str) -> int:
+        """Число извлекаемых страниц PDF с учётом PDF_MAX_PAGES, об отброшенных страницах пишется в лог."""
         try:
-            contents = await file.read()
-            with io.BytesIO(contents) as docx_file:
-                doc = Document(docx_file)
-                text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-            return text
+            page_count = count_pdf_pages(path)
         except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Failed to parse DOCX file: {str(e)}"
+            raise FileParsingError(filename=filename, reason=str(e))
+        if 0 < settings.PDF_MAX_PAGES < page_count:
+            logger.warning(
+                "PDF %s truncated to the first %s of %s pages (PDF_MAX_PAGES)",
+                filename, settings.PDF_MAX_PAGES, page_count,
             )
+            page_count = settings.PDF_MAX_PAGES
+        return page_count
+
+    def extract_docx_text(self, path: str) -> str:
+        """Парсер DOCX файлов с использованием python-docx"""
+        doc = Document(path)
+        return "\n".join([paragraph.text for paragraph in doc.paragraphs])
 
-    async def parse_file(self, file: UploadFile) -> str:
-        """Универсальный парсер файлов разных форматов"""
-        filename = file.filename.lower()
+    def extract_plain_text(self, path: str) -> str:
+        """Парсер текстовых файлов: UTF-8 или cp1251, файл декодируется по частям"""
+        return read_text_file(path)
 
-        if filename.endswith('.pdf'):
-            return await self.parse_pdf(file)
-        elif filename.endswith(('.doc', '.docx')):
-            return await self.parse_docx(file)
-        elif filename.endswith(('.txt', '.text')):
-            return await file.read().decode('utf-8')
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Unsupported file format: {file.filename}"
-            )
+    def extract_doc_text(self, path: str) -> str:
+        """Парсер документов Word 97-2003 (DOC)"""
+        return extract_doc_text(path)
+
+    def extract_rtf_text(self, path: str) -> str:
+        """Парсер RTF файлов"""
+        return extract_rtf_text(path)
+
+    def extract_text(self, filename: str, path: str) -> str:
+        """
+        Универсальный парсер файлов разных форматов.
+        Формат определяется по сигнатуре содержимого, а не по расширению имени файла.
+        Файл читается с диска, поэтому в памяти одновременно находится только извлечённый текст.
+        """
+        try:
+            file_format = detect_format(path)
+        except OSError as e:
+            raise FileParsingError(filename=filename, reason=str(e))
+
+        extractors = {
+            FileFormat.PDF: self.extract_pdf_text,
+            FileFormat.DOCX: self.extract_docx_text,
+            FileFormat.DOC: self.extract_doc_text,
+            FileFormat.RTF: self.extract_rtf_text,
+            FileFormat.TEXT: self.extract_plain_text,
+        }
+        if file_format is None:
+            raise FileParsingError(filename=filename, reason="неподдерживаемый формат файла")
+        if file_format == FileFormat.PDF and settings.PDF_MAX_PAGES > 0:
+            self.count_pdf_pages(filename, path)
+        extractor = extractors[file_format]
+
+        try:
+            return extractor(path)
+        except Exception as e:
+            raise FileParsingError(filename=filename, reason=str(e))
@@ -1,6 +1,15 @@
+import asyncio
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
 from fastapi.security import OAuth2PasswordBearer
 from passlib.context import CryptContext
 
+from project.core.config import settings
+from project.core.exceptions import PasswordHashQueueFull
+from project.schemas.user import UserSchema
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
@@ -11,3 +20,148 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
+
+
+class PasswordHasher:
+    """
+    Выполняет bcrypt в отдельном ограниченном пуле потоков, чтобы проверка паролей не блокировала event loop.
+    bcrypt отпускает GIL на время хеширования, поэтому остальные запросы обрабатываются параллельно.
+    Если запросов, ожидающих свободный поток, больше max_queue, новые отклоняются с PasswordHashQueueFull:
+    всплеск входов не должен накапливать очередь, ответа из которой клиент уже не дождётся.
+    """
+
+    def __init__(self, workers: int, max_queue: int) -> None:
+        self._workers = max(workers, 1)
+        self._max_queue = max_queue
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._hash_time = 0.0
+        self._max_hash_time = 0.0
+        self._wait_time = 0.0
+        self._max_wait_time = 0.0
+
+    def start(self) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="password-hash")
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def _submit(self, fn, *args):
+        if self._pending >= self._workers + self._max_queue:
+            self.rejected += 1
+            raise PasswordHashQueueFull()
+
+        self.start()
+        self._pending += 1
+        submitted = time.perf_counter()
+
+        def job():
+            started = time.perf_counter()
+            return fn(*args), started, time.perf_counter()
+
+        try:
+            result, started, finished = await asyncio.get_running_loop().run_in_executor(self._executor, job)
+        finally:
+            self._pending -= 1
+
+        self.completed += 1
+        self._wait_time += started - submitted
+        self._max_wait_time = max(self._max_wait_time, started - submitted)
+        self._hash_time += finished - started
+        self._max_hash_time = max(self._max_hash_time, finished - started)
+        return result
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit(verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(get_password_hash, password)
+
+    def stats(self) -> dict:
+        """Задержки в миллисекундах: wait - ожидание свободного потока, hash - само хеширование."""
+        return {
+            'workers': self._workers,
+            'max_queue': self._max_queue,
+            'pending': self._pending,
+            'completed': self.completed,
+            'rejected': self.rejected,
+            'avg_wait_ms': round(self._wait_time / self.completed * 1000, 3) if self.completed else 0.0,
+            'max_wait_ms': round(self._max_wait_time * 1000, 3),
+            'avg_hash_ms': round(self._hash_time / self.completed * 1000, 3) if self.completed else 0.0,
+            'max_hash_ms': round(self._max_hash_time * 1000, 3),
+        }
+
+
+class PrincipalCache:
+    """
+    Кэш пользователей, уже проверенных по токену, чтобы запросы с тем же токеном не обращались к базе.
+    Ключ - subject и срок действия токена, запись живёт не дольше ttl секунд и не дольше самого токена.
+    Размер ограничен, вытесняются давно не использованные записи.
+    Кэш свой у каждого процесса: invalidate сбрасывает записи только в текущем процессе,
+    в остальных изменения пользователя становятся видны не позже чем через ttl секунд.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple[str, int], tuple[UserSchema, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, subject: str, expires: int) -> UserSchema | None:
+        key = (subject, expires)
+        entry = self._entries.get(key)
+        if entry is not None:
+            user, valid_until = entry
+            if valid_until > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return user
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, subject: str, expires: int, user: UserSchema) -> None:
+        if not self.enabled:
+            return
+        # Срок токена задан в секундах эпохи, записи сравниваются по монотонным часам
+        lifetime = min(self.ttl, expires - time.time())
+        if lifetime <= 0:
+            return
+        self._entries[(subject, expires)] = (user, time.monotonic() + lifetime)
+        self._entries.move_to_end((subject, expires))
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        """Удаляет все записи пользователя, в том числе по токенам, выданным на его прежний email."""
+        for key in [key for key, (user, _) in self._entries.items() if user.id == user_id]:
+            del self._entries[key]
+
+    def stats(self) -> dict:
+        requests = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / requests, 4) if requests else 0.0,
+        }
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+principal_cache = PrincipalCache(maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl=settings.PRINCIPAL_CACHE_TTL_SEC)
+password_hasher = PasswordHasher(workers=settings.PASSWORD_HASH_WORKERS, max_queue=settings.PASSWORD_HASH_QUEUE_SIZE)
@@ -0,0 +1,221 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from project.core.config import settings
+from project.resource.analyze import Analyzer, ResumeDocument, TokenStream, get_morph_cache, compress_text, decompress_text
+from project.resource.formats import FileFormat, detect_format
+
+_worker_analyzer: Analyzer | None = None
+
+
+def _init_worker() -> None:
+    """Загружает MorphTokenizer и словари pymorphy один раз при старте процесса-обработчика."""
+    global _worker_analyzer
+    _worker_analyzer = Analyzer()
+
+
+def _get_worker_analyzer() -> Analyzer:
+    if _worker_analyzer is None:
+        _init_worker()
+    return _worker_analyzer
+
+
+def _warmup_job() -> None:
+    _get_worker_analyzer()
+
+
+def _morph_cache_stats_job() -> dict:
+    return {'pid': os.getpid(), **get_morph_cache().stats()}
+
+
+def _extract_text_job(filename: str, path: str) -> str:
+    return _get_worker_analyzer().extract_text(filename, path)
+
+
+def _count_pdf_pages_job(filename: str, path: str) -> int:
+    return _get_worker_analyzer().count_pdf_pages(filename, path)
+
+
+def _extract_pdf_pages_job(filename: str, path: str, page_numbers: list[int]) -> str:
+    return _get_worker_analyzer().extract_pdf_pages(filename, path, page_numbers)
+
+
+def _scan_document(document: ResumeDocument, professions: list[tuple[dict, int | None]]) -> list[dict]:
+    # Для каждой профессии свой сканер: выбор пересекающихся совпадений зависит от её словаря
+    analyzer = _get_worker_analyzer()
+    return [
+        analyzer.scan(document.text, competencies_data, profession_id, document=document)
+        for competencies_data, profession_id in professions
+    ]
+
+
+def _analyze_job(text: str, competencies_data: dict, profession_id: int | None) -> tuple[dict, dict]:
+    analyzer = _get_worker_analyzer()
+    # Текст разбивается на токены один раз, их используют и контакты, и компетенции
+    document = analyzer.tokenize(text)
+    contact_info = analyzer.extract_contact_info(text, document=document)
+    competencies = analyzer.scan(text, competencies_data, profession_id, document=document)
+    return contact_info, competencies
+
+
+def _scan_job(text: str, competencies_data: dict, profession_id: int | None) -> dict:
+    return _get_worker_analyzer().scan(text, competencies_data, profession_id)
+
+
+def _scan_stored_job(
+        compressed_text: bytes | None,
+        tokens: bytes | None,
+        professions: list[tuple[dict, int | None]],
+) -> list[dict]:
+    analyzer = _get_worker_analyzer()
+    if tokens is None:
+        return _scan_document(analyzer.tokenize(decompress_text(compressed_text)), professions)
+
+    stream = TokenStream.loads(tokens)
+    return [
+        analyzer.scan_stream(stream, competencies_data, profession_id)
+        for competencies_data, profession_id in professions
+    ]
+
+
+def _analyze_text_job(
+        text: str,
+        professions: list[tuple[dict, int | None]],
+) -> tuple[bytes, bytes | None, dict, list[dict]]:
+    analyzer = _get_worker_analyzer()
+    # Текст разбивается на токены один раз для контактов и всех профессий
+    document = analyzer.tokenize(text)
+    contact_info = analyzer.extract_contact_info(text, document=document)
+    competencies = _scan_document(document, professions)
+    # Текст и токены сжимаются в процессе-обработчике, в event loop передаются уже готовые байты
+    tokens = TokenStream.from_tokens(document.competency_tokens).dumps() if settings.STORE_RESUME_TOKENS else None
+    return compress_text(text), tokens, contact_info, competencies
+
+
+def _process_file_job(
+        filename: str,
+        path: str,
+        professions: list[tuple[dict, int | None]],
+) -> tuple[bytes, bytes | None, dict, list[dict]]:
+    text = _get_worker_analyzer().extract_text(filename, path)
+    return _analyze_text_job(text, professions)
+
+
+class AnalysisEngine:
+    """
+    Выполняет извлечение текста и анализ резюме в пуле процессов,
+    чтобы разбор файлов не блокировал event loop.
+    """
+
+    def __init__(self, max_workers: int | None = None) -> None:
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._executor: ProcessPoolExecutor | None = None
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def start(self) -> None:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+            # Процессы создаются лениво, поэтому сразу поднимаем все, чтобы словари загрузились при старте
+            for _ in range(self._max_workers):
+                self._executor.submit(_warmup_job)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def _submit(self, fn, *args):
+        self.start()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def extract_text(self, filename: str, path: str) -> str:
+        return await self._submit(_extract_text_job, filename, str(path))
+
+    async def analyze(
+            self,
+            text: str,
+            competencies_data: dict,
+            profession_id: int | None = None,
+    ) -> tuple[dict, dict]:
+        return await self._submit(_analyze_job, text, competencies_data, profession_id)
+
+    async def scan(
+            self,
+            text: str,
+            competencies_data: dict,
+            profession_id: int | None = None,
+    ) -> dict:
+        return await self._submit(_scan_job, text, competencies_data, profession_id)
+
+    async def scan_stored(
+            self,
+            compressed_text: bytes,
+            tokens: bytes | None,
+            professions: list[tuple[dict, int | None]],
+    ) -> list[dict]:
+        """
+        Поиск компетенций по сохранённому документу для нескольких профессий (компетенции, id профессии):
+        по потоку токенов, если он есть, иначе по тексту. Результаты в порядке professions.
+        """
+        # В процесс передаётся только то, что понадобится для поиска
+        if tokens is not None:
+            compressed_text = None
+        return await self._submit(_scan_stored_job, compressed_text, tokens, professions)
+
+    async def process_file(
+            self,
+            filename: str,
+            path: str,
+            professions: list[tuple[dict, int | None]],
+    ) -> tuple[bytes, bytes | None, dict, list[dict]]:
+        """
+        Извлекает текст файла и анализирует его для нескольких профессий (компетенции, id профессии).
+        Возвращает сжатый текст, сжатый поток токенов (None при STORE_RESUME_TOKENS = False),
+        контакты и компетенции в порядке professions.
+        """
+        if settings.PDF_PAGES_PER_TASK > 0 and detect_format(path) == FileFormat.PDF:
+            text = await self._extract_pdf_pages(filename, str(path))
+            if text is not None:
+                return await self._submit(_analyze_text_job, text, professions)
+        return await self._submit(_process_file_job, filename, str(path), professions)
+
+    async def _extract_pdf_pages(self, filename: str, path: str) -> str | None:
+        """
+        Извлекает многостраничный PDF частями по PDF_PAGES_PER_TASK страниц в разных процессах.
+        Для файлов не длиннее одной части возвращает None, их текст извлекается вместе с анализом.
+        """
+        page_count = await self._submit(_count_pdf_pages_job, filename, path)
+        pages_per_task = settings.PDF_PAGES_PER_TASK
+        if page_count <= pages_per_task:
+            return None
+
+        page_ranges = [
+            list(range(start, min(start + pages_per_task, page_count)))
+            for start in range(0, page_count, pages_per_task)
+        ]
+        parts = await asyncio.gather(*[
+            self._submit(_extract_pdf_pages_job, filename, path, page_numbers) for page_numbers in page_ranges
+        ])
+        return "".join(parts)
+
+    async def morph_cache_stats(self) -> list[dict]:
+        """
+        Счётчики кэша разборов по процессам-обработчикам.
+        Пул не позволяет адресовать конкретный процесс, поэтому отправляется по задаче на процесс
+        и в ответ попадают те, кто их выполнил.
+        """
+        stats = await asyncio.gather(*[self._submit(_morph_cache_stats_job) for _ in range(self._max_workers)])
+        return list({entry['pid']: entry for entry in stats}.values())
+
+
+analysis_engine = AnalysisEngine(max_workers=settings.ANALYSIS_WORKERS)
@@ -0,0 +1,336 @@
+import codecs
+import re
+import struct
+from enum import Enum
+
+from project.core.config import settings
+
+SNIFF_SIZE = 1024
+
+PDF_MAGIC = b"%PDF-"
+ZIP_MAGIC = b"PK\x03\x04"
+OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+RTF_MAGIC = b"{\\rtf"
+
+TEXT_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+# Доля печатаемых символов в начале файла, начиная с которой файл считается текстовым
+TEXT_MIN_PRINTABLE_RATIO = 0.95
+TEXT_WHITESPACE = frozenset("\t\n\r\f\v")
+
+
+class FileFormat(str, Enum):
+    PDF = "pdf"
+    DOCX = "docx"
+    DOC = "doc"
+    RTF = "rtf"
+    TEXT = "text"
+
+
+def detect_format(path: str) -> FileFormat | None:
+    """Формат файла по сигнатуре в начале файла, None - неизвестный двоичный формат."""
+    with open(path, "rb") as file:
+        head = file.read(SNIFF_SIZE)
+
+    # Спецификация PDF допускает произвольные байты перед заголовком
+    if PDF_MAGIC in head:
+        return FileFormat.PDF
+    if head.startswith(ZIP_MAGIC):
+        return FileFormat.DOCX
+    if head.startswith(OLE_MAGIC):
+        return FileFormat.DOC
+    if head.lstrip().startswith(RTF_MAGIC):
+        return FileFormat.RTF
+    if _looks_like_text(head):
+        return FileFormat.TEXT
+    return None
+
+
+def _looks_like_text(head: bytes) -> bool:
+    """
+    Начало файла декодируется без ошибок в кодировке по BOM, UTF-8 или cp1251 (как в read_text_file)
+    и почти целиком состоит из печатаемых символов - иначе это двоичные данные.
+    """
+    encoding = next((name for bom, name in TEXT_BOMS if head.startswith(bom)), None)
+    for candidate in (encoding,) if encoding is not None else ("utf-8", "cp1251"):
+        try:
+            # Без final=True обрезанный на границе SNIFF_SIZE многобайтовый символ не считается ошибкой
+            text = codecs.getincrementaldecoder(candidate)(errors="strict").decode(head)
+        except UnicodeDecodeError:
+            continue
+        printable = sum(1 for char in text if char.isprintable() or char in TEXT_WHITESPACE)
+        return not text or printable >= len(text) * TEXT_MIN_PRINTABLE_RATIO
+    return False
+
+
+def read_text_file(path: str) -> str:
+    """
+    Текстовый файл, декодируемый по частям: кодировка по BOM, иначе UTF-8,
+    а если файл не является корректным UTF-8 - cp1251.
+    """
+    with open(path, "rb") as file:
+        head = file.read(len(codecs.BOM_UTF8))
+    encoding = next((name for bom, name in TEXT_BOMS if head.startswith(bom)), None)
+
+    if encoding is not None:
+        return _decode_file(path, encoding, errors="replace")
+    try:
+        return _decode_file(path, "utf-8", errors="strict")
+    except UnicodeDecodeError:
+        return _decode_file(path, "cp1251", errors="replace")
+
+
+def _decode_file(path: str, encoding: str, errors: str) -> str:
+    decoder = codecs.getincrementaldecoder(encoding)(errors=errors)
+    parts = []
+    with open(path, "rb") as file:
+        while chunk := file.read(settings.UPLOAD_CHUNK_SIZE):
+            parts.append(decoder.decode(chunk))
+    parts.append(decoder.decode(b"", final=True))
+    return "".join(parts)
+
+
+RTF_TOKEN_REGEX = re.compile(r"\\([a-z]{1,32})(-?\d{1,10})? ?|\\'([0-9a-f]{2})|\\([^a-z])|([{}])|[\r\n]+|([^\\{}\r\n]+)", re.I)
+
+# Группы RTF, содержимое которых не является текстом документа
+RTF_SKIP_DESTINATIONS = {
+    "fonttbl", "colortbl", "stylesheet", "info", "pict", "object", "header", "footer",
+    "themedata", "colorschememapping", "latentstyles", "datastore", "xmlnstbl", "listtable",
+    "listoverridetable", "rsidtbl", "generator", "filetbl", "revtbl", "fldinst",
+}
+RTF_SPECIAL_CHARACTERS = {
+    "par": "\n", "line": "\n", "sect": "\n", "page": "\n", "row": "\n",
+    "tab": "\t", "cell": "\t", "emdash": "\u2014", "endash": "\u2013",
+    "lquote": "\u2018", "rquote": "\u2019", "ldblquote": "\u201c", "rdblquote": "\u201d", "bullet": "\u2022",
+}
+
+
+def extract_rtf_text(path: str) -> str:
+    """Текст RTF: управляющие слова отбрасываются, \\'xx декодируются по \\ansicpg, \\uN - по кодам Unicode."""
+    with open(path, "rb") as file:
+        data = file.read().decode("latin-1")
+
+    encoding = "cp1251"
+    stack = []
+    skip = False
+    unicode_skip = 1
+    pending_skip = 0
+    parts = []
+    encoded = bytearray()
+
+    def flush_encoded():
+        if encoded:
+            parts.append(encoded.decode(encoding, errors="replace"))
+            encoded.clear()
+
+    for match in RTF_TOKEN_REGEX.finditer(data):
+        word, argument, hex_code, symbol, brace, text = match.groups()
+
+        if hex_code is not None:
+            if pending_skip:
+                pending_skip -= 1
+            elif not skip:
+                encoded.append(int(hex_code, 16))
+            continue
+        flush_encoded()
+
+        if brace == "{":
+            stack.append((skip, unicode_skip))
+        elif brace == "}":
+            if stack:
+                skip, unicode_skip = stack.pop()
+        elif word is not None:
+            pending_skip = 0
+            if word == "ansicpg" and argument:
+                encoding = f"cp{argument}"
+            elif word == "uc" and argument:
+                unicode_skip = int(argument)
+            elif word in RTF_SKIP_DESTINATIONS:
+                skip = True
+            elif skip:
+                continue
+            elif word == "u" and argument:
+                parts.append(chr(int(argument) % 0x10000))
+                # За \\uN следуют unicode_skip символов замены для старых читателей
+                pending_skip = unicode_skip
+            elif word in RTF_SPECIAL_CHARACTERS:
+                parts.append(RTF_SPECIAL_CHARACTERS[word])
+        elif symbol is not None:
+            if symbol == "*":
+                skip = True
+            elif not skip and symbol in "\\{}":
+                parts.append(symbol)
+            elif not skip and symbol == "~":
+                parts.append("\u00a0")
+        elif text is not None and not skip:
+            if pending_skip:
+                skipped = min(pending_skip, len(text))
+                text = text[skipped:]
+                pending_skip -= skipped
+            parts.append(text)
+
+    flush_encoded()
+    return "".join(parts)
+
+
+class CompoundFile:
+    """
+    Чтение потоков из составного файла OLE2 (Compound File Binary), в котором хранятся документы Word 97-2003.
+    Секторы читаются с диска по мере надобности.
+    """
+
+    END_OF_CHAIN = 0xFFFFFFFE
+    MAX_REGULAR_SECTOR = 0xFFFFFFFA
+
+    def __init__(self, file) -> None:
+        self._file = file
+        header = self._read_at(0, 512)
+        if header[:8] != OLE_MAGIC:
+            raise ValueError("файл не является составным документом OLE2")
+
+        sector_shift, mini_sector_shift = struct.unpack_from("<HH", header, 0x1E)
+        # Версии 3 и 4 формата допускают только секторы по 512 и 4096 байт и мини-секторы по 64 байта
+        if sector_shift not in (9, 12) or mini_sector_shift != 6:
+            raise ValueError("недопустимый размер сектора составного документа")
+        self._sector_size = 1 << sector_shift
+        self._mini_sector_size = 1 << mini_sector_shift
+        (fat_sectors, directory_start, _, self._mini_cutoff, mini_fat_start, mini_fat_sectors,
+         difat_start, difat_sectors) = struct.unpack_from("<IIIIIIII", header, 0x2C)
+
+        difat = list(struct.unpack_from("<109I", header, 0x4C))
+        sector = difat_start
+        # Секторов DIFAT не может быть больше, чем секторов в файле
+        file_sectors = self._file.seek(0, 2) // self._sector_size
+        if difat_sectors > file_sectors:
+            raise ValueError("цепочка секторов DIFAT повреждена")
+        for _ in range(difat_sectors):
+            entries = self._read_sector_entries(sector)
+            difat.extend(entries[:-1])
+            sector = entries[-1]
+
+        self._fat = []
+        for sector in difat[:fat_sectors]:
+            self._fat.extend(self._read_sector_entries(sector))
+
+        self._entries = {}
+        directory = self._read_chain(directory_start)
+        root = None
+        for offset in range(0, len(directory), 128):
+            entry = directory[offset:offset + 128]
+            name_size, entry_type = struct.unpack_from("<HB", entry, 0x40)
+            start, size = struct.unpack_from("<II", entry, 0x74)
+            name = entry[:max(name_size - 2, 0)].decode("utf-16-le", errors="replace")
+            if entry_type == 5:
+                root = (start, size)
+            elif entry_type == 2:
+                self._entries.setdefault(name, (start, size))
+
+        self._mini_fat = []
+        if mini_fat_sectors:
+            mini_fat = self._read_chain(mini_fat_start)
+            self._mini_fat = list(struct.unpack(f"<{len(mini_fat) // 4}I", mini_fat))
+        self._mini_stream = self._read_chain(root[0])[:root[1]] if root and self._mini_fat else b""
+
+    def _read_at(self, offset: int, size: int) -> bytes:
+        self._file.seek(offset)
+        return self._file.read(size)
+
+    def _read_sector(self, sector: int) -> bytes:
+        if sector > self.MAX_REGULAR_SECTOR:
+            raise ValueError("ссылка на несуществующий сектор")
+        data = self._read_at((sector + 1) * self._sector_size, self._sector_size)
+        if len(data) != self._sector_size:
+            raise ValueError("файл обрезан")
+        return data
+
+    def _read_sector_entries(self, sector: int) -> tuple[int, ...]:
+        return struct.unpack(f"<{self._sector_size // 4}I", self._read_sector(sector))
+
+    def _read_chain(self, sector: int) -> bytes:
+        return b"".join(self._iter_chain(sector, self._fat, self._read_sector))
+
+    def _read_mini_chain(self, sector: int) -> bytes:
+        def read_mini_sector(sector: int) -> bytes:
+            offset = sector * self._mini_sector_size
+            data = self._mini_stream[offset:offset + self._mini_sector_size]
+            if len(data) != self._mini_sector_size:
+                raise ValueError("мини-сектор за пределами мини-потока")
+            return data
+
+        return b"".join(self._iter_chain(sector, self._mini_fat, read_mini_sector))
+
+    def _iter_chain(self, sector: int, fat: list[int], read_sector):
+        # Цепочка длиннее таблицы размещения зациклена - такой файл повреждён
+        for _ in range(len(fat) + 1):
+            if sector == self.END_OF_CHAIN:
+                return
+            if sector >= len(fat):
+                raise ValueError("цепочка секторов повреждена")
+            yield read_sector(sector)
+            sector = fat[sector]
+        raise ValueError("цепочка секторов зациклена")
+
+    def read_stream(self, name: str) -> bytes:
+        if name not in self._entries:
+            raise ValueError(f"в документе нет потока {name}")
+        start, size = self._entries[name]
+        if size < self._mini_cutoff:
+            return self._read_mini_chain(start)[:size]
+        return self._read_chain(start)[:size]
+
+
+# Поля Word: между \x13 и \x14 - код поля, между \x14 и \x15 - его значение
+WORD_FIELD_CODE_REGEX = re.compile(r"\x13[^\x13\x14\x15]*(?:\x14|\x15)")
+WORD_TRANSLATION = str.maketrans({"\r": "\n", "\x0b": "\n", "\x07": "\t", "\x0c": "\n", "\x15": None})
+
+
+def extract_doc_text(path: str) -> str:
+    """Текст документа Word 97-2003 по таблице фрагментов (piece table) из потока таблиц."""
+    with open(path, "rb") as file:
+        compound_file = CompoundFile(file)
+        word_document = compound_file.read_stream("WordDocument")
+
+        identifier, _, _, _, flags = struct.unpack_from("<HHHHH", word_document, 0)
+        if identifier != 0xA5EC:
+            raise ValueError("поток WordDocument повреждён")
+        if flags & 0x0100:
+            raise ValueError("документ зашифрован")
+
+        table = compound_file.read_stream("1Table" if flags & 0x0200 else "0Table")
+
+    fc_clx, lcb_clx = struct.unpack_from("<II", word_document, 0x01A2)
+    clx = table[fc_clx:fc_clx + lcb_clx]
+
+    # Clx: записи Prc (0x01) с изменениями свойств, затем Pcdt (0x02) с таблицей фрагментов
+    offset = 0
+    while offset < len(clx) and clx[offset] == 0x01:
+        (grpprl_size,) = struct.unpack_from("<H", clx, offset + 1)
+        offset += 3 + grpprl_size
+    if offset >= len(clx) or clx[offset] != 0x02:
+        raise ValueError("в документе нет таблицы фрагментов")
+    (plc_size,) = struct.unpack_from("<I", clx, offset + 1)
+    plc = clx[offset + 5:offset + 5 + plc_size]
+
+    pieces = (plc_size - 4) // 12
+    if pieces < 1:
+        raise ValueError("таблица фрагментов пуста")
+    positions = struct.unpack_from(f"<{pieces + 1}I", plc, 0)
+    parts = []
+    for index in range(pieces):
+        (fc,) = struct.unpack_from("<I", plc, (pieces + 1) * 4 + index * 8 + 2)
+        length = positions[index + 1] - positions[index]
+        # Фрагмент в однобайтовой кодировке помечен битом 0x40000000, его смещение удвоено
+        if fc & 0x40000000:
+            start, char_size, encoding = (fc & ~0x40000000) // 2, 1, "cp1252"
+        else:
+            start, char_size, encoding = fc, 2, "utf-16-le"
+        end = start + length * char_size
+        if length < 0 or end > len(word_document):
+            raise ValueError("фрагмент текста за пределами потока WordDocument")
+        parts.append(word_document[start:end].decode(encoding, errors="replace"))
+
+    return WORD_FIELD_CODE_REGEX.sub("", "".join(parts)).translate(WORD_TRANSLATION)
@@ -0,0 +1,313 @@
+import asyncio
+import logging
+import shutil
+from pathlib import Path
+
+from fastapi import UploadFile
+
+from project.core.config import settings
+from project.core.exceptions import (
+    AnalysisJobNotFound,
+    AnalysisQueueFull,
+    DatabaseError,
+    FileParsingError,
+    ProfessionNotFound,
+    ResumeNotFound,
+)
+from project.infrastructure.postgres.database import database
+from project.infrastructure.postgres.repository.file_cache_repo import FileCacheRepository
+from project.infrastructure.postgres.repository.job_repo import AnalysisJobRepository
+from project.infrastructure.postgres.repository.profession_repo import ProfessionRepository
+from project.infrastructure.postgres.repository.resume_repo import ResumeRepository
+from project.resource.analyze import competencies_hash
+from project.resource.engine import analysis_engine
+from project.resource.uploads import spool_upload
+from project.schemas.job import AnalysisJobSchema, AnalysisJobStatus
+from project.schemas.profession import ProfessionSchema
+from project.schemas.resume import FileUploadSchema
+
+logger = logging.getLogger(__name__)
+
+file_cache_repo = FileCacheRepository()
+job_repo = AnalysisJobRepository()
+profession_repo = ProfessionRepository()
+resume_repo = ResumeRepository()
+
+# Исключения проекта наследуют BaseException, поэтому перечисляются отдельно:
+# ошибка задачи не должна останавливать обработчик очереди
+JOB_ERRORS = (Exception, AnalysisJobNotFound, ProfessionNotFound, ResumeNotFound, FileParsingError, DatabaseError)
+
+
+class AnalysisJobQueue:
+    """
+    Ограниченная очередь фоновых задач анализа резюме.
+    Файлы задачи хранятся на диске до обработки, прогресс - в таблице analysis_jobs,
+    поэтому незавершённые задачи продолжаются после перезапуска.
+    Задачи повторного анализа (previous_competencies заполнено) обрабатывают уже сохранённые резюме профессии;
+    если очередь заполнена, такая задача остаётся в статусе pending и берётся, когда освободится место.
+    """
+
+    def __init__(self, maxsize: int, workers: int, spool_dir: Path) -> None:
+        self._queue: asyncio.Queue[int] = asyncio.Queue(maxsize=maxsize)
+        self._workers = workers
+        self._spool_dir = spool_dir
+        self._tasks: list[asyncio.Task] = []
+        self._queued: set[int] = set()
+
+    def _job_dir(self, job_id: int) -> Path:
+        return self._spool_dir / str(job_id)
+
+    def _enqueue(self, job_id: int) -> bool:
+        if self._queue.full():
+            return False
+        self._queue.put_nowait(job_id)
+        self._queued.add(job_id)
+        return True
+
+    async def _enqueue_pending(self) -> None:
+        """Ставит в очередь задачи повторного анализа, которые не поместились в неё при создании."""
+        if self._queue.full():
+            return
+
+        async with database.session() as session:
+            unfinished_jobs = await job_repo.get_unfinished_jobs(session=session)
+
+        for job in unfinished_jobs:
+            # Задачи с файлами в статусе pending без очереди могут ещё сохранять загрузку, их не трогаем
+            if job.previous_competencies is None or job.status != AnalysisJobStatus.PENDING or job.id in self._queued:
+                continue
+            if not self._enqueue(job.id):
+                return
+
+    async def start(self) -> None:
+        async with database.session() as session:
+            unfinished_jobs = await job_repo.get_unfinished_jobs(session=session)
+
+        for job in unfinished_jobs:
+            if job.id in self._queued:
+                continue
+            if job.previous_competencies is not None:
+                # Не поместившиеся в очередь задачи повторного анализа возьмёт _enqueue_pending
+                self._enqueue(job.id)
+            elif not self._job_dir(job.id).is_dir() or not self._enqueue(job.id):
+                async with database.session() as session:
+                    await job_repo.set_status(session=session, job_id=job.id, status=AnalysisJobStatus.FAILED)
+
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self._workers)]
+
+    async def shutdown(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, profession_id: int, files: list[UploadFile]) -> AnalysisJobSchema:
+        if self._queue.full():
+            raise AnalysisQueueFull()
+
+        async with database.session() as session:
+            job = await job_repo.create_job(session=session, profession_id=profession_id, total_files=len(files))
+
+        job_dir = self._job_dir(job.id)
+        try:
+            for index, file in enumerate(files):
+                # Префикс сохраняет порядок файлов, исходное имя нужно для определения формата
+                await spool_upload(file, job_dir / f"{index:05d}_{Path(file.filename).name}")
+        except Exception:
+            # Задача без полного набора файлов не должна оставаться в статусе pending
+            await self._discard_job(job.id)
+            raise
+
+        if not self._enqueue(job.id):
+            await self._discard_job(job.id)
+            raise AnalysisQueueFull()
+
+        return job
+
+    async def _discard_job(self, job_id: int) -> None:
+        """Удаляет файлы задачи и помечает её как failed. Задача может быть уже удалена вместе с профессией."""
+        shutil.rmtree(self._job_dir(job_id), ignore_errors=True)
+        try:
+            async with database.session() as session:
+                await job_repo.set_status(session=session, job_id=job_id, status=AnalysisJobStatus.FAILED)
+        except AnalysisJobNotFound:
+            logger.info("Analysis job %s no longer exists", job_id)
+
+    async def submit_reanalysis(self, profession_id: int, previous_competencies: dict) -> AnalysisJobSchema:
+        """
+        Ставит в очередь повторный анализ резюме профессии после изменения её компетенций.
+        При заполненной очереди задача остаётся в статусе pending до освобождения места.
+        """
+        async with database.session() as session:
+            job = await job_repo.create_job(
+                session=session,
+                profession_id=profession_id,
+                total_files=0,
+                previous_competencies=previous_competencies,
+            )
+
+        if not self._enqueue(job.id):
+            logger.info("Reanalysis job %s is pending: analysis queue is full", job.id)
+
+        return job
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run_job(job_id)
+            except JOB_ERRORS:
+                logger.exception("Analysis job %s failed", job_id)
+                try:
+                    await self._discard_job(job_id)
+                except JOB_ERRORS:
+                    logger.exception("Failed to mark analysis job %s as failed", job_id)
+            finally:
+                self._queued.discard(job_id)
+                self._queue.task_done()
+
+            try:
+                await self._enqueue_pending()
+            except JOB_ERRORS:
+                logger.exception("Failed to enqueue pending analysis jobs")
+
+    async def _run_job(self, job_id: int) -> None:
+        job_dir = self._job_dir(job_id)
+
+        try:
+            async with database.session() as session:
+                job = await job_repo.get_job_by_id(session=session, job_id=job_id)
+                profession = await profession_repo.get_profession_by_id(
+                    session=session,
+                    profession_id=job.profession_id,
+                )
+                await job_repo.set_status(session=session, job_id=job_id, status=AnalysisJobStatus.RUNNING)
+        except ProfessionNotFound:
+            await self._discard_job(job_id)
+            return
+
+        if job.previous_competencies is not None:
+            await self._run_reanalysis(job, profession)
+            async with database.session() as session:
+                await job_repo.set_status(session=session, job_id=job_id, status=AnalysisJobStatus.COMPLETED)
+            return
+
+        paths = sorted(job_dir.iterdir()) if job_dir.is_dir() else []
+        batch_size = analysis_engine.max_workers
+        for start in range(0, len(paths), batch_size):
+            await asyncio.gather(*[
+                self._process_file(job_id, profession, path)
+                for path in paths[start:start + batch_size]
+            ])
+
+        shutil.rmtree(job_dir, ignore_errors=True)
+        async with database.session() as session:
+            await job_repo.set_status(session=session, job_id=job_id, status=AnalysisJobStatus.COMPLETED)
+
+    async def _run_reanalysis(self, job: AnalysisJobSchema, profession: ProfessionSchema) -> None:
+        """Пересчитывает резюме профессии, резюме без сохранённого документа перечисляются в skipped_resume_ids."""
+        previous_competencies = job.previous_competencies.get("competencies", [])
+        current_competencies = profession.competencies.get("competencies", [])
+        previous_hash = competencies_hash(previous_competencies)
+        current_hash = competencies_hash(current_competencies)
+        if previous_hash == current_hash:
+            return
+
+        async with database.session() as session:
+            professions = await profession_repo.get_all_professions(session=session)
+            # Без сохранённого документа резюме не пересчитать: задача сообщает о них, но не считает ошибкой
+            skipped_ids = await file_cache_repo.get_uncached_resume_ids(
+                session=session,
+                competency_names=[comp["name"] for comp in previous_competencies],
+            )
+            await job_repo.set_skipped_resumes(session=session, job_id=job.id, resume_ids=skipped_ids)
+
+        # Резюме набора, общего с другой профессией, остаются ей, для этой профессии создаются новые
+        shared = any(
+            other.id != profession.id
+            and competencies_hash(other.competencies.get("competencies", [])) == previous_hash
+            for other in professions
+        )
+
+        # Найденные уровни зависят только от названий компетенций и их порядка, требуемые уровни на них не влияют
+        if [comp["name"] for comp in previous_competencies] == [comp["name"] for comp in current_competencies]:
+            async with database.session() as session:
+                await file_cache_repo.move_analyses(
+                    session=session,
+                    old_competencies_hash=previous_hash,
+                    new_competencies_hash=current_hash,
+                    keep_old=shared,
+                )
+            return
+
+        async with database.session() as session:
+            remaining = await file_cache_repo.count_analyzed_files(
+                session=session,
+                competencies_hash=previous_hash,
+                exclude_competencies_hash=current_hash if shared else None,
+            )
+            # После перезапуска уже обработанные резюме учитываются в общем числе
+            await job_repo.set_total_files(
+                session=session,
+                job_id=job.id,
+                total_files=job.processed_files + remaining,
+            )
+
+        # Обработанная порция переносится (или копируется) на новый набор компетенций,
+        # поэтому следующая выборка начинается заново. Поиск идёт между сессиями: соединение
+        # из пула не простаивает, пока пул процессов анализирует документы
+        while True:
+            async with database.session() as session:
+                files = await file_cache_repo.get_analyzed_files(
+                    session=session,
+                    competencies_hash=previous_hash,
+                    limit=settings.RESUME_INSERT_CHUNK_SIZE,
+                    exclude_competencies_hash=current_hash if shared else None,
+                )
+            if not files:
+                return
+
+            competencies = await resume_repo.scan_stored_files(files=files, profession=profession)
+
+            async with database.session() as session:
+                if shared:
+                    resume_ids = await resume_repo.save_rescanned_files(
+                        session=session,
+                        profession=profession,
+                        files=files,
+                        competencies=competencies,
+                    )
+                else:
+                    resume_ids = await resume_repo.save_reanalyzed_files(
+                        session=session,
+                        profession=profession,
+                        previous_comp_hash=previous_hash,
+                        files=files,
+                        competencies=competencies,
+                    )
+                await job_repo.add_processed_resumes(session=session, job_id=job.id, resume_ids=resume_ids)
+
+    async def _process_file(self, job_id: int, profession: ProfessionSchema, path: Path) -> None:
+        filename = path.name.split("_", 1)[1]
+
+        try:
+            # Файл анализируется без открытой сессии, она нужна только для записи результата
+            resume_id = await resume_repo.process_file(
+                file_data=FileUploadSchema(filename=filename, path=str(path)),
+                profession=profession,
+            )
+            async with database.session() as session:
+                await job_repo.add_processed_file(session=session, job_id=job_id, resume_id=resume_id)
+        except (FileParsingError, Exception) as error:
+            message = error.message if isinstance(error, FileParsingError) else str(error)
+            async with database.session() as session:
+                await job_repo.add_failed_file(session=session, job_id=job_id, filename=filename, error=message)
+        finally:
+            path.unlink(missing_ok=True)
+
+
+analysis_job_queue = AnalysisJobQueue(
+    maxsize=settings.ANALYSIS_JOB_QUEUE_SIZE,
+    workers=settings.ANALYSIS_JOB_WORKERS,
+    spool_dir=settings.ANALYSIS_SPOOL_DIR,
+)
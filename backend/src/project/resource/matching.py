@@ -0,0 +1,119 @@
+import numpy as np
+
+from project.schemas.profession import ProfessionSchema
+from project.schemas.resume import ResumeSchema, ResumeMatchResult
+
+LEVEL_DTYPE = np.int16
+
+
+class MatchingEngine:
+    """
+    Векторизованная оценка соответствия резюме профессиям.
+    Названия компетенций кодируются общим словарём: резюме хранятся матрицей уровней
+    (резюме x словарь), требования профессии - индексами столбцов и уровнями.
+    Оценка резюме по профессии - np.minimum(уровни, требования).sum(axis=1).
+    Отсутствующая в резюме компетенция имеет уровень 0 и всегда считается несоответствием,
+    даже если требуемый уровень тоже 0, поэтому наличие компетенций хранится отдельной матрицей.
+    """
+
+    def __init__(self, resumes: list[ResumeSchema], professions: list[ProfessionSchema]) -> None:
+        self.resumes = resumes
+        self.professions = professions
+        self.vocabulary: dict[str, int] = {}
+
+        self.requirements = [self._encode_requirements(profession) for profession in professions]
+        self.resume_levels, self.resume_present = self._encode_resumes(resumes)
+
+    def _encode_requirements(self, profession: ProfessionSchema) -> tuple[np.ndarray, np.ndarray]:
+        required_competencies = profession.competencies.get("competencies", [])
+        columns = [self.vocabulary.setdefault(comp["name"], len(self.vocabulary)) for comp in required_competencies]
+        levels = [comp["level"] for comp in required_competencies]
+
+        return np.array(columns, dtype=np.intp), np.array(levels, dtype=LEVEL_DTYPE)
+
+    def _encode_resumes(self, resumes: list[ResumeSchema]) -> tuple[np.ndarray, np.ndarray]:
+        rows, columns, levels = [], [], []
+
+        for row, resume in enumerate(resumes):
+            resume_comp_dict = {
+                comp["name"]: comp["level"]
+                for comp in resume.competencies.get("competencies", [])
+            }
+            for comp_name, level in resume_comp_dict.items():
+                column = self.vocabulary.get(comp_name)
+                # Компетенции, которых нет ни в одной профессии, на оценку не влияют
+                if column is not None:
+                    rows.append(row)
+                    columns.append(column)
+                    levels.append(level)
+
+        resume_levels = np.zeros((len(resumes), len(self.vocabulary)), dtype=LEVEL_DTYPE)
+        resume_levels[rows, columns] = levels
+        resume_present = np.zeros((len(resumes), len(self.vocabulary)), dtype=bool)
+        resume_present[rows, columns] = True
+
+        return resume_levels, resume_present
+
+    def score(self, profession_index: int) -> tuple[np.ndarray, int]:
+        """Возвращает набранную сумму уровней для каждого резюме и максимально возможную сумму."""
+        columns, required_levels = self.requirements[profession_index]
+        actual_levels = self.resume_levels[:, columns]
+
+        total_matched = np.minimum(actual_levels, required_levels).sum(axis=1)
+
+        return total_matched, int(required_levels.sum())
+
+    def score_all(self) -> tuple[np.ndarray, np.ndarray]:
+        """Матрица набранных сумм (резюме x профессии) и вектор максимальных сумм по профессиям."""
+        total_matched = np.zeros((len(self.resumes), len(self.professions)), dtype=np.int64)
+        total_possible = np.zeros(len(self.professions), dtype=np.int64)
+
+        for profession_index in range(len(self.professions)):
+            total_matched[:, profession_index], total_possible[profession_index] = self.score(profession_index)
+
+        return total_matched, total_possible
+
+    def match_results(self, profession_index: int) -> list[ResumeMatchResult]:
+        """Оценки в формате API с несоответствиями в порядке компетенций профессии."""
+        columns, required_levels = self.requirements[profession_index]
+        required_competencies = self.professions[profession_index].competencies.get("competencies", [])
+        actual_levels = self.resume_levels[:, columns]
+        total_matched, total_possible = self.score(profession_index)
+
+        mismatches = [[] for _ in self.resumes]
+        rows, positions = np.nonzero((actual_levels < required_levels) | ~self.resume_present[:, columns])
+        for row, position, actual_level in zip(
+                rows.tolist(),
+                positions.tolist(),
+                actual_levels[rows, positions].tolist(),
+        ):
+            # Вложенные модели валидируются pydantic из словарей, это быстрее создания по одной
+            mismatches[row].append({
+                "name": required_competencies[position]["name"],
+                "required_level": required_competencies[position]["level"],
+                "actual_level": actual_level,
+            })
+
+        return [
+            ResumeMatchResult(
+                resume_id=resume.id,
+                first_name=resume.first_name,
+                last_name=resume.last_name,
+                match_percentage=match_percentage(matched, total_possible),
+                mismatched_competencies=resume_mismatches
+            )
+            for resume, matched, resume_mismatches in zip(self.resumes, total_matched.tolist(), mismatches)
+        ]
+
+
+def match_resumes(
+        profession: ProfessionSchema,
+        resumes: list[ResumeSchema],
+) -> list[ResumeMatchResult]:
+    """Оценивает соответствие резюме требуемым компетенциям профессии."""
+    return MatchingEngine(resumes=resumes, professions=[profession]).match_results(0)
+
+
+def match_percentage(total_matched: int, total_possible: int) -> float:
+    percentage = (total_matched / total_possible * 100) if total_possible > 0 else 0
+    return round(percentage, 2)
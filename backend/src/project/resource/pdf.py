@@ -0,0 +1,116 @@
+from io import StringIO
+
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams
+from pdfminer.pdfdevice import PDFTextDevice
+from pdfminer.pdffont import PDFUnicodeNotDefined
+from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
+from pdfminer.pdfpage import PDFPage
+
+
+class PdfMinerBackend:
+    """
+    Извлечение текста pdfminer с анализом разметки: символы собираются в строки и блоки по координатам.
+    Настройки анализа задаются LAParams, как в pdfminer.high_level.extract_text.
+    """
+
+    def __init__(self, laparams: LAParams | None) -> None:
+        self.laparams = laparams
+
+    def _device(self, rsrcmgr: PDFResourceManager, output: StringIO) -> PDFTextDevice:
+        return TextConverter(rsrcmgr, output, laparams=self.laparams)
+
+    def extract_text(self, path: str, page_numbers: list[int] | None = None, maxpages: int = 0) -> str:
+        """Текст страниц page_numbers (с нуля) или всех страниц, но не более maxpages (0 - без ограничения)."""
+        with open(path, "rb") as pdf_file, StringIO() as output:
+            rsrcmgr = PDFResourceManager(caching=True)
+            device = self._device(rsrcmgr, output)
+            interpreter = PDFPageInterpreter(rsrcmgr, device)
+            for page in PDFPage.get_pages(pdf_file, page_numbers, maxpages=maxpages):
+                interpreter.process_page(page)
+            return output.getvalue()
+
+
+class StreamTextDevice(PDFTextDevice):
+    """
+    Текст в порядке content stream без объектов LTChar и анализа разметки.
+    Перевод строки ставится при смене базовой линии, пустая строка - при разрыве больше половины
+    высоты строки (как граница блока при line_margin = 0.5), пробел - при разрыве между символами
+    больше word_margin. Подходит для документов, где текст записан в порядке чтения, то есть
+    для большинства резюме, выгруженных из текстовых редакторов.
+    """
+
+    WORD_MARGIN = 0.1
+    LINE_MARGIN = 0.5
+
+    def __init__(self, rsrcmgr: PDFResourceManager, output: StringIO) -> None:
+        super().__init__(rsrcmgr)
+        self.output = output
+        self._x = None
+        self._y = None
+        self._height = 0
+        self._last_char = ""
+
+    def begin_page(self, page, ctm) -> None:
+        super().begin_page(page, ctm)
+        self._x = None
+        self._y = None
+        self._last_char = ""
+
+    def end_page(self, page) -> None:
+        if self._last_char:
+            self.output.write("\n\n")
+        self.output.write("\f")
+
+    def render_char(self, matrix, font, fontsize, scaling, rise, cid, ncs, graphicstate) -> float:
+        try:
+            text = font.to_unichr(cid)
+        except PDFUnicodeNotDefined:
+            text = self.handle_undefined_char(font, cid)
+
+        advance = font.char_width(cid) * fontsize * scaling
+        height = fontsize * abs(matrix[3]) or fontsize
+        x, y = matrix[4], matrix[5]
+
+        if self._y is not None:
+            if abs(y - self._y) > height / 2:
+                self.output.write("\n")
+                # Разрыв между строками больше line_margin - новый блок текста
+                if self._y - y - height > self.LINE_MARGIN * height:
+                    self.output.write("\n")
+            elif x - self._x > self.WORD_MARGIN * height and text != " " and self._last_char != " ":
+                self.output.write(" ")
+
+        self.output.write(text)
+        self._x = x + advance * matrix[0]
+        self._y = y
+        self._last_char = text
+        return advance
+
+    def handle_undefined_char(self, font, cid: int) -> str:
+        return f"(cid:{cid})"
+
+
+class PdfStreamBackend(PdfMinerBackend):
+    """Разбор PDF средствами pdfminer, текст собирается StreamTextDevice."""
+
+    def __init__(self) -> None:
+        super().__init__(laparams=None)
+
+    def _device(self, rsrcmgr: PDFResourceManager, output: StringIO) -> PDFTextDevice:
+        return StreamTextDevice(rsrcmgr, output)
+
+
+PDF_BACKENDS = {
+    # Полный анализ разметки pdfminer по умолчанию
+    "layout": PdfMinerBackend(LAParams()),
+    # Строки и блоки без иерархического упорядочивания блоков (boxes_flow), самой дорогой части анализа
+    "fast": PdfMinerBackend(LAParams(boxes_flow=None)),
+    # Без анализа разметки
+    "stream": PdfStreamBackend(),
+}
+
+
+def count_pdf_pages(path: str) -> int:
+    with open(path, "rb") as pdf_file:
+        return sum(1 for _ in PDFPage.get_pages(pdf_file))
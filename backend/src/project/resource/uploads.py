@@ -0,0 +1,31 @@
+import asyncio
+import hashlib
+from pathlib import Path
+
+from fastapi import UploadFile
+
+from project.core.config import settings
+
+
+async def spool_upload(file: UploadFile, path: Path) -> Path:
+    """
+    Записывает загруженный файл на диск по частям, не читая его в память целиком.
+    Операции с диском выполняются в потоках, чтобы не блокировать цикл событий.
+    """
+    await asyncio.to_thread(path.parent.mkdir, parents=True, exist_ok=True)
+    spooled_file = await asyncio.to_thread(path.open, "wb")
+    try:
+        while chunk := await file.read(settings.UPLOAD_CHUNK_SIZE):
+            await asyncio.to_thread(spooled_file.write, chunk)
+    finally:
+        await asyncio.to_thread(spooled_file.close)
+    return path
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 содержимого файла, читается по частям."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as spooled_file:
+        while chunk := spooled_file.read(settings.UPLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
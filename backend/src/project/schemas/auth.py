@@ -13,3 +13,15 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     username: str | None = Field(default=None)
+
+
+class PasswordHasherStatsSchema(BaseModel):
+    workers: int
+    max_queue: int
+    pending: int
+    completed: int
+    rejected: int
+    avg_wait_ms: float
+    max_wait_ms: float
+    avg_hash_ms: float
+    max_hash_ms: float
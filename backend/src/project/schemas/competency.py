@@ -0,0 +1,18 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class CompetencyFilterSchema(BaseModel):
+    name: str
+    min_level: int = Field(default=1, ge=1, le=3)
+
+
+class CompetencySearchSchema(BaseModel):
+    competencies: List[CompetencyFilterSchema] = Field(
+        min_length=1,
+        examples=[[
+            {"name": "Языки программирования и библиотеки (Python, C++)", "min_level": 2},
+            {"name": "Методы оптимизации", "min_level": 1},
+        ]]
+    )
@@ -3,3 +3,15 @@ from pydantic import BaseModel
 
 class HealthCheckSchema(BaseModel):
     db_is_ok: bool
+
+
+class PoolStatsSchema(BaseModel):
+    size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    timeouts: int
+    avg_wait_ms: float
+    max_wait_ms: float
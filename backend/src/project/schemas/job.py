@@ -0,0 +1,43 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class AnalysisJobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class AnalysisJobFileError(BaseModel):
+    filename: str
+    error: str
+
+
+class AnalysisJobSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    profession_id: int
+    status: AnalysisJobStatus
+    total_files: int
+    processed_files: int
+    failed_files: int
+    resume_ids: List[int]
+    errors: List[AnalysisJobFileError]
+    skipped_resume_ids: List[int]
+    previous_competencies: Optional[Dict[str, Any]] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class MorphCacheStatsSchema(BaseModel):
+    pid: int
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    hit_rate: float
@@ -1,3 +1,4 @@
+from enum import Enum
 from typing import Dict, Any, Optional, List
 from datetime import date
 from pydantic import BaseModel, Field, ConfigDict
@@ -41,7 +42,26 @@ class ResumeListResponse(BaseModel):
 
 class FileUploadSchema(BaseModel):
     filename: str
-    content: str
+    path: str
+
+
+class CachedFileSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    file_hash: str
+    compressed_text: bytes
+    tokens: Optional[bytes] = None
+    contact_info: Dict[str, Any]
+
+
+class AnalyzedFileSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    resume_id: int
+    file_hash: str
+    compressed_text: bytes
+    tokens: Optional[bytes] = None
+    contact_info: Dict[str, Any]
 
 
 class MultiFileUploadSchema(BaseModel):
@@ -49,6 +69,11 @@ class MultiFileUploadSchema(BaseModel):
     profession: ProfessionSchema
 
 
+class MultiProfessionUploadSchema(BaseModel):
+    files: List[FileUploadSchema]
+    professions: List[ProfessionSchema]
+
+
 class ProcessedResumeResponse(BaseModel):
     resume_ids: List[int]
     status: str
@@ -65,5 +90,26 @@ class ResumeMatchResult(BaseModel):
     match_percentage: float
     mismatched_competencies: List[CompetencyMismatch]
 
+class ScoringMode(str, Enum):
+    PYTHON = "python"
+    SQL = "sql"
+
 class ProfessionResumeMatchResponse(BaseModel):
-    results: List[ResumeMatchResult]
\ No newline at end of file
+    results: List[ResumeMatchResult]
+
+class ProfessionAnalysisResult(BaseModel):
+    profession_id: int
+    resume_ids: List[int]
+    results: List[ResumeMatchResult]
+
+class MultiProfessionAnalysisResponse(BaseModel):
+    professions: List[ProfessionAnalysisResult]
+    status: str
+
+class TopCandidatesCursor(BaseModel):
+    match_percentage: float
+    resume_id: int
+
+class TopCandidatesResponse(BaseModel):
+    results: List[ResumeMatchResult]
+    next_cursor: Optional[TopCandidatesCursor] = None
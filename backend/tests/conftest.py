@@ -0,0 +1,67 @@
+import os
+
+# Значения по умолчанию для настроек, без которых не импортируется project.core.config.
+# Тесты с базой используют POSTGRES_* из окружения и пропускаются, если Postgres недоступен
+for name, value in {
+    "ORIGINS": "*",
+    "ROOT_PATH": "",
+    "ENV": "TEST",
+    "LOG_LEVEL": "INFO",
+    "POSTGRES_SCHEMA": "schema_competency",
+    "POSTGRES_HOST": "127.0.0.1",
+    "POSTGRES_DB": "competency",
+    "POSTGRES_PORT": "5432",
+    "POSTGRES_USER": "postgres",
+    "POSTGRES_PASSWORD": "postgres",
+    "POSTGRES_RECONNECT_INTERVAL_SEC": "1",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "SECRET_AUTH_KEY": "test",
+    "AUTH_ALGORITHM": "HS256",
+}.items():
+    os.environ.setdefault(name, value)
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from project.infrastructure.postgres.database import database
+from project.resource.engine import analysis_engine
+from project.resource.jobs import AnalysisJobQueue
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def db():
+    try:
+        async with database.session() as session:
+            await session.execute(text("SELECT 1"))
+    except (OSError, SQLAlchemyError) as error:
+        pytest.skip(f"Postgres недоступен: {error}")
+
+    yield database
+
+    await database.dispose()
+
+
+@pytest.fixture
+def analysis_pool():
+    analysis_engine.start()
+
+    yield analysis_engine
+
+    analysis_engine.shutdown()
+
+
+@pytest.fixture
+async def job_queue(db, analysis_pool, tmp_path):
+    """Запущенная очередь задач анализа со своим каталогом файлов."""
+    queue = AnalysisJobQueue(maxsize=10, workers=1, spool_dir=tmp_path)
+    await queue.start()
+
+    yield queue
+
+    await queue.shutdown()
@@ -0,0 +1,228 @@
+import codecs
+import struct
+
+import pytest
+
+from project.core.exceptions import FileParsingError
+from project.resource.analyze import Analyzer
+from project.resource.formats import OLE_MAGIC, FileFormat, detect_format
+
+SECTOR_SIZE = 512
+MINI_SECTOR_SIZE = 64
+MINI_CUTOFF = 4096
+FAT_SECTOR = 0xFFFFFFFD
+END_OF_CHAIN = 0xFFFFFFFE
+FREE_SECTOR = 0xFFFFFFFF
+
+WORD_TEXT_OFFSET = 0x800
+WORD_CLX_OFFSET = 0x01A2
+WORD_COMPRESSED = 0x40000000
+# Поток WordDocument начинается после FAT, каталога, мини-FAT и мини-потока из одного сектора
+WORD_START_SECTOR = 4
+
+
+@pytest.fixture(scope="module")
+def analyzer():
+    return Analyzer()
+
+
+def write(tmp_path, name: str, data: bytes) -> str:
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def directory_entry(name: str, entry_type: int, start: int, size: int, child: int = FREE_SECTOR,
+                    left: int = FREE_SECTOR) -> bytes:
+    encoded_name = (name + "\0").encode("utf-16-le")
+    entry = bytearray(128)
+    entry[:len(encoded_name)] = encoded_name
+    struct.pack_into("<HBB", entry, 0x40, len(encoded_name), entry_type, 1)
+    struct.pack_into("<III", entry, 0x44, left, FREE_SECTOR, child)
+    struct.pack_into("<II", entry, 0x74, start, size)
+    return bytes(entry)
+
+
+def build_compound_file(word_document: bytes, table: bytes) -> bytes:
+    """
+    Составной файл OLE2 с секторами по 512 байт: FAT, каталог, мини-FAT, мини-поток с потоком 1Table
+    и обычные секторы потока WordDocument (не короче MINI_CUTOFF).
+    """
+    mini_sectors = -(-len(table) // MINI_SECTOR_SIZE)
+    mini_stream = table.ljust(mini_sectors * MINI_SECTOR_SIZE, b"\0")
+    mini_stream_sectors = -(-len(mini_stream) // SECTOR_SIZE)
+    word_start = 3 + mini_stream_sectors
+    word_sectors = -(-len(word_document) // SECTOR_SIZE)
+
+    fat = [FAT_SECTOR, END_OF_CHAIN, END_OF_CHAIN]
+    for start, count in ((3, mini_stream_sectors), (word_start, word_sectors)):
+        fat.extend(list(range(start + 1, start + count)) + [END_OF_CHAIN])
+    mini_fat = list(range(1, mini_sectors)) + [END_OF_CHAIN]
+
+    header = bytearray(SECTOR_SIZE)
+    header[:8] = OLE_MAGIC
+    struct.pack_into("<HHHHH", header, 0x18, 0x3E, 3, 0xFFFE, 9, 6)
+    struct.pack_into("<IIIIIIII", header, 0x2C, 1, 1, 0, MINI_CUTOFF, 2, 1, END_OF_CHAIN, 0)
+    struct.pack_into("<109I", header, 0x4C, 0, *[FREE_SECTOR] * 108)
+
+    directory = b"".join([
+        directory_entry("Root Entry", 5, 3, len(mini_stream), child=1),
+        directory_entry("WordDocument", 2, word_start, len(word_document), left=2),
+        directory_entry("1Table", 2, 0, len(table)),
+    ])
+
+    def sectors(data: bytes) -> bytes:
+        return data.ljust(-(-len(data) // SECTOR_SIZE) * SECTOR_SIZE, b"\0")
+
+    return b"".join([
+        bytes(header),
+        struct.pack("<128I", *fat, *[FREE_SECTOR] * (128 - len(fat))),
+        sectors(directory + directory_entry("", 0, 0, 0)),
+        struct.pack("<128I", *mini_fat, *[FREE_SECTOR] * (128 - len(mini_fat))),
+        sectors(mini_stream),
+        sectors(word_document),
+    ])
+
+
+def build_doc(pieces: list[tuple[str, bool]], flags: int = 0x0200) -> bytes:
+    """
+    Документ Word 97-2003 из фрагментов (текст, в однобайтовой кодировке cp1252),
+    таблица фрагментов хранится в потоке 1Table после записи Prc.
+    """
+    text = bytearray()
+    positions = [0]
+    descriptors = []
+    for piece, compressed in pieces:
+        offset = WORD_TEXT_OFFSET + len(text)
+        if compressed:
+            text += piece.encode("cp1252")
+            fc = offset * 2 | WORD_COMPRESSED
+        else:
+            text += piece.encode("utf-16-le")
+            fc = offset
+        positions.append(positions[-1] + len(piece))
+        descriptors.append(struct.pack("<HIH", 0, fc, 0))
+
+    plc = struct.pack(f"<{len(positions)}I", *positions) + b"".join(descriptors)
+    clx = b"\x01" + struct.pack("<H", 2) + b"\0\0" + b"\x02" + struct.pack("<I", len(plc)) + plc
+    table = b"\0" * 16 + clx
+
+    word_document = bytearray(max(MINI_CUTOFF, WORD_TEXT_OFFSET + len(text)))
+    struct.pack_into("<HHHHH", word_document, 0, 0xA5EC, 0xC1, 0, 0x0419, flags)
+    struct.pack_into("<II", word_document, WORD_CLX_OFFSET, 16, len(clx))
+    word_document[WORD_TEXT_OFFSET:WORD_TEXT_OFFSET + len(text)] = text
+    return build_compound_file(bytes(word_document), table)
+
+
+DOC_PIECES = [("Python developer\r", True), ("Опыт работы с PostgreSQL\x07Redis\r", False)]
+DOC_TEXT = "Python developer\nОпыт работы с PostgreSQL\tRedis\n"
+
+
+def test_doc_text_from_piece_table(tmp_path, analyzer):
+    path = write(tmp_path, "resume.doc", build_doc(DOC_PIECES))
+
+    assert detect_format(path) == FileFormat.DOC
+    assert analyzer.extract_text("resume.doc", path) == DOC_TEXT
+
+
+def test_doc_field_codes_are_dropped(tmp_path, analyzer):
+    pieces = [("Портфолио: \x13 HYPERLINK \"http://example.com\" \x14example.com\x15\r", False)]
+    path = write(tmp_path, "resume.doc", build_doc(pieces))
+
+    assert analyzer.extract_text("resume.doc", path) == "Портфолио: example.com\n"
+
+
+@pytest.mark.parametrize("size", [8, 100, 600, 1500, 3000])
+def test_truncated_doc_raises_parsing_error(tmp_path, analyzer, size):
+    path = write(tmp_path, "resume.doc", build_doc(DOC_PIECES)[:size])
+
+    with pytest.raises(FileParsingError):
+        analyzer.extract_text("resume.doc", path)
+
+
+def test_doc_with_cyclic_sector_chain_raises_parsing_error(tmp_path, analyzer):
+    data = bytearray(build_doc(DOC_PIECES))
+    # Первый сектор потока WordDocument ссылается сам на себя
+    struct.pack_into("<I", data, SECTOR_SIZE + WORD_START_SECTOR * 4, WORD_START_SECTOR)
+    path = write(tmp_path, "resume.doc", bytes(data))
+
+    with pytest.raises(FileParsingError, match="зациклена"):
+        analyzer.extract_text("resume.doc", path)
+
+
+def test_doc_with_piece_outside_stream_raises_parsing_error(tmp_path, analyzer):
+    data = bytearray(build_doc([("Python", False)]))
+    # Смещение фрагмента за концом WordDocument: таблица фрагментов в потоке 1Table, который лежит
+    # в начале мини-потока (сектор 3), идёт после 16 байт, записей Prc и Pcdt и двух позиций
+    fc_offset = (3 + 1) * SECTOR_SIZE + 16 + 5 + 5 + 8 + 2
+    assert struct.unpack_from("<I", data, fc_offset) == (WORD_TEXT_OFFSET,)
+    struct.pack_into("<I", data, fc_offset, 0x10000)
+    path = write(tmp_path, "resume.doc", bytes(data))
+
+    with pytest.raises(FileParsingError, match="за пределами"):
+        analyzer.extract_text("resume.doc", path)
+
+
+def test_encrypted_doc_raises_parsing_error(tmp_path, analyzer):
+    path = write(tmp_path, "resume.doc", build_doc(DOC_PIECES, flags=0x0200 | 0x0100))
+
+    with pytest.raises(FileParsingError, match="зашифрован"):
+        analyzer.extract_text("resume.doc", path)
+
+
+def test_rtf_text_with_code_page_and_unicode(tmp_path, analyzer):
+    rtf = (
+        b"{\\rtf1\\ansi\\ansicpg1251\\deff0{\\fonttbl{\\f0 Times;}}{\\*\\generator Msftedit;}"
+        b"\\f0 \\'cf\\'f0\\'e8\\'e2\\'e5\\'f2 Python\\par \\u1055?\\u1088?\\u1080? SQL\\tab C\\{\\}\\par"
+        b"{\\field{\\*\\fldinst HYPERLINK \"http://example.com\"}{\\fldrslt example.com}}}"
+    )
+    path = write(tmp_path, "resume.rtf", rtf)
+
+    assert detect_format(path) == FileFormat.RTF
+    assert analyzer.extract_text("resume.rtf", path) == "Привет Python\nПри SQL\tC{}\nexample.com"
+
+
+def test_truncated_rtf_keeps_text_before_cut(tmp_path, analyzer):
+    path = write(tmp_path, "resume.rtf", b"{\\rtf1\\ansi\\ansicpg1251{\\fonttbl{\\f0 Times;}}Python\\par SQ")
+
+    assert analyzer.extract_text("resume.rtf", path) == "Python\nSQ"
+
+
+def test_rtf_with_unknown_code_page_raises_parsing_error(tmp_path, analyzer):
+    path = write(tmp_path, "resume.rtf", b"{\\rtf1\\ansi\\ansicpg99999 \\'cf\\'f0}")
+
+    with pytest.raises(FileParsingError):
+        analyzer.extract_text("resume.rtf", path)
+
+
+@pytest.mark.parametrize("data", [
+    "Опыт работы: Python, SQL\r\n".encode("cp1251"),
+    "Опыт работы: Python, SQL\r\n".encode("utf-8"),
+    codecs.BOM_UTF8 + "Опыт работы: Python, SQL\r\n".encode("utf-8"),
+    codecs.BOM_UTF16_LE + "Опыт работы: Python, SQL\r\n".encode("utf-16-le"),
+    codecs.BOM_UTF16_BE + "Опыт работы: Python, SQL\r\n".encode("utf-16-be"),
+])
+def test_plain_text_encodings(tmp_path, analyzer, data):
+    path = write(tmp_path, "resume.txt", data)
+
+    assert detect_format(path) == FileFormat.TEXT
+    assert analyzer.extract_text("resume.txt", path) == "Опыт работы: Python, SQL\r\n"
+
+
+def test_truncated_utf16_text_is_decoded_with_replacement(tmp_path, analyzer):
+    data = codecs.BOM_UTF16_LE + "Python, SQL".encode("utf-16-le")
+    path = write(tmp_path, "resume.txt", data[:-1])
+
+    assert analyzer.extract_text("resume.txt", path) == "Python, SQ�"
+
+
+@pytest.mark.parametrize("data", [
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR",
+    bytes(range(1, 256)) * 4,
+])
+def test_binary_file_raises_parsing_error(tmp_path, analyzer, data):
+    path = write(tmp_path, "resume.bin", data)
+
+    assert detect_format(path) is None
+    with pytest.raises(FileParsingError, match="неподдерживаемый формат"):
+        analyzer.extract_text("resume.bin", path)
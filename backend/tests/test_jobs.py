@@ -0,0 +1,142 @@
+import io
+import uuid
+
+import anyio
+import pytest
+from fastapi import UploadFile
+
+from project.infrastructure.postgres.database import database
+from project.resource.jobs import AnalysisJobQueue
+from project.infrastructure.postgres.repository.job_repo import AnalysisJobRepository
+from project.infrastructure.postgres.repository.profession_repo import ProfessionRepository
+from project.infrastructure.postgres.repository.resume_repo import ResumeRepository
+from project.schemas.job import AnalysisJobSchema, AnalysisJobStatus
+from project.schemas.profession import ProfessionCreateUpdateSchema, ProfessionSchema
+from project.schemas.resume import ResumeCreateUpdateSchema
+
+pytestmark = pytest.mark.anyio
+
+job_repo = AnalysisJobRepository()
+profession_repo = ProfessionRepository()
+resume_repo = ResumeRepository()
+
+RESUME_TEXT = """Иван Петров
+Город: Москва
+Телефон: +7 912 345-67-89
+Email: ivan.{salt}@example.com
+
+Опыт работы
+Разрабатывал сервисы на Python и FastAPI, оптимизация запросов SQL.
+Коммерческий опыт работы с PostgreSQL и Redis, проектирование схем данных.
+"""
+
+
+async def wait_for_job(job_id: int) -> AnalysisJobSchema:
+    with anyio.fail_after(120):
+        while True:
+            async with database.session() as session:
+                job = await job_repo.get_job_by_id(session=session, job_id=job_id)
+            if job.status in (AnalysisJobStatus.COMPLETED, AnalysisJobStatus.FAILED):
+                return job
+            await anyio.sleep(0.1)
+
+
+async def create_profession() -> ProfessionSchema:
+    salt = uuid.uuid4().hex
+    competencies = {"competencies": [
+        {"name": "Языки программирования и библиотеки (Python, C++)", "level": 2},
+        {"name": "Базы данных SQL", "level": 2},
+        {"name": f"Компетенция {salt}", "level": 1},
+    ]}
+    async with database.session() as session:
+        return await profession_repo.create_profession(
+            session=session,
+            profession=ProfessionCreateUpdateSchema(name=f"Профессия {salt}", competencies=competencies),
+        )
+
+
+@pytest.fixture
+async def profession(db):
+    profession = await create_profession()
+
+    yield profession
+
+    async with database.session() as session:
+        await profession_repo.delete_profession(session=session, profession_id=profession.id)
+
+
+def make_upload() -> UploadFile:
+    return UploadFile(
+        file=io.BytesIO(RESUME_TEXT.format(salt=uuid.uuid4().hex).encode()),
+        filename="resume.txt",
+    )
+
+
+async def create_legacy_resume(competencies: list[dict]) -> int:
+    """Резюме без сохранённого документа, как до появления кэша файлов."""
+    async with database.session() as session:
+        resume = await resume_repo.create_resume(
+            session=session,
+            resume=ResumeCreateUpdateSchema(phone=f"+7{uuid.uuid4().int % 10 ** 10:010d}",
+                                            competencies={"competencies": competencies}),
+        )
+    return resume.id
+
+
+async def test_reanalysis_skips_legacy_resumes_without_failing(job_queue, profession):
+    job = await wait_for_job((await job_queue.submit(profession_id=profession.id, files=[make_upload()])).id)
+    assert job.status == AnalysisJobStatus.COMPLETED
+    [analyzed_id] = job.resume_ids
+
+    previous_competencies = profession.competencies["competencies"]
+    empty_id = await create_legacy_resume([])
+    legacy_id = await create_legacy_resume([{"name": previous_competencies[0]["name"], "level": 1}])
+
+    try:
+        changed_competencies = {"competencies": previous_competencies + [{"name": "Docker Kubernetes", "level": 2}]}
+        async with database.session() as session:
+            await profession_repo.update_profession(
+                session=session,
+                profession_id=profession.id,
+                profession=ProfessionCreateUpdateSchema(name=profession.name, competencies=changed_competencies),
+            )
+        job = await wait_for_job((await job_queue.submit_reanalysis(
+            profession_id=profession.id,
+            previous_competencies=profession.competencies,
+        )).id)
+
+        assert job.status == AnalysisJobStatus.COMPLETED
+        assert job.failed_files == 0
+        assert job.errors == []
+        assert job.processed_files == job.total_files == 1
+        assert empty_id not in job.skipped_resume_ids
+        assert legacy_id in job.skipped_resume_ids
+        assert job.resume_ids == [analyzed_id]
+    finally:
+        async with database.session() as session:
+            for resume_id in (analyzed_id, empty_id, legacy_id):
+                await resume_repo.delete_resume(session=session, resume_id=resume_id)
+
+
+async def test_worker_survives_job_deleted_while_queued(db, analysis_pool, profession, tmp_path):
+    queue = AnalysisJobQueue(maxsize=10, workers=1, spool_dir=tmp_path)
+    deleted_profession = await create_profession()
+    # Обработчики ещё не запущены, задачи ждут в очереди
+    deleted_job = await queue.submit(profession_id=deleted_profession.id, files=[make_upload()])
+    job = await queue.submit(profession_id=profession.id, files=[make_upload()])
+
+    # Задача удаляется каскадом вместе с профессией
+    async with database.session() as session:
+        await profession_repo.delete_profession(session=session, profession_id=deleted_profession.id)
+
+    await queue.start()
+    try:
+        job = await wait_for_job(job.id)
+        assert job.status == AnalysisJobStatus.COMPLETED
+        assert not any(task.done() for task in queue._tasks)
+        assert not (tmp_path / str(deleted_job.id)).exists()
+    finally:
+        await queue.shutdown()
+        async with database.session() as session:
+            for resume_id in job.resume_ids:
+                await resume_repo.delete_resume(session=session, resume_id=resume_id)